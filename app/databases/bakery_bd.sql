@@ -1,3 +1,15 @@
+-- BASE NUEVA. PARA UNA BASE CREADA CON UNA VERSION ANTERIOR DE ESTE
+-- ARCHIVO, EJECUTAR migracion_001_catalogo.sql (IDEMPOTENTE)
+
+-- ============================================
+-- EXTENSIONES
+-- ============================================
+
+-- BUSQUEDA DIFUSA (TRIGRAMAS) Y SIN ACENTOS
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+
 -- ============================================
 -- TIPOS DE DATOS
 -- ============================================
@@ -127,6 +139,68 @@ CREATE TABLE venta_detalle (
 	FOREIGN KEY (id_venta) REFERENCES venta(id) ON DELETE CASCADE
 );
 
+-- TABLA: VERSION DEL CATALOGO (UNA FILA POR TABLA, SE INCREMENTA EN CADA ESCRITURA)
+CREATE TABLE catalogo_version (
+	tabla VARCHAR(30) PRIMARY KEY,
+	version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO catalogo_version (tabla) VALUES ('producto'), ('postre'), ('pan'), ('bebida'), ('extra');
+
+
+-- ============================================
+-- ÍNDICES
+-- ============================================
+
+-- CARGA DE LOS DETALLES DE UN GRUPO DE VENTAS (selectinload)
+CREATE INDEX idx_venta_detalle_id_venta ON venta_detalle (id_venta);
+
+-- LISTADO E HISTORIAL DE VENTAS POR FECHA (RANGOS Y PAGINACION POR KEYSET)
+CREATE INDEX idx_venta_fecha_id ON venta (fecha DESC, id DESC);
+
+-- NOMBRE UNICO POR CATEGORIA (DESTINO DE ON CONFLICT EN LAS CARGAS MASIVAS)
+CREATE UNIQUE INDEX uq_postre_nombre ON postre (nombre);
+CREATE UNIQUE INDEX uq_pan_nombre ON pan (nombre);
+CREATE UNIQUE INDEX uq_bebida_nombre ON bebida (nombre);
+CREATE UNIQUE INDEX uq_extra_nombre ON extra (nombre);
+
+-- BUSQUEDA POR INGREDIENTES (SIN DISTINGUIR MAYUSCULAS)
+-- IMMUTABLE PARA PODER USARLA EN INDICES DE EXPRESION
+CREATE OR REPLACE FUNCTION normalizar_ingredientes(ingredientes TEXT[])
+RETURNS TEXT[] AS
+$BODY$
+	SELECT ARRAY(SELECT lower(btrim(i)) FROM unnest(ingredientes) AS i);
+$BODY$
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+-- INDICE INVERTIDO: CONTIENE ALGUNO (&&) / CONTIENE TODOS (@>)
+CREATE INDEX idx_postre_ingredientes ON postre USING GIN (normalizar_ingredientes(ingredientes));
+CREATE INDEX idx_pan_ingredientes ON pan USING GIN (normalizar_ingredientes(ingredientes));
+CREATE INDEX idx_bebida_ingredientes ON bebida USING GIN (normalizar_ingredientes(ingredientes));
+
+-- BUSQUEDA DE PRODUCTOS POR NOMBRE Y DESCRIPCION (SIN ACENTOS, TOLERANTE A ERRORES)
+-- unaccent() ES STABLE; CON EL DICCIONARIO EXPLICITO SE PUEDE DECLARAR IMMUTABLE
+CREATE OR REPLACE FUNCTION f_unaccent(texto TEXT)
+RETURNS TEXT AS
+$BODY$
+	SELECT public.unaccent('public.unaccent'::regdictionary, texto);
+$BODY$
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION texto_busqueda(nombre VARCHAR, descripcion TEXT)
+RETURNS TEXT AS
+$BODY$
+	SELECT f_unaccent(lower(nombre || ' ' || coalesce(descripcion, '')));
+$BODY$
+LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- LOS INDICES NO SE HEREDAN: UNO POR TABLA (SELECT FROM producto RECORRE TODAS)
+CREATE INDEX idx_producto_busqueda ON producto USING GIN (texto_busqueda(nombre, descripcion) gin_trgm_ops);
+CREATE INDEX idx_postre_busqueda ON postre USING GIN (texto_busqueda(nombre, descripcion) gin_trgm_ops);
+CREATE INDEX idx_pan_busqueda ON pan USING GIN (texto_busqueda(nombre, descripcion) gin_trgm_ops);
+CREATE INDEX idx_bebida_busqueda ON bebida USING GIN (texto_busqueda(nombre, descripcion) gin_trgm_ops);
+CREATE INDEX idx_extra_busqueda ON extra USING GIN (texto_busqueda(nombre, descripcion) gin_trgm_ops);
+
 
 -- ============================================
 -- TRIGGER PARA VERIFICAR QUE EL PRODUCTO EXISTA
@@ -232,6 +306,12 @@ DECLARE
 	v_id_venta_afectada INTEGER;
 	v_nuevo_total NUMERIC(10,2);
 BEGIN
+	-- LAS EDICIONES POR LOTE (SET LOCAL bakery.omitir_total = 'on')
+	-- RECALCULAN EL TOTAL UNA SOLA VEZ AL TERMINAR
+	IF current_setting('bakery.omitir_total', true) = 'on' THEN
+		RETURN NULL;
+	END IF;
+
 	-- Obtener el ID de la venta afectada
 	IF (TG_OP = 'DELETE') THEN
 		v_id_venta_afectada := OLD.id_venta;
@@ -266,6 +346,51 @@ FOR EACH ROW
 EXECUTE PROCEDURE calcular_total_venta();
 
 
+-- ============================================
+-- TRIGGER PARA VERSIONAR EL CATALOGO (ETAGS)
+-- (UNA VEZ POR SENTENCIA, NO POR FILA)
+-- ============================================
+CREATE OR REPLACE FUNCTION incrementar_version_catalogo()
+RETURNS TRIGGER AS 
+$BODY$
+BEGIN
+	UPDATE catalogo_version SET version = version + 1 WHERE tabla = TG_TABLE_NAME;
+	RETURN NULL;
+END;
+$BODY$
+LANGUAGE 'plpgsql';
+
+CREATE TRIGGER trg_version_producto
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+ON producto
+FOR EACH STATEMENT
+EXECUTE PROCEDURE incrementar_version_catalogo();
+
+CREATE TRIGGER trg_version_postre
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+ON postre
+FOR EACH STATEMENT
+EXECUTE PROCEDURE incrementar_version_catalogo();
+
+CREATE TRIGGER trg_version_pan
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+ON pan
+FOR EACH STATEMENT
+EXECUTE PROCEDURE incrementar_version_catalogo();
+
+CREATE TRIGGER trg_version_bebida
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+ON bebida
+FOR EACH STATEMENT
+EXECUTE PROCEDURE incrementar_version_catalogo();
+
+CREATE TRIGGER trg_version_extra
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+ON extra
+FOR EACH STATEMENT
+EXECUTE PROCEDURE incrementar_version_catalogo();
+
+
 -- ============================================
 -- FUNCIÓN PARA INSERTAR VENTA CON DETALLES
 -- ============================================
@@ -0,0 +1,203 @@
+-- ============================================
+-- MIGRACION 001: BASES CREADAS CON LA VERSION ANTERIOR DE bakery_bd.sql
+-- ============================================
+-- Agrega lo que la API necesita y bakery_bd.sql ya crea en una base nueva:
+--   * catalogo_version y sus triggers (ETag de todos los GET del catálogo)
+--   * nombre único por categoría (ON CONFLICT de las cargas masivas)
+--   * índices de ventas, ingredientes y búsqueda de texto
+--   * calcular_total_venta con bakery.omitir_total (PATCH /ventas/{id}/detalles)
+--
+-- Es idempotente: se puede ejecutar varias veces. Todo va en una
+-- transacción; si algo falla no queda aplicado a medias.
+--
+--   psql -v ON_ERROR_STOP=1 -d bakery -f app/databases/migracion_001_catalogo.sql
+--
+-- Si ya hay nombres repetidos dentro de una categoría, se conserva el de
+-- menor id y los demás se renombran como 'nombre #id' (con un NOTICE por
+-- cada uno) para poder crear el índice único. Revise esos productos.
+
+BEGIN;
+
+-- ============================================
+-- EXTENSIONES
+-- ============================================
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+
+-- ============================================
+-- VERSION DEL CATALOGO (ETAGS)
+-- ============================================
+CREATE TABLE IF NOT EXISTS catalogo_version (
+	tabla VARCHAR(30) PRIMARY KEY,
+	version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO catalogo_version (tabla)
+VALUES ('producto'), ('postre'), ('pan'), ('bebida'), ('extra')
+ON CONFLICT (tabla) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION incrementar_version_catalogo()
+RETURNS TRIGGER AS
+$BODY$
+BEGIN
+	UPDATE catalogo_version SET version = version + 1 WHERE tabla = TG_TABLE_NAME;
+	RETURN NULL;
+END;
+$BODY$
+LANGUAGE 'plpgsql';
+
+DROP TRIGGER IF EXISTS trg_version_producto ON producto;
+CREATE TRIGGER trg_version_producto
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+ON producto
+FOR EACH STATEMENT
+EXECUTE PROCEDURE incrementar_version_catalogo();
+
+DROP TRIGGER IF EXISTS trg_version_postre ON postre;
+CREATE TRIGGER trg_version_postre
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+ON postre
+FOR EACH STATEMENT
+EXECUTE PROCEDURE incrementar_version_catalogo();
+
+DROP TRIGGER IF EXISTS trg_version_pan ON pan;
+CREATE TRIGGER trg_version_pan
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+ON pan
+FOR EACH STATEMENT
+EXECUTE PROCEDURE incrementar_version_catalogo();
+
+DROP TRIGGER IF EXISTS trg_version_bebida ON bebida;
+CREATE TRIGGER trg_version_bebida
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+ON bebida
+FOR EACH STATEMENT
+EXECUTE PROCEDURE incrementar_version_catalogo();
+
+DROP TRIGGER IF EXISTS trg_version_extra ON extra;
+CREATE TRIGGER trg_version_extra
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+ON extra
+FOR EACH STATEMENT
+EXECUTE PROCEDURE incrementar_version_catalogo();
+
+
+-- ============================================
+-- NOMBRE UNICO POR CATEGORIA
+-- ============================================
+
+-- RENOMBRA LOS REPETIDOS (SE CONSERVA EL DE MENOR ID)
+DO
+$BODY$
+DECLARE
+	v_tabla TEXT;
+	r RECORD;
+	v_sufijo TEXT;
+BEGIN
+	FOREACH v_tabla IN ARRAY ARRAY['postre', 'pan', 'bebida', 'extra'] LOOP
+		FOR r IN EXECUTE format(
+			'SELECT d.id, d.nombre FROM ONLY %1$I d
+			 WHERE EXISTS (SELECT 1 FROM ONLY %1$I o WHERE o.nombre = d.nombre AND o.id < d.id)
+			 ORDER BY d.id',
+			v_tabla
+		) LOOP
+			v_sufijo := ' #' || r.id;
+			EXECUTE format('UPDATE ONLY %I SET nombre = $1 WHERE id = $2', v_tabla)
+			USING left(r.nombre, 50 - length(v_sufijo)) || v_sufijo, r.id;
+			RAISE NOTICE '%: nombre repetido "%" (id %) renombrado a "%"',
+				v_tabla, r.nombre, r.id, left(r.nombre, 50 - length(v_sufijo)) || v_sufijo;
+		END LOOP;
+	END LOOP;
+END;
+$BODY$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_postre_nombre ON postre (nombre);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_pan_nombre ON pan (nombre);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_bebida_nombre ON bebida (nombre);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_extra_nombre ON extra (nombre);
+
+
+-- ============================================
+-- ÍNDICES DE VENTAS, INGREDIENTES Y BUSQUEDA
+-- ============================================
+CREATE INDEX IF NOT EXISTS idx_venta_detalle_id_venta ON venta_detalle (id_venta);
+CREATE INDEX IF NOT EXISTS idx_venta_fecha_id ON venta (fecha DESC, id DESC);
+
+CREATE OR REPLACE FUNCTION normalizar_ingredientes(ingredientes TEXT[])
+RETURNS TEXT[] AS
+$BODY$
+	SELECT ARRAY(SELECT lower(btrim(i)) FROM unnest(ingredientes) AS i);
+$BODY$
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+CREATE INDEX IF NOT EXISTS idx_postre_ingredientes ON postre USING GIN (normalizar_ingredientes(ingredientes));
+CREATE INDEX IF NOT EXISTS idx_pan_ingredientes ON pan USING GIN (normalizar_ingredientes(ingredientes));
+CREATE INDEX IF NOT EXISTS idx_bebida_ingredientes ON bebida USING GIN (normalizar_ingredientes(ingredientes));
+
+CREATE OR REPLACE FUNCTION f_unaccent(texto TEXT)
+RETURNS TEXT AS
+$BODY$
+	SELECT public.unaccent('public.unaccent'::regdictionary, texto);
+$BODY$
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION texto_busqueda(nombre VARCHAR, descripcion TEXT)
+RETURNS TEXT AS
+$BODY$
+	SELECT f_unaccent(lower(nombre || ' ' || coalesce(descripcion, '')));
+$BODY$
+LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE INDEX IF NOT EXISTS idx_producto_busqueda ON producto USING GIN (texto_busqueda(nombre, descripcion) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_postre_busqueda ON postre USING GIN (texto_busqueda(nombre, descripcion) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_pan_busqueda ON pan USING GIN (texto_busqueda(nombre, descripcion) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_bebida_busqueda ON bebida USING GIN (texto_busqueda(nombre, descripcion) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_extra_busqueda ON extra USING GIN (texto_busqueda(nombre, descripcion) gin_trgm_ops);
+
+
+-- ============================================
+-- TOTAL DE VENTA: OMITIBLE EN EDICIONES POR LOTE
+-- ============================================
+-- (trg_calcular_total_venta ya existe y usa esta función)
+CREATE OR REPLACE FUNCTION calcular_total_venta()
+RETURNS TRIGGER AS
+$BODY$
+DECLARE
+	v_id_venta_afectada INTEGER;
+	v_nuevo_total NUMERIC(10,2);
+BEGIN
+	-- LAS EDICIONES POR LOTE (SET LOCAL bakery.omitir_total = 'on')
+	-- RECALCULAN EL TOTAL UNA SOLA VEZ AL TERMINAR
+	IF current_setting('bakery.omitir_total', true) = 'on' THEN
+		RETURN NULL;
+	END IF;
+
+	-- Obtener el ID de la venta afectada
+	IF (TG_OP = 'DELETE') THEN
+		v_id_venta_afectada := OLD.id_venta;
+	ELSE
+		v_id_venta_afectada := NEW.id_venta;
+	END IF;
+
+	-- Recalcular el total de esa venta especifica
+	SELECT COALESCE(SUM(cantidad * precio), 0)
+	INTO v_nuevo_total
+	FROM venta_detalle
+	WHERE id_venta = v_id_venta_afectada;
+
+	-- Actualizar la cabecera
+	UPDATE venta
+	SET precio_total = v_nuevo_total
+	WHERE id = v_id_venta_afectada;
+
+	IF (TG_OP = 'DELETE') THEN
+		RETURN OLD;
+	ELSE
+		RETURN NEW;
+	END IF;
+END;
+$BODY$
+LANGUAGE 'plpgsql';
+
+COMMIT;
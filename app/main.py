@@ -2,6 +2,7 @@
 Aplicación FastAPI - Bakery System
 Sistema de gestión de panadería con productos y ventas
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import (
@@ -11,7 +12,31 @@ from app.routers import (
     bebida_router,
     extra_router,
     venta_router,
+    catalogo_router,
 )
+from app.services import cache
+from app.services.escucha_catalogo import CACHE_LISTEN, EscuchaCatalogo
+from app.services.escritor_ventas import VENTAS_AGRUPADAS, EscritorVentas
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Arranca la escucha de invalidaciones de caché y el escritor agrupado
+    de ventas si están activados.
+    """
+    escucha = None
+    if CACHE_LISTEN:
+        escucha = EscuchaCatalogo()
+        escucha.start()
+    if VENTAS_AGRUPADAS:
+        app.state.escritor_ventas = EscritorVentas()
+        app.state.escritor_ventas.iniciar()
+    yield
+    if VENTAS_AGRUPADAS:
+        await app.state.escritor_ventas.detener()
+    if escucha is not None:
+        escucha.detener()
 
 
 # Crear aplicación FastAPI
@@ -21,6 +46,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configurar CORS
@@ -30,6 +56,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Missing-Ids"],
 )
 
 # Incluir routers
@@ -39,6 +66,7 @@ app.include_router(pan_router)
 app.include_router(bebida_router)
 app.include_router(extra_router)
 app.include_router(venta_router)
+app.include_router(catalogo_router)
 
 
 @app.get("/")
@@ -56,3 +84,9 @@ def root():
 def health_check():
     """Endpoint de health check"""
     return {"status": "healthy"}
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Aciertos y fallos de la caché de catálogo (por proceso)"""
+    return cache.estadisticas()
@@ -8,10 +8,18 @@ from .venta import Venta, VentaDetalle
 from .types import (
     PriceSize,
     PriceAmount,
+    StatusSize,
     TypeDessert,
     TypeBread,
     TypeDrink,
     TypeExtra,
+    TypeVariant,
+)
+from .compuestos import (
+    PriceSizeType,
+    PriceAmountType,
+    StatusSizeType,
+    registrar_compuestos,
 )
 from .utils import (
     tuple_to_price_size,
@@ -33,10 +41,17 @@ __all__ = [
     # Types
     "PriceSize",
     "PriceAmount",
+    "StatusSize",
     "TypeDessert",
     "TypeBread",
     "TypeDrink",
     "TypeExtra",
+    "TypeVariant",
+    # Columnas de tipos compuestos
+    "PriceSizeType",
+    "PriceAmountType",
+    "StatusSizeType",
+    "registrar_compuestos",
     # Utils
     "tuple_to_price_size",
     "tuple_to_price_amount",
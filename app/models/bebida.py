@@ -2,12 +2,13 @@
 Modelo hijo: Bebida
 Hereda de Producto usando PostgreSQL INHERITS
 """
-from sqlalchemy import Integer, Boolean, Enum as SQLEnum, Column, Text, String
+from sqlalchemy import Integer, Boolean, Enum as SQLEnum, Text, String
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 from .base import Base
 from .producto import Producto
-from .types import TypeDrink
+from .compuestos import PriceSizeType, StatusSizeType
+from .types import TypeDrink, PriceSize, StatusSize
 from typing import List
 
 
@@ -21,9 +22,8 @@ class Bebida(Producto):
     - ingredientes: ARRAY de TEXT
     - es_fria: BOOLEAN
     
-    NOTA: precio es un tipo compuesto PostgreSQL (price_size).
-    SQLAlchemy no mapea automáticamente composite types, por lo que se
-    maneja como columna genérica y se procesa en la capa de aplicación.
+    NOTA: precio es un tipo compuesto PostgreSQL (price_size); se mapea con
+    PriceSizeType y se lee directamente como PriceSize (ver compuestos.py).
     
     NOTA 2: En PostgreSQL con INHERITS, la tabla hija contiene TODAS las columnas.
     """
@@ -40,9 +40,9 @@ class Bebida(Producto):
         nullable=True
     )
     
-    precio = Column("precio", nullable=True)
+    precio: Mapped[PriceSize | None] = mapped_column(PriceSizeType(), nullable=True)
     
-    disponible = Column("disponible", nullable=True)
+    disponible: Mapped[StatusSize | None] = mapped_column(StatusSizeType(), nullable=True)
     
     ingredientes: Mapped[List[str] | None] = mapped_column(
         ARRAY(Text),
@@ -0,0 +1,119 @@
+"""
+Tipos de columna SQLAlchemy para los tipos compuestos de PostgreSQL
+(price_size, price_amount, status_size).
+
+Las filas se decodifican directamente en los NamedTuple de types.py:
+- psycopg2: con adaptadores registrados al abrir cada conexión
+  (registrar_compuestos), el driver entrega ya el NamedTuple.
+- asyncpg: decodifica los compuestos de forma nativa como Record.
+Si el adaptador no está registrado se interpreta el texto "(a,b,c)"
+con el mismo decodificador.
+"""
+from decimal import Decimal
+from typing import Any, Callable, List, Optional, Sequence, Type
+import psycopg2
+import psycopg2.extras
+from sqlalchemy.types import UserDefinedType
+from .types import PriceSize, PriceAmount, StatusSize
+
+
+def _texto_a_bool(valor: str) -> bool:
+    return valor.lower() in ("t", "true")
+
+
+def _separar(texto: str) -> List[Optional[str]]:
+    """
+    Campos de un compuesto en texto: '(250.00,,t)' -> ['250.00', '', 't']
+    ('' o None es NULL). Los campos de estos tipos son numeric y boolean,
+    que Postgres nunca escribe entre comillas; si las hay se usa el
+    tokenizador de psycopg2.
+    """
+    if '"' in texto:
+        return psycopg2.extras.CompositeCaster.tokenize(texto)
+    return texto[1:-1].split(",")
+
+
+class TipoCompuesto(UserDefinedType):
+    """Columna de un tipo compuesto mapeada a un NamedTuple"""
+
+    cache_ok = True
+
+    nombre: str
+    clase: Type[tuple]
+    convertir: Callable[[str], Any]
+
+    def get_col_spec(self, **kw) -> str:
+        return self.nombre
+
+    @classmethod
+    def decodificar(cls, texto: Optional[str]) -> Optional[tuple]:
+        """Texto de Postgres '(a,b,c)' al NamedTuple, sin expresiones regulares"""
+        if texto is None:
+            return None
+        valores = _separar(texto)
+        if len(valores) != len(cls.clase._fields):
+            raise psycopg2.DataError(
+                f"Se esperaban {len(cls.clase._fields)} campos para {cls.nombre}, llegaron {len(valores)}: {texto!r}"
+            )
+        convertir = cls.convertir
+        return cls.clase._make([convertir(v) if v else None for v in valores])
+
+    def bind_processor(self, dialect):
+        def procesar(valor):
+            if valor is None:
+                return None
+            return tuple(valor)
+        return procesar
+
+    def result_processor(self, dialect, coltype):
+        clase = self.clase
+        decodificar = self.decodificar
+
+        def procesar(valor):
+            if valor is None or isinstance(valor, clase):
+                return valor
+            if isinstance(valor, str):
+                return decodificar(valor)
+            # asyncpg.Record u otra secuencia ya decodificada
+            return clase._make(valor)
+        return procesar
+
+
+class PriceSizeType(TipoCompuesto):
+    nombre = "price_size"
+    clase = PriceSize
+    convertir = staticmethod(Decimal)
+
+
+class PriceAmountType(TipoCompuesto):
+    nombre = "price_amount"
+    clase = PriceAmount
+    convertir = staticmethod(Decimal)
+
+
+class StatusSizeType(TipoCompuesto):
+    nombre = "status_size"
+    clase = StatusSize
+    convertir = staticmethod(_texto_a_bool)
+
+
+def _caster(tipo: Type[TipoCompuesto]) -> Type[psycopg2.extras.CompositeCaster]:
+    class Caster(psycopg2.extras.CompositeCaster):
+        def parse(self, s: Optional[str], curs) -> Optional[tuple]:
+            # Sin tokenize ni curs.cast por campo (ver scripts/benchmark_compuestos.py)
+            return tipo.decodificar(s)
+    return Caster
+
+
+def registrar_compuestos(dbapi_connection, tipos: Optional[Sequence[Type[TipoCompuesto]]] = None) -> None:
+    """
+    Registra en una conexión psycopg2 los adaptadores de los tipos compuestos.
+    Si el esquema aún no tiene el tipo, se omite y queda el análisis de texto.
+    """
+    for tipo in tipos or (PriceSizeType, PriceAmountType, StatusSizeType):
+        try:
+            psycopg2.extras.register_composite(
+                tipo.nombre, dbapi_connection, factory=_caster(tipo)
+            )
+        except psycopg2.ProgrammingError:
+            dbapi_connection.rollback()
@@ -2,11 +2,12 @@
 Modelo hijo: Extra
 Hereda de Producto usando PostgreSQL INHERITS
 """
-from sqlalchemy import Integer, Enum as SQLEnum, Column, Text, String
+from sqlalchemy import Integer, Boolean, Enum as SQLEnum, Text, String
 from sqlalchemy.orm import Mapped, mapped_column
 from .base import Base
 from .producto import Producto
-from .types import TypeExtra
+from .compuestos import PriceAmountType
+from .types import TypeExtra, PriceAmount
 
 
 class Extra(Producto):
@@ -17,9 +18,8 @@ class Extra(Producto):
     - tipo_extra: ENUM type_extra
     - precio: Composite type price_amount (retail_sale, wholesale)
     
-    NOTA: precio es un tipo compuesto PostgreSQL (price_amount).
-    SQLAlchemy no mapea automáticamente composite types, por lo que se
-    maneja como columna genérica y se procesa en la capa de aplicación.
+    NOTA: precio es un tipo compuesto PostgreSQL (price_amount); se mapea con
+    PriceAmountType y se lee directamente como PriceAmount (ver compuestos.py).
     
     NOTA 2: En PostgreSQL con INHERITS, la tabla hija contiene TODAS las columnas.
     """
@@ -35,8 +35,8 @@ class Extra(Producto):
         SQLEnum(TypeExtra, name="type_extra", create_type=False, values_callable=lambda x: [e.value for e in x]),
         nullable=True
     )
-    precio = Column("precio", nullable=True)
-    disponible = Column("disponible", nullable=True)
+    precio: Mapped[PriceAmount | None] = mapped_column(PriceAmountType(), nullable=True)
+    disponible: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     __mapper_args__ = {
         "polymorphic_identity": "extra",
         "concrete": True,
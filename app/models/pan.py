@@ -2,12 +2,13 @@
 Modelo hijo: Pan
 Hereda de Producto usando PostgreSQL INHERITS
 """
-from sqlalchemy import Integer, Enum as SQLEnum, Column, Text, String
+from sqlalchemy import Integer, Boolean, Enum as SQLEnum, Text, String
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 from .base import Base
 from .producto import Producto
-from .types import TypeBread
+from .compuestos import PriceAmountType
+from .types import TypeBread, PriceAmount
 from typing import List
 
 
@@ -20,9 +21,8 @@ class Pan(Producto):
     - precio: Composite type price_amount (retail_sale, wholesale)
     - ingredientes: ARRAY de TEXT
     
-    NOTA: precio es un tipo compuesto PostgreSQL (price_amount).
-    SQLAlchemy no mapea automáticamente composite types, por lo que se
-    maneja como columna genérica y se procesa en la capa de aplicación.
+    NOTA: precio es un tipo compuesto PostgreSQL (price_amount); se mapea con
+    PriceAmountType y se lee directamente como PriceAmount (ver compuestos.py).
     
     NOTA 2: En PostgreSQL con INHERITS, la tabla hija contiene TODAS las columnas
     de la tabla padre, por lo que SQLAlchemy necesita declarar todas las columnas.
@@ -40,9 +40,9 @@ class Pan(Producto):
         nullable=True
     )
 
-    precio = Column("precio", nullable=True)
+    precio: Mapped[PriceAmount | None] = mapped_column(PriceAmountType(), nullable=True)
 
-    disponible = Column("disponible", nullable=True)
+    disponible: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     ingredientes: Mapped[List[str] | None] = mapped_column(
         ARRAY(Text),
         nullable=True
@@ -2,12 +2,13 @@
 Modelo hijo: Postre
 Hereda de Producto usando PostgreSQL INHERITS
 """
-from sqlalchemy import Integer, Boolean, Enum as SQLEnum, Column, Text, String
+from sqlalchemy import Integer, Boolean, Enum as SQLEnum, Text, String
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 from .base import Base
 from .producto import Producto
-from .types import TypeDessert
+from .compuestos import PriceSizeType, StatusSizeType
+from .types import TypeDessert, PriceSize, StatusSize
 from typing import List
 
 
@@ -21,9 +22,8 @@ class Postre(Producto):
     - ingredientes: ARRAY de TEXT
     - es_dulce: BOOLEAN
     
-    NOTA: precio es un tipo compuesto PostgreSQL (price_size).
-    SQLAlchemy no mapea automáticamente composite types, por lo que se
-    maneja como columna genérica y se procesa en la capa de aplicación.
+    NOTA: precio es un tipo compuesto PostgreSQL (price_size); se mapea con
+    PriceSizeType y se lee directamente como PriceSize (ver compuestos.py).
     
     NOTA 2: En PostgreSQL con INHERITS, la tabla hija contiene TODAS las columnas
     de la tabla padre, por lo que SQLAlchemy necesita declarar todas las columnas
@@ -43,9 +43,9 @@ class Postre(Producto):
     )
     
 
-    precio = Column("precio", nullable=True)
+    precio: Mapped[PriceSize | None] = mapped_column(PriceSizeType(), nullable=True)
 
-    disponible = Column("disponible", nullable=True)
+    disponible: Mapped[StatusSize | None] = mapped_column(StatusSizeType(), nullable=True)
 
     ingredientes: Mapped[List[str] | None] = mapped_column(
         ARRAY(Text),
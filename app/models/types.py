@@ -21,9 +21,19 @@ class PriceAmount(NamedTuple):
     Mapea el tipo compuesto PostgreSQL: price_amount
     Representa precio según cantidad (al por menor, al por mayor)
     """
-    retail_sale: Decimal  
+    retail_sale: Decimal
+    wholesale: Decimal
 
 
+class StatusSize(NamedTuple):
+    """
+    Mapea el tipo compuesto PostgreSQL: status_size
+    Representa disponibilidad según tamaño (pequeño, mediano, grande)
+    """
+    small: bool
+    medium: bool
+    big: bool
+
 
 # TIPOS ENUM
 
@@ -64,3 +74,12 @@ class TypeExtra(str, enum.Enum):
     PLATO = "Plato"
     VASO = "Vaso"
     CHAROLA = "Charola"
+
+
+class TypeVariant(str, enum.Enum):
+    """Variante vendida (tamaño o cantidad)"""
+    SMALL = "small"
+    MEDIUM = "medium"
+    BIG = "big"
+    RETAIL = "retail"
+    WHOLESALE = "wholesale"
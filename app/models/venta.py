@@ -2,12 +2,13 @@
 Modelos: Venta y VentaDetalle
 No usan herencia, son tablas independientes con relación 1:N
 """
-from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, Enum as SQLEnum, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import date
 from decimal import Decimal
 from typing import List
 from .base import Base
+from .types import TypeVariant
 
 
 class Venta(Base):
@@ -35,6 +36,10 @@ class VentaDetalle(Base):
     id_producto: Mapped[int | None] = mapped_column(Integer, nullable=True)  # NO FK explícita
     cantidad: Mapped[int | None] = mapped_column(Integer, nullable=True)
     precio: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)
+    variante: Mapped[TypeVariant | None] = mapped_column(
+        SQLEnum(TypeVariant, name="type_variant", create_type=False, values_callable=lambda x: [e.value for e in x]),
+        nullable=True
+    )
     
     venta: Mapped["Venta"] = relationship("Venta", back_populates="detalles_venta")
     
@@ -3,6 +3,7 @@ from .postre import PostreRepository
 from .pan import PanRepository
 from .bebida import BebidaRepository
 from .extra import ExtraRepository
+from .catalogo import CatalogoRepository
 from .venta import VentaRepository, VentaDetalleRepository
 
 __all__ = [
@@ -11,6 +12,7 @@ __all__ = [
     "PanRepository",
     "BebidaRepository",
     "ExtraRepository",
+    "CatalogoRepository",
     "VentaRepository",
     "VentaDetalleRepository",
 ]
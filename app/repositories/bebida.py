@@ -1,35 +1,57 @@
 
 from sqlalchemy.orm import Session
 from sqlalchemy import select
-from typing import List, Optional
-from app.models import Bebida
-from app.schemas.bebida import BebidaCreate, BebidaUpdate
+from typing import Any, Dict, List, Optional
+from app.models import Bebida, PriceSize, StatusSize
+from app.schemas.bebida import BebidaCreate, BebidaUpdate, BebidaFiltro
+from app.repositories.consulta import EspecificacionCatalogo, disponible_por_tamano, precio_compuesto
+from app.repositories.notificacion import notificar_cambio
+from app.repositories.catalogo import RepositorioCategoria
+from app.repositories.escritura import actualizar, eliminar, insertar
+from app.database import confirmar
 
 
-class BebidaRepository:
+class BebidaRepository(RepositorioCategoria):
+
+    modelo = Bebida
+    categoria = "bebida"
+    disponibilidad_por_tamano = True
+
+    consulta = EspecificacionCatalogo(
+        modelo=Bebida,
+        tipo=Bebida.tipo_bebida,
+        disponible=disponible_por_tamano(Bebida.disponible),
+        precio_menor=precio_compuesto(Bebida.precio, "small"),
+        precio_mayor=precio_compuesto(Bebida.precio, "big"),
+        booleanos={"es_fria": Bebida.es_fria},
+    )
+
     @staticmethod
-    def create(db: Session, bebida: BebidaCreate) -> Bebida:
+    def _valores(bebida: BebidaCreate) -> Dict[str, Any]:
+        """Columnas de una bebida nueva (compartido por create y upsert_lote)"""
         precio_tuple = None
         if bebida.precio:
-            precio_tuple = (
+            precio_tuple = PriceSize(
                 bebida.precio.small,
                 bebida.precio.medium,
                 bebida.precio.big
             )
-        db_bebida = Bebida(
+        return dict(
             nombre=bebida.nombre,
             descripcion=bebida.descripcion,
             imagen_url=bebida.imagen_url,
             tipo_bebida=bebida.tipo_bebida.value if bebida.tipo_bebida else None,
             precio=precio_tuple,
-            disponible=(True, True, True),  # Todos los tamaños disponibles por defecto
+            disponible=StatusSize(True, True, True),  # Todos los tamaños disponibles por defecto
             ingredientes=bebida.ingredientes,
             es_fria=bebida.es_fria
         )
-        
-        db.add(db_bebida)
-        db.commit()
-        db.refresh(db_bebida)
+
+    @staticmethod
+    def create(db: Session, bebida: BebidaCreate) -> Bebida:
+        db_bebida = insertar(db, Bebida, BebidaRepository._valores(bebida))
+        notificar_cambio(db, "bebida", db_bebida.id)
+        confirmar(db)
         return db_bebida
     
     @staticmethod
@@ -43,61 +65,56 @@ class BebidaRepository:
         return list(db.execute(stmt).scalars().all())
     
     @staticmethod
-    def get_by_tipo(db: Session, tipo_bebida: str) -> List[Bebida]:
-        stmt = select(Bebida).where(Bebida.tipo_bebida == tipo_bebida)
-        return list(db.execute(stmt).scalars().all())
-    
-    @staticmethod
-    def get_by_temperatura(db: Session, es_fria: bool) -> List[Bebida]:
-        stmt = select(Bebida).where(Bebida.es_fria == es_fria)
+    def buscar(db: Session, filtro: BebidaFiltro) -> List[Bebida]:
+        """Aplica cualquier combinación de filtros con paginación en una sola consulta"""
+        stmt = BebidaRepository.consulta.construir(filtro)
         return list(db.execute(stmt).scalars().all())
     
     @staticmethod
     def update(db: Session, bebida_id: int, bebida_update: BebidaUpdate) -> Optional[Bebida]:
-        db_bebida = BebidaRepository.get_by_id(db, bebida_id)
-        if not db_bebida:
-            return None
-        
-        # Actualizar campos uno por uno
+        cambios: Dict[str, Any] = {}
         if bebida_update.nombre is not None:
-            db_bebida.nombre = bebida_update.nombre
+            cambios["nombre"] = bebida_update.nombre
         if bebida_update.descripcion is not None:
-            db_bebida.descripcion = bebida_update.descripcion
+            cambios["descripcion"] = bebida_update.descripcion
         if bebida_update.imagen_url is not None:
-            db_bebida.imagen_url = bebida_update.imagen_url
+            cambios["imagen_url"] = bebida_update.imagen_url
         if bebida_update.tipo_bebida is not None:
-            db_bebida.tipo_bebida = bebida_update.tipo_bebida.value
+            cambios["tipo_bebida"] = bebida_update.tipo_bebida.value
         if bebida_update.ingredientes is not None:
-            db_bebida.ingredientes = bebida_update.ingredientes
+            cambios["ingredientes"] = bebida_update.ingredientes
         if bebida_update.es_fria is not None:
-            db_bebida.es_fria = bebida_update.es_fria
+            cambios["es_fria"] = bebida_update.es_fria
         
         if bebida_update.precio is not None:
-            precio_tuple = (
+            precio_tuple = PriceSize(
                 bebida_update.precio.small,
                 bebida_update.precio.medium,
                 bebida_update.precio.big
             )
-            db_bebida.precio = precio_tuple
+            cambios["precio"] = precio_tuple
         
         if bebida_update.disponible is not None:
-            disponible_tuple = (
+            disponible_tuple = StatusSize(
                 bebida_update.disponible.small,
                 bebida_update.disponible.medium,
                 bebida_update.disponible.big
             )
-            db_bebida.disponible = disponible_tuple
+            cambios["disponible"] = disponible_tuple
         
-        db.commit()
-        db.refresh(db_bebida)
+        db_bebida = actualizar(db, Bebida, bebida_id, cambios)
+        if not db_bebida:
+            return None
+        
+        notificar_cambio(db, "bebida", bebida_id)
+        confirmar(db)
         return db_bebida
     
     @staticmethod
     def delete(db: Session, bebida_id: int) -> bool:
-        db_bebida = BebidaRepository.get_by_id(db, bebida_id)
-        if not db_bebida:
+        if not eliminar(db, Bebida, bebida_id):
             return False
         
-        db.delete(db_bebida)
-        db.commit()
+        notificar_cambio(db, "bebida", bebida_id)
+        confirmar(db)
         return True
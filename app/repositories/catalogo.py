@@ -0,0 +1,240 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import Integer, Numeric, Select, Table, Text, case, cast, false, func, literal, literal_column, not_, select, text, tuple_, union_all, update
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, aggregate_order_by
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+from app.models import Producto, Postre, Pan, Bebida, Extra
+from app.repositories import lote
+from app.repositories.consulta import campo_compuesto, por_ids
+from app.repositories.notificacion import notificar_cambio
+from app.schemas.filtros import IngredientesFiltro, ModoIngredientes
+from app.schemas.catalogo import AjustePrecios, DisponibilidadLote, DisponibilidadTamanoLote
+from app.database import confirmar
+
+
+_VERSIONES_SQL = text(
+    "SELECT tabla, version FROM catalogo_version WHERE tabla = ANY(:tablas)"
+)
+
+
+class RepositorioCategoria:
+    """
+    Operaciones por lote comunes a los repositorios de postre, pan, bebida
+    y extra. Cada subclase define `modelo`, `categoria` y `_valores`.
+    """
+
+    modelo: Type[Producto]
+    categoria: str
+    # postre y bebida: disponibilidad por tamaño (status_size)
+    disponibilidad_por_tamano: bool = False
+
+    @staticmethod
+    def _valores(item: Any) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @classmethod
+    def upsert_lote(cls, db: Session, items: List[Any]) -> List[Tuple[int, bool]]:
+        """
+        Inserta o actualiza (por nombre) varios productos en una sola
+        sentencia. Devuelve (id, insertado) en el orden recibido.
+        """
+        filas = [cls._valores(item) for item in items]
+        resultado = lote.upsert_por_nombre(db, cls.modelo, filas)
+        notificar_cambio(db, cls.categoria)
+        confirmar(db)
+        return resultado
+
+    @classmethod
+    def get_by_ids(cls, db: Session, ids: List[int]) -> List[Producto]:
+        """Varios productos en una sola consulta (id = ANY); el orden no está garantizado"""
+        stmt = select(cls.modelo).where(por_ids(cls.modelo.id, ids))
+        return list(db.execute(stmt).scalars().all())
+
+    @classmethod
+    def actualizar_disponibilidad(
+        cls,
+        db: Session,
+        cambio: Union[DisponibilidadLote, DisponibilidadTamanoLote],
+    ) -> List[int]:
+        """Cambia la disponibilidad de varios productos en una sola sentencia; devuelve los IDs encontrados"""
+        if cls.disponibilidad_por_tamano:
+            disponible = lote.estado_por_tamano(
+                cls.modelo.__table__.c.disponible, cambio.small, cambio.medium, cambio.big
+            )
+        else:
+            disponible = cambio.disponible
+        ids = lote.actualizar_disponibilidad(db, cls.modelo, cambio.ids, disponible)
+        notificar_cambio(db, cls.categoria)
+        confirmar(db)
+        return ids
+
+
+class CatalogoRepository:
+
+    # Orden de las categorías en la respuesta
+    categorias: Tuple[Tuple[str, Type[Producto]], ...] = (
+        ("postre", Postre),
+        ("pan", Pan),
+        ("bebida", Bebida),
+        ("extra", Extra),
+    )
+
+    # Categorías con columna ingredientes (TEXT[])
+    categorias_con_ingredientes: Tuple[str, ...] = ("postre", "pan", "bebida")
+
+    @staticmethod
+    def _precio_texto(modelo: Type[Producto]) -> ColumnElement:
+        """
+        precio como objeto JSON con los montos en texto: un número JSON se
+        leería como float al validar y perdería la escala de NUMERIC(10,2).
+        """
+        columna = modelo.__table__.c.precio
+        campos = []
+        for campo in columna.type.clase._fields:
+            campos += [literal_column(f"'{campo}'"), cast(campo_compuesto(columna, campo), Text)]
+        return case(
+            (columna.is_(None), literal_column("'null'::jsonb")),
+            else_=func.jsonb_build_object(*campos),
+        )
+
+    @staticmethod
+    def _items(
+        categoria: str,
+        modelo: Type[Producto],
+        orden: int,
+        condicion: Optional[Callable[[Table], ColumnElement]] = None,
+    ) -> Select:
+        """
+        Cada fila de la tabla hija como JSON más su categoría;
+        to_jsonb convierte los tipos compuestos en objetos anidados.
+        """
+        tabla = modelo.__table__
+        item = (
+            func.jsonb_build_object(literal_column("'categoria'"), literal_column(f"'{categoria}'"))
+            .op("||", return_type=JSONB)(func.to_jsonb(tabla.table_valued()))
+            .op("||", return_type=JSONB)(
+                func.jsonb_build_object(literal_column("'precio'"), CatalogoRepository._precio_texto(modelo))
+            )
+        )
+        stmt = select(
+            item.label("item"),
+            literal_column(str(orden), Integer).label("orden"),
+            tabla.c.id.label("id"),
+        ).select_from(tabla)
+        if condicion is not None:
+            stmt = stmt.where(condicion(tabla))
+        return stmt
+
+    @staticmethod
+    def consulta_catalogo(
+        categorias: Optional[Sequence[str]] = None,
+        condicion: Optional[Callable[[Table], ColumnElement]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+    ) -> Select:
+        """
+        Las categorías pedidas (todas por defecto) en un solo UNION ALL
+        agregado a un arreglo JSON, ordenado por categoría e id.
+        """
+        items = union_all(*(
+            CatalogoRepository._items(categoria, modelo, orden, condicion)
+            for orden, (categoria, modelo) in enumerate(CatalogoRepository.categorias)
+            if categorias is None or categoria in categorias
+        ))
+        if skip or limit is not None:
+            pagina = items.subquery("items")
+            items = (
+                select(pagina)
+                .order_by(pagina.c.orden, pagina.c.id)
+                .offset(skip)
+                .limit(limit)
+            )
+        items = items.subquery("catalogo")
+        arreglo = func.json_agg(aggregate_order_by(items.c.item, items.c.orden, items.c.id))
+        return select(cast(func.coalesce(arreglo, literal_column("'[]'::json")), Text))
+
+    @staticmethod
+    def get_catalogo_json(db: Session) -> str:
+        return db.execute(CatalogoRepository.consulta_catalogo()).scalar_one()
+
+    @staticmethod
+    def buscar_por_ingredientes_json(db: Session, filtro: IngredientesFiltro) -> str:
+        """
+        Productos con ingredientes (postre, pan, bebida) según el modo:
+        alguno (&&), todos (@>) o ninguno. Las dos primeras usan los índices
+        GIN sobre normalizar_ingredientes(ingredientes).
+        """
+        buscados = literal(filtro.ingredientes, ARRAY(Text))
+
+        def condicion(tabla: Table) -> ColumnElement:
+            normalizados = func.normalizar_ingredientes(tabla.c.ingredientes, type_=ARRAY(Text))
+            if filtro.modo == ModoIngredientes.TODOS:
+                return normalizados.contains(buscados)
+            if filtro.modo == ModoIngredientes.NINGUNO:
+                # Sin ingredientes registrados cuenta como "no contiene ninguno"
+                return not_(func.coalesce(normalizados.overlap(buscados), false()))
+            return normalizados.overlap(buscados)
+
+        stmt = CatalogoRepository.consulta_catalogo(
+            categorias=CatalogoRepository.categorias_con_ingredientes,
+            condicion=condicion,
+            skip=filtro.skip,
+            limit=filtro.limit,
+        )
+        return db.execute(stmt).scalar_one()
+
+    @staticmethod
+    def modelo_de(categoria: str) -> Type[Producto]:
+        return dict(CatalogoRepository.categorias)[categoria]
+
+    @staticmethod
+    def ajustar_precios(
+        db: Session,
+        ajuste: AjustePrecios,
+        tipo: Optional[Any],
+        validar: Callable[[Any], None],
+    ) -> List[int]:
+        """
+        Ajusta los precios de una categoría (opcionalmente de un solo tipo)
+        con un único UPDATE ... RETURNING. Cada precio resultante se pasa a
+        `validar`; si alguno no cumple se propaga el ValueError sin confirmar,
+        y quien llamó revierte el ajuste (ver unidad_de_trabajo).
+        """
+        modelo = CatalogoRepository.modelo_de(ajuste.categoria.value)
+        tabla = modelo.__table__
+        tipo_precio = tabla.c.precio.type
+        campos = ajuste.campos or tipo_precio.clase._fields
+
+        def nuevo_precio(campo: str) -> ColumnElement:
+            actual = campo_compuesto(tabla.c.precio, campo, Numeric(10, 2))
+            if campo not in campos:
+                return actual
+            if ajuste.porcentaje is not None:
+                factor = 1 + ajuste.porcentaje / 100
+                return func.round(actual * literal(factor, Numeric), 2)
+            return actual + literal(ajuste.monto, Numeric)
+
+        stmt = (
+            update(tabla)
+            .values(precio=cast(tuple_(*(nuevo_precio(c) for c in tipo_precio.clase._fields)), tipo_precio))
+            .where(tabla.c.precio.is_not(None))
+        )
+        if tipo is not None:
+            stmt = stmt.where(getattr(modelo, f"tipo_{ajuste.categoria.value}") == tipo)
+        filas = db.execute(stmt.returning(tabla.c.id, tabla.c.precio)).all()
+
+        for fila in filas:
+            try:
+                validar(fila.precio)
+            except ValueError as e:
+                raise ValueError(f"Producto {fila.id}: {e}")
+
+        notificar_cambio(db, ajuste.categoria.value)
+        confirmar(db)
+        return [fila.id for fila in filas]
+
+    @staticmethod
+    def get_versiones(db: Session, tablas: Sequence[str]) -> Dict[str, int]:
+        """Versión de cada tabla (la incrementan los triggers en cada escritura)"""
+        filas = db.execute(_VERSIONES_SQL, {"tablas": list(tablas)})
+        return {tabla: version for tabla, version in filas}
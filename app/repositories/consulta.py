@@ -0,0 +1,91 @@
+"""
+Capa de especificación de consultas para las categorías del catálogo.
+Compone cualquier combinación de filtros con paginación acotada
+en una sola sentencia SELECT.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Type
+from sqlalchemy import Boolean, Integer, Numeric, Select, and_, any_, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql.elements import ColumnElement
+from app.models import Producto
+from app.schemas.filtros import CatalogoFiltro
+
+
+def campo_compuesto(columna, campo: str, tipo=None) -> ColumnElement:
+    """
+    Expresión (tabla.columna).campo para leer un campo de un tipo compuesto
+    de PostgreSQL (price_size, price_amount, status_size).
+    """
+    tabla = columna.table.name
+    return literal_column(f"({tabla}.{columna.name}).{campo}", tipo)
+
+
+def por_ids(columna, ids: Sequence[int]) -> ColumnElement:
+    """columna = ANY(:ids): un solo parámetro de arreglo sin importar cuántos IDs"""
+    return columna == any_(literal(list(ids), ARRAY(Integer)))
+
+
+def precio_compuesto(columna, campo: str) -> ColumnElement:
+    return campo_compuesto(columna, campo, Numeric(10, 2))
+
+
+def disponible_por_tamano(columna) -> ColumnElement:
+    """
+    status_size: el producto está disponible si hay al menos un tamaño.
+    NULL se interpreta como todos los tamaños disponibles (igual que los schemas).
+    """
+    return func.coalesce(
+        or_(
+            campo_compuesto(columna, "small", Boolean),
+            campo_compuesto(columna, "medium", Boolean),
+            campo_compuesto(columna, "big", Boolean),
+        ),
+        True
+    )
+
+
+def disponible_simple(columna) -> ColumnElement:
+    # pan y extra tienen DEFAULT TRUE
+    return func.coalesce(columna, True)
+
+
+@dataclass(frozen=True)
+class EspecificacionCatalogo:
+    """
+    Columnas sobre las que filtra una categoría.
+
+    precio_menor / precio_mayor son el precio más bajo y más alto del
+    producto (small/big o wholesale/retail_sale); el filtro de precio
+    devuelve los productos cuyo rango de precios se cruza con el pedido.
+    """
+    modelo: Type[Producto]
+    tipo: ColumnElement
+    disponible: ColumnElement
+    precio_menor: ColumnElement
+    precio_mayor: ColumnElement
+    booleanos: Dict[str, ColumnElement] = field(default_factory=dict)
+
+    def construir(self, filtro: CatalogoFiltro) -> Select:
+        condiciones = []
+        if filtro.tipo is not None:
+            condiciones.append(self.tipo == filtro.tipo)
+        if filtro.disponible is not None:
+            condiciones.append(self.disponible == filtro.disponible)
+        if filtro.precio_min is not None:
+            condiciones.append(self.precio_mayor >= filtro.precio_min)
+        if filtro.precio_max is not None:
+            condiciones.append(self.precio_menor <= filtro.precio_max)
+        for nombre, columna in self.booleanos.items():
+            valor: Optional[bool] = getattr(filtro, nombre, None)
+            if valor is not None:
+                condiciones.append(columna == valor)
+
+        stmt = select(self.modelo)
+        if condiciones:
+            stmt = stmt.where(and_(*condiciones))
+        return (
+            stmt.order_by(self.modelo.id)
+            .offset(filtro.skip)
+            .limit(filtro.limit)
+        )
@@ -0,0 +1,47 @@
+"""
+Escrituras de una fila con INSERT/UPDATE/DELETE ... RETURNING.
+
+Cada escritura es una sola sentencia: no hay SELECT previo para cargar
+la fila ni refresh() después del commit. Las sesiones usan
+expire_on_commit=False, así el objeto devuelto sigue siendo válido
+después de db.commit().
+"""
+from typing import Any, Dict, Optional, Type, TypeVar
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+M = TypeVar("M")
+
+
+def insertar(db: Session, modelo: Type[M], valores: Dict[str, Any]) -> M:
+    """INSERT ... RETURNING *: la fila creada con id y valores DEFAULT"""
+    return db.scalars(insert(modelo).returning(modelo), [valores]).one()
+
+
+def actualizar(db: Session, modelo: Type[M], entidad_id: int, cambios: Dict[str, Any]) -> Optional[M]:
+    """
+    UPDATE ... WHERE id = :id RETURNING *. Devuelve None si la fila no
+    existe; sin cambios solo lee la fila.
+    """
+    if not cambios:
+        stmt = select(modelo).where(modelo.id == entidad_id)
+        return db.execute(stmt).scalar_one_or_none()
+    stmt = (
+        update(modelo)
+        .where(modelo.id == entidad_id)
+        .values(**cambios)
+        .returning(modelo)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def eliminar(db: Session, modelo: Type[M], entidad_id: int) -> bool:
+    """DELETE ... WHERE id = :id RETURNING id; False si la fila no existía"""
+    stmt = (
+        delete(modelo)
+        .where(modelo.id == entidad_id)
+        .returning(modelo.id)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).scalar_one_or_none() is not None
@@ -1,24 +1,41 @@
 
 from sqlalchemy.orm import Session
 from sqlalchemy import select
-from typing import List, Optional
-from app.models import Extra
-from app.schemas.extra import ExtraCreate, ExtraUpdate
+from typing import Any, Dict, List, Optional
+from app.models import Extra, PriceAmount
+from app.schemas.extra import ExtraCreate, ExtraUpdate, ExtraFiltro
+from app.repositories.consulta import EspecificacionCatalogo, disponible_simple, precio_compuesto
+from app.repositories.notificacion import notificar_cambio
+from app.repositories.catalogo import RepositorioCategoria
+from app.repositories.escritura import actualizar, eliminar, insertar
+from app.database import confirmar
 
 
-class ExtraRepository:
+class ExtraRepository(RepositorioCategoria):
+
+    modelo = Extra
+    categoria = "extra"
+
+    consulta = EspecificacionCatalogo(
+        modelo=Extra,
+        tipo=Extra.tipo_extra,
+        disponible=disponible_simple(Extra.disponible),
+        precio_menor=precio_compuesto(Extra.precio, "wholesale"),
+        precio_mayor=precio_compuesto(Extra.precio, "retail_sale"),
+    )
 
     @staticmethod
-    def create(db: Session, extra: ExtraCreate) -> Extra:
+    def _valores(extra: ExtraCreate) -> Dict[str, Any]:
+        """Columnas de un extra nuevo (compartido por create y upsert_lote)"""
         # Convertir precio schema a tupla para PostgreSQL
         precio_tuple = None
         if extra.precio:
-            precio_tuple = (
+            precio_tuple = PriceAmount(
                 extra.precio.retail_sale,
                 extra.precio.wholesale
             )
         
-        db_extra = Extra(
+        return dict(
             nombre=extra.nombre,
             descripcion=extra.descripcion,
             imagen_url=extra.imagen_url,
@@ -26,10 +43,12 @@ class ExtraRepository:
             precio=precio_tuple,
             disponible=True  
         )
-        
-        db.add(db_extra)
-        db.commit()
-        db.refresh(db_extra)
+
+    @staticmethod
+    def create(db: Session, extra: ExtraCreate) -> Extra:
+        db_extra = insertar(db, Extra, ExtraRepository._valores(extra))
+        notificar_cambio(db, "extra", db_extra.id)
+        confirmar(db)
         return db_extra
     
     @staticmethod
@@ -43,48 +62,48 @@ class ExtraRepository:
         return list(db.execute(stmt).scalars().all())
     
     @staticmethod
-    def get_by_tipo(db: Session, tipo_extra: str) -> List[Extra]:
-        stmt = select(Extra).where(Extra.tipo_extra == tipo_extra)
+    def buscar(db: Session, filtro: ExtraFiltro) -> List[Extra]:
+        """Aplica cualquier combinación de filtros con paginación en una sola consulta"""
+        stmt = ExtraRepository.consulta.construir(filtro)
         return list(db.execute(stmt).scalars().all())
     
     @staticmethod
     def update(db: Session, extra_id: int, extra_update: ExtraUpdate) -> Optional[Extra]:
-        db_extra = ExtraRepository.get_by_id(db, extra_id)
-        if not db_extra:
-            return None
-        
-        # Actualizar campos uno por uno
+        cambios: Dict[str, Any] = {}
         if extra_update.nombre is not None:
-            db_extra.nombre = extra_update.nombre
+            cambios["nombre"] = extra_update.nombre
         if extra_update.descripcion is not None:
-            db_extra.descripcion = extra_update.descripcion
+            cambios["descripcion"] = extra_update.descripcion
         if extra_update.imagen_url is not None:
-            db_extra.imagen_url = extra_update.imagen_url
+            cambios["imagen_url"] = extra_update.imagen_url
         if extra_update.tipo_extra is not None:
-            db_extra.tipo_extra = extra_update.tipo_extra.value
+            cambios["tipo_extra"] = extra_update.tipo_extra.value
         
         # Manejar precio especialmente
         if extra_update.precio is not None:
-            precio_tuple = (
+            precio_tuple = PriceAmount(
                 extra_update.precio.retail_sale,
                 extra_update.precio.wholesale
             )
-            db_extra.precio = precio_tuple
+            cambios["precio"] = precio_tuple
         
         # Manejar disponible
         if extra_update.disponible is not None:
-            db_extra.disponible = extra_update.disponible
+            cambios["disponible"] = extra_update.disponible
         
-        db.commit()
-        db.refresh(db_extra)
+        db_extra = actualizar(db, Extra, extra_id, cambios)
+        if not db_extra:
+            return None
+        
+        notificar_cambio(db, "extra", extra_id)
+        confirmar(db)
         return db_extra
     
     @staticmethod
     def delete(db: Session, extra_id: int) -> bool:
-        db_extra = ExtraRepository.get_by_id(db, extra_id)
-        if not db_extra:
+        if not eliminar(db, Extra, extra_id):
             return False
         
-        db.delete(db_extra)
-        db.commit()
+        notificar_cambio(db, "extra", extra_id)
+        confirmar(db)
         return True
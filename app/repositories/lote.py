@@ -0,0 +1,81 @@
+"""
+Escrituras por lote para las tablas del catálogo.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+from sqlalchemy import Boolean, cast, func, literal, literal_column, true, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models import Producto, StatusSizeType
+from app.repositories.consulta import campo_compuesto, por_ids
+
+
+def upsert_por_nombre(
+    db: Session,
+    modelo: Type[Producto],
+    filas: List[Dict[str, Any]],
+    conservar: Sequence[str] = ("disponible",),
+) -> List[Tuple[int, bool]]:
+    """
+    INSERT ... ON CONFLICT (nombre) DO UPDATE de varias filas en una sola
+    sentencia. Las columnas de `conservar` solo se escriben al insertar.
+
+    Devuelve (id, insertado) en el orden de `filas`; insertado es False
+    cuando la fila ya existía y se actualizó (xmax = 0 solo en filas nuevas).
+    Los nombres del lote deben ser únicos.
+    """
+    tabla = modelo.__table__
+    stmt = pg_insert(tabla).values(filas)
+    actualizar = {
+        columna: stmt.excluded[columna]
+        for columna in filas[0]
+        if columna != "nombre" and columna not in conservar
+    }
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[tabla.c.nombre],
+        set_=actualizar,
+    ).returning(
+        tabla.c.id,
+        tabla.c.nombre,
+        literal_column("(xmax = 0)").label("insertado"),
+    )
+    por_nombre = {fila.nombre: (fila.id, fila.insertado) for fila in db.execute(stmt)}
+    return [por_nombre[fila["nombre"]] for fila in filas]
+
+
+def estado_por_tamano(
+    columna,
+    small: Optional[bool],
+    medium: Optional[bool],
+    big: Optional[bool],
+):
+    """
+    ROW(...)::status_size con los tamaños indicados; los omitidos (None)
+    conservan su valor actual (NULL se toma como disponible).
+    """
+    campos = []
+    for campo, valor in (("small", small), ("medium", medium), ("big", big)):
+        if valor is None:
+            campos.append(func.coalesce(campo_compuesto(columna, campo, Boolean), true()))
+        else:
+            campos.append(literal(valor, Boolean))
+    return cast(tuple_(*campos), StatusSizeType())
+
+
+def actualizar_disponibilidad(
+    db: Session,
+    modelo: Type[Producto],
+    ids: Sequence[int],
+    disponible: Any,
+) -> List[int]:
+    """
+    UPDATE ... SET disponible = :valor WHERE id = ANY(:ids) RETURNING id.
+    Devuelve los IDs que existían.
+    """
+    tabla = modelo.__table__
+    stmt = (
+        update(tabla)
+        .where(por_ids(tabla.c.id, ids))
+        .values(disponible=disponible)
+        .returning(tabla.c.id)
+    )
+    return list(db.execute(stmt).scalars())
@@ -0,0 +1,16 @@
+"""
+Avisos de cambios en el catálogo con NOTIFY de PostgreSQL.
+El aviso viaja dentro de la transacción de la escritura, así que los
+demás workers solo lo reciben si la escritura se confirma.
+"""
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+CANAL_CATALOGO = "catalogo"
+
+
+def notificar_cambio(db: Session, tabla: str, entidad_id: Optional[int] = None) -> None:
+    """Payload 'tabla:id', o 'tabla:*' cuando cambian varias filas"""
+    payload = f"{tabla}:{entidad_id if entidad_id is not None else '*'}"
+    db.execute(select(func.pg_notify(CANAL_CATALOGO, payload)))
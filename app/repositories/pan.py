@@ -1,23 +1,39 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select
-from typing import List, Optional
-from app.models import Pan
-from app.schemas.pan import PanCreate, PanUpdate
+from typing import Any, Dict, List, Optional
+from app.models import Pan, PriceAmount
+from app.schemas.pan import PanCreate, PanUpdate, PanFiltro
+from app.repositories.consulta import EspecificacionCatalogo, disponible_simple, precio_compuesto
+from app.repositories.notificacion import notificar_cambio
+from app.repositories.catalogo import RepositorioCategoria
+from app.repositories.escritura import actualizar, eliminar, insertar
+from app.database import confirmar
 
 
-class PanRepository:
-    
-    @staticmethod
-    def create(db: Session, pan: PanCreate) -> Pan:
+class PanRepository(RepositorioCategoria):
+
+    modelo = Pan
+    categoria = "pan"
+
+    consulta = EspecificacionCatalogo(
+        modelo=Pan,
+        tipo=Pan.tipo_pan,
+        disponible=disponible_simple(Pan.disponible),
+        precio_menor=precio_compuesto(Pan.precio, "wholesale"),
+        precio_mayor=precio_compuesto(Pan.precio, "retail_sale"),
+    )
 
+    @staticmethod
+    def _valores(pan: PanCreate) -> Dict[str, Any]:
+        """Columnas de un pan nuevo (compartido por create y upsert_lote)"""
         precio_tuple = None
         if pan.precio:
-            precio_tuple = (
+            precio_tuple = PriceAmount(
                 pan.precio.retail_sale,
                 pan.precio.wholesale
             )
         
-        db_pan = Pan(
+        return dict(
             nombre=pan.nombre,
             descripcion=pan.descripcion,
             imagen_url=pan.imagen_url,
@@ -26,10 +42,12 @@ class PanRepository:
             disponible=True,  # Disponible por defecto
             ingredientes=pan.ingredientes
         )
-        
-        db.add(db_pan)
-        db.commit()
-        db.refresh(db_pan)
+
+    @staticmethod
+    def create(db: Session, pan: PanCreate) -> Pan:
+        db_pan = insertar(db, Pan, PanRepository._valores(pan))
+        notificar_cambio(db, "pan", db_pan.id)
+        confirmar(db)
         return db_pan
     
     @staticmethod
@@ -43,47 +61,48 @@ class PanRepository:
         return list(db.execute(stmt).scalars().all())
     
     @staticmethod
-    def get_by_tipo(db: Session, tipo_pan: str) -> List[Pan]:
-        stmt = select(Pan).where(Pan.tipo_pan == tipo_pan)
+    def buscar(db: Session, filtro: PanFiltro) -> List[Pan]:
+        """Aplica cualquier combinación de filtros con paginación en una sola consulta"""
+        stmt = PanRepository.consulta.construir(filtro)
         return list(db.execute(stmt).scalars().all())
     
     @staticmethod
     def update(db: Session, pan_id: int, pan_update: PanUpdate) -> Optional[Pan]:
-        db_pan = PanRepository.get_by_id(db, pan_id)
-        if not db_pan:
-            return None
-        
+        cambios: Dict[str, Any] = {}
         if pan_update.nombre is not None:
-            db_pan.nombre = pan_update.nombre
+            cambios["nombre"] = pan_update.nombre
         if pan_update.descripcion is not None:
-            db_pan.descripcion = pan_update.descripcion
+            cambios["descripcion"] = pan_update.descripcion
         if pan_update.imagen_url is not None:
-            db_pan.imagen_url = pan_update.imagen_url
+            cambios["imagen_url"] = pan_update.imagen_url
         if pan_update.tipo_pan is not None:
-            db_pan.tipo_pan = pan_update.tipo_pan.value
+            cambios["tipo_pan"] = pan_update.tipo_pan.value
         if pan_update.ingredientes is not None:
-            db_pan.ingredientes = pan_update.ingredientes
+            cambios["ingredientes"] = pan_update.ingredientes
         
         if pan_update.precio is not None:
-            precio_tuple = (
+            precio_tuple = PriceAmount(
                 pan_update.precio.retail_sale,
                 pan_update.precio.wholesale
             )
-            db_pan.precio = precio_tuple
+            cambios["precio"] = precio_tuple
         
         if pan_update.disponible is not None:
-            db_pan.disponible = pan_update.disponible
+            cambios["disponible"] = pan_update.disponible
         
-        db.commit()
-        db.refresh(db_pan)
+        db_pan = actualizar(db, Pan, pan_id, cambios)
+        if not db_pan:
+            return None
+        
+        notificar_cambio(db, "pan", pan_id)
+        confirmar(db)
         return db_pan
     
     @staticmethod
     def delete(db: Session, pan_id: int) -> bool:
-        db_pan = PanRepository.get_by_id(db, pan_id)
-        if not db_pan:
+        if not eliminar(db, Pan, pan_id):
             return False
         
-        db.delete(db_pan)
-        db.commit()
+        notificar_cambio(db, "pan", pan_id)
+        confirmar(db)
         return True
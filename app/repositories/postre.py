@@ -1,36 +1,57 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select
-from typing import List, Optional
-from app.models import Postre
-from app.schemas.postre import PostreCreate, PostreUpdate
+from typing import Any, Dict, List, Optional
+from app.models import Postre, PriceSize, StatusSize
+from app.schemas.postre import PostreCreate, PostreUpdate, PostreFiltro
+from app.repositories.consulta import EspecificacionCatalogo, disponible_por_tamano, precio_compuesto
+from app.repositories.notificacion import notificar_cambio
+from app.repositories.catalogo import RepositorioCategoria
+from app.repositories.escritura import actualizar, eliminar, insertar
+from app.database import confirmar
 
 
-class PostreRepository:
+class PostreRepository(RepositorioCategoria):
+
+    modelo = Postre
+    categoria = "postre"
+    disponibilidad_por_tamano = True
+
+    consulta = EspecificacionCatalogo(
+        modelo=Postre,
+        tipo=Postre.tipo_postre,
+        disponible=disponible_por_tamano(Postre.disponible),
+        precio_menor=precio_compuesto(Postre.precio, "small"),
+        precio_mayor=precio_compuesto(Postre.precio, "big"),
+        booleanos={"es_dulce": Postre.es_dulce},
+    )
 
     @staticmethod
-    def create(db: Session, postre: PostreCreate) -> Postre:
+    def _valores(postre: PostreCreate) -> Dict[str, Any]:
+        """Columnas de un postre nuevo (compartido por create y upsert_lote)"""
         precio_tuple = None
         if postre.precio:
-            precio_tuple = (
+            precio_tuple = PriceSize(
                 postre.precio.small,
                 postre.precio.medium,
                 postre.precio.big
             )
 
-        db_postre = Postre(
+        return dict(
             nombre=postre.nombre,
             descripcion=postre.descripcion,
             imagen_url=postre.imagen_url,
             tipo_postre=postre.tipo_postre.value if postre.tipo_postre else None,
             precio=precio_tuple,
-            disponible=(True, True, True),  # Todos los tamaños disponibles por defecto
+            disponible=StatusSize(True, True, True),  # Todos los tamaños disponibles por defecto
             ingredientes=postre.ingredientes,
             es_dulce=postre.es_dulce
         )
-        
-        db.add(db_postre)
-        db.commit()
-        db.refresh(db_postre)
+
+    @staticmethod
+    def create(db: Session, postre: PostreCreate) -> Postre:
+        db_postre = insertar(db, Postre, PostreRepository._valores(postre))
+        notificar_cambio(db, "postre", db_postre.id)
+        confirmar(db)
         return db_postre
     
     @staticmethod
@@ -44,55 +65,56 @@ class PostreRepository:
         return list(db.execute(stmt).scalars().all())
     
     @staticmethod
-    def get_by_tipo(db: Session, tipo_postre: str) -> List[Postre]:
-        stmt = select(Postre).where(Postre.tipo_postre == tipo_postre)
+    def buscar(db: Session, filtro: PostreFiltro) -> List[Postre]:
+        """Aplica cualquier combinación de filtros con paginación en una sola consulta"""
+        stmt = PostreRepository.consulta.construir(filtro)
         return list(db.execute(stmt).scalars().all())
     
     @staticmethod
     def update(db: Session, postre_id: int, postre_update: PostreUpdate) -> Optional[Postre]:
-        db_postre = PostreRepository.get_by_id(db, postre_id)
-        if not db_postre:
-            return None
-        
+        cambios: Dict[str, Any] = {}
         if postre_update.nombre is not None:
-            db_postre.nombre = postre_update.nombre
+            cambios["nombre"] = postre_update.nombre
         if postre_update.descripcion is not None:
-            db_postre.descripcion = postre_update.descripcion
+            cambios["descripcion"] = postre_update.descripcion
         if postre_update.imagen_url is not None:
-            db_postre.imagen_url = postre_update.imagen_url
+            cambios["imagen_url"] = postre_update.imagen_url
         if postre_update.tipo_postre is not None:
-            db_postre.tipo_postre = postre_update.tipo_postre.value
+            cambios["tipo_postre"] = postre_update.tipo_postre.value
         if postre_update.ingredientes is not None:
-            db_postre.ingredientes = postre_update.ingredientes
+            cambios["ingredientes"] = postre_update.ingredientes
         if postre_update.es_dulce is not None:
-            db_postre.es_dulce = postre_update.es_dulce
+            cambios["es_dulce"] = postre_update.es_dulce
         
         if postre_update.precio is not None:
-            precio_tuple = (
+            precio_tuple = PriceSize(
                 postre_update.precio.small,
                 postre_update.precio.medium,
                 postre_update.precio.big
             )
-            db_postre.precio = precio_tuple
+            cambios["precio"] = precio_tuple
         
         if postre_update.disponible is not None:
-            disponible_tuple = (
+            disponible_tuple = StatusSize(
                 postre_update.disponible.small,
                 postre_update.disponible.medium,
                 postre_update.disponible.big
             )
-            db_postre.disponible = disponible_tuple
+            cambios["disponible"] = disponible_tuple
         
-        db.commit()
-        db.refresh(db_postre)
+        db_postre = actualizar(db, Postre, postre_id, cambios)
+        if not db_postre:
+            return None
+        
+        notificar_cambio(db, "postre", postre_id)
+        confirmar(db)
         return db_postre
     
     @staticmethod
     def delete(db: Session, postre_id: int) -> bool:
-        db_postre = PostreRepository.get_by_id(db, postre_id)
-        if not db_postre:
+        if not eliminar(db, Postre, postre_id):
             return False
         
-        db.delete(db_postre)
-        db.commit()
+        notificar_cambio(db, "postre", postre_id)
+        confirmar(db)
         return True
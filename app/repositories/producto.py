@@ -1,19 +1,22 @@
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, literal, literal_column, func, cast, or_, Float, Row, Text
+from typing import Iterable, List, Optional, Sequence, Set
 from app.models import Producto
 from app.schemas.producto import ProductoCreate, ProductoUpdate
+from app.repositories.notificacion import notificar_cambio
+from app.repositories.consulta import por_ids
+from app.repositories.escritura import actualizar, eliminar, insertar
+from app.database import confirmar
 
 
 class ProductoRepository:
 
     @staticmethod
     def create(db: Session, producto: ProductoCreate) -> Producto:
-        db_producto = Producto(**producto.model_dump())
-        db.add(db_producto)
-        db.commit()
-        db.refresh(db_producto)
+        db_producto = insertar(db, Producto, producto.model_dump())
+        notificar_cambio(db, "producto", db_producto.id)
+        confirmar(db)
         return db_producto
     
     @staticmethod
@@ -21,6 +24,55 @@ class ProductoRepository:
         stmt = select(Producto).where(Producto.id == producto_id)
         return db.execute(stmt).scalar_one_or_none()
     
+    @staticmethod
+    def get_by_ids(db: Session, producto_ids: List[int]) -> List[Producto]:
+        """Varios productos en una sola consulta (id = ANY); el orden no está garantizado"""
+        stmt = select(Producto).where(por_ids(Producto.id, producto_ids))
+        return list(db.execute(stmt).scalars().all())
+    
+    @staticmethod
+    def get_ids_existentes(db: Session, producto_ids: Iterable[int]) -> Set[int]:
+        """
+        Devuelve cuáles de los IDs existen, en una sola consulta con el
+        mismo texto SQL sin importar cuántos IDs se consulten.
+        """
+        ids = list(set(producto_ids))
+        if not ids:
+            return set()
+        stmt = select(Producto.id).where(por_ids(Producto.id, ids))
+        return set(db.execute(stmt).scalars().all())
+    
+    @staticmethod
+    def buscar(db: Session, texto: str, limit: int = 20) -> Sequence[Row]:
+        """
+        Búsqueda sin acentos y tolerante a errores sobre nombre y descripción
+        de todas las tablas (producto incluye las hijas). Coincide por
+        subcadena o por similitud de trigramas (<%); ambas condiciones usan
+        los índices GIN sobre texto_busqueda(nombre, descripcion).
+        """
+        tabla = Producto.__table__
+        documento = func.texto_busqueda(tabla.c.nombre, tabla.c.descripcion, type_=Text)
+        buscado = func.f_unaccent(func.lower(literal(texto, Text)), type_=Text)
+        # %, _ y \ del texto se buscan literalmente
+        escapado = texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        patron = func.f_unaccent(func.lower(literal(f"%{escapado}%", Text)), type_=Text)
+        relevancia = func.word_similarity(buscado, documento, type_=Float)
+
+        stmt = (
+            select(
+                tabla.c.id,
+                tabla.c.nombre,
+                tabla.c.descripcion,
+                tabla.c.imagen_url,
+                cast(literal_column("producto.tableoid::regclass"), Text).label("categoria"),
+                relevancia.label("relevancia"),
+            )
+            .where(or_(documento.like(patron), buscado.op("<%")(documento)))
+            .order_by(relevancia.desc(), tabla.c.id)
+            .limit(limit)
+        )
+        return db.execute(stmt).all()
+    
     @staticmethod
     def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Producto]:
         stmt = select(Producto).offset(skip).limit(limit)
@@ -28,24 +80,20 @@ class ProductoRepository:
     
     @staticmethod
     def update(db: Session, producto_id: int, producto_update: ProductoUpdate) -> Optional[Producto]:
-        db_producto = ProductoRepository.get_by_id(db, producto_id)
+        update_data = producto_update.model_dump(exclude_unset=True)
+        db_producto = actualizar(db, Producto, producto_id, update_data)
         if not db_producto:
             return None
         
-        update_data = producto_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_producto, field, value)
-        
-        db.commit()
-        db.refresh(db_producto)
+        notificar_cambio(db, "producto", producto_id)
+        confirmar(db)
         return db_producto
     
     @staticmethod
     def delete(db: Session, producto_id: int) -> bool:
-        db_producto = ProductoRepository.get_by_id(db, producto_id)
-        if not db_producto:
+        if not eliminar(db, Producto, producto_id):
             return False
         
-        db.delete(db_producto)
-        db.commit()
+        notificar_cambio(db, "producto", producto_id)
+        confirmar(db)
         return True
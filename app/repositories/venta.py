@@ -1,73 +1,147 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select, text, String
-from typing import List, Optional
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import Select, select, insert, update, delete, text, func, literal_column, tuple_, JSON, String
+from sqlalchemy.exc import DBAPIError
+from typing import List, Optional, Tuple
 from datetime import date
 from app.models import Venta, VentaDetalle
-from app.schemas.venta import VentaCreate, VentaUpdate, VentaDetalleCreate, VentaDetalleUpdate
+from app.repositories.escritura import actualizar, eliminar, insertar
+from app.repositories.consulta import por_ids
+from app.database import confirmar
+from app.schemas.venta import (
+    VentaCreate,
+    VentaUpdate,
+    VentaDetalleCreate,
+    VentaDetalleUpdate,
+    VentaDetallesCambios,
+    InsertarVentaRequest,
+)
 import json
 
 
+# p_fecha tiene DEFAULT CURRENT_DATE en la función; COALESCE conserva ese
+# comportamiento sin cambiar el texto de la sentencia cuando no hay fecha.
+_INSERTAR_VENTA_SQL = text(
+    "SELECT insertar_venta("
+    "CAST(:detalles AS VARCHAR(200)), "
+    "CAST(:venta_detalle AS JSONB), "
+    "COALESCE(CAST(:fecha AS DATE), CURRENT_DATE))"
+)
+
+# Con 'on', trg_calcular_total_venta no recalcula el total en cada fila
+# (solo hasta el final de la transacción: set_config(..., true) = SET LOCAL)
+_OMITIR_TOTAL_SQL = text("SELECT set_config('bakery.omitir_total', :valor, true)")
+
+
 class VentaRepository:    
     @staticmethod
     def create(db: Session, venta: VentaCreate) -> Venta:
-        db_venta = Venta(
+        """
+        Cabecera con un INSERT ... RETURNING y todas las líneas con un solo
+        INSERT de varias filas (RETURNING, en el orden recibido). La venta
+        devuelta ya trae sus detalles: no hay refresh ni carga perezosa.
+        """
+        # El mismo total que calcula trg_calcular_total_venta
+        total = sum(detalle.cantidad * detalle.precio for detalle in venta.detalles_venta)
+        db_venta = insertar(db, Venta, dict(
             detalles=venta.detalles,
             fecha=venta.fecha or date.today(),
-            precio_total=0
-        )
-        db.add(db_venta)
-        db.flush() 
+            precio_total=total
+        ))
         
-        for detalle in venta.detalles_venta:
-            db_detalle = VentaDetalle(
+        lineas = [
+            dict(
                 id_venta=db_venta.id,
                 id_producto=detalle.id_producto,
                 cantidad=detalle.cantidad,
-                precio=detalle.precio
+                precio=detalle.precio,
+                variante=detalle.variante
             )
-            db.add(db_detalle)
+            for detalle in venta.detalles_venta
+        ]
+        stmt = insert(VentaDetalle).returning(VentaDetalle, sort_by_parameter_order=True)
+        detalles = list(db.scalars(stmt, lineas))
         
-        db.commit()
-        db.refresh(db_venta)
+        confirmar(db)
+        set_committed_value(db_venta, "detalles_venta", detalles)
         return db_venta
     
     @staticmethod
     def get_by_id(db: Session, venta_id: int) -> Optional[Venta]:
-        stmt = select(Venta).where(Venta.id == venta_id)
+        stmt = (
+            select(Venta)
+            .options(selectinload(Venta.detalles_venta))
+            .where(Venta.id == venta_id)
+        )
         return db.execute(stmt).scalar_one_or_none()
     
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Venta]:
-        stmt = select(Venta).offset(skip).limit(limit).order_by(Venta.fecha.desc())
-        return list(db.execute(stmt).scalars().all())
+    def bloquear(db: Session, venta_id: int) -> bool:
+        """SELECT ... FOR UPDATE de la cabecera; False si la venta no existe"""
+        stmt = select(Venta.id).where(Venta.id == venta_id).with_for_update()
+        return db.execute(stmt).scalar_one_or_none() is not None
     
     @staticmethod
-    def get_by_fecha(db: Session, fecha: date) -> List[Venta]:
-        stmt = select(Venta).where(Venta.fecha == fecha)
+    def get_all(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        despues_de: Optional[Tuple[date, int]] = None
+    ) -> List[Venta]:
+        """
+        Lista ventas de la más reciente a la más antigua.
+        
+        Con despues_de=(fecha, id) se pagina por keyset: la página empieza
+        justo después de esa venta y su costo no depende de la profundidad
+        (sin OFFSET). El orden (fecha, id) es determinista aun con fechas iguales.
+        """
+        # selectinload: los detalles de toda la página se cargan en una
+        # sola consulta adicional (WHERE id_venta IN ...), no una por venta
+        stmt = (
+            select(Venta)
+            .options(selectinload(Venta.detalles_venta))
+            .order_by(Venta.fecha.desc(), Venta.id.desc())
+            .limit(limit)
+        )
+        stmt = VentaRepository._filtrar(stmt, desde, hasta, despues_de)
+        if despues_de is None:
+            stmt = stmt.offset(skip)
         return list(db.execute(stmt).scalars().all())
     
+    @staticmethod
+    def _filtrar(
+        stmt: Select,
+        desde: Optional[date],
+        hasta: Optional[date],
+        despues_de: Optional[Tuple[date, int]]
+    ) -> Select:
+        if desde is not None:
+            stmt = stmt.where(Venta.fecha >= desde)
+        if hasta is not None:
+            stmt = stmt.where(Venta.fecha <= hasta)
+        if despues_de is not None:
+            stmt = stmt.where(tuple_(Venta.fecha, Venta.id) < tuple_(*despues_de))
+        return stmt
+    
     @staticmethod
     def update(db: Session, venta_id: int, venta_update: VentaUpdate) -> Optional[Venta]:
-        db_venta = VentaRepository.get_by_id(db, venta_id)
+        update_data = venta_update.model_dump(exclude_unset=True)
+        db_venta = actualizar(db, Venta, venta_id, update_data)
         if not db_venta:
             return None
         
-        update_data = venta_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_venta, field, value)
-        
-        db.commit()
-        db.refresh(db_venta)
+        confirmar(db)
+        # Los detalles no cambian; se cargan al construir la respuesta
         return db_venta
     
     @staticmethod
     def delete(db: Session, venta_id: int) -> bool:
-        db_venta = VentaRepository.get_by_id(db, venta_id)
-        if not db_venta:
+        if not eliminar(db, Venta, venta_id):
             return False
         
-        db.delete(db_venta)
-        db.commit()
+        confirmar(db)
         return True
     
     @staticmethod
@@ -77,58 +151,162 @@ class VentaRepository:
         venta_detalle: List[dict],
         fecha: Optional[date] = None
     ) -> int:
-
-        venta_detalle_json = json.dumps(venta_detalle)
+        # Texto SQL constante con parámetros enlazados: se compila una vez,
+        # el driver puede prepararlo en el servidor y reutilizar el plan
+        # (asyncpg cachea sentencias preparadas por texto) y no hay
+        # interpolación de valores en el SQL.
+        result = db.execute(
+            _INSERTAR_VENTA_SQL,
+            {
+                "detalles": detalles,
+                "venta_detalle": json.dumps(venta_detalle),
+                "fecha": fecha,
+            }
+        )
+        venta_id = result.scalar()
+        confirmar(db)
+        return venta_id
+    
+    @staticmethod
+    def _insertar_tickets(db: Session, ventas: List[InsertarVentaRequest]) -> List[int]:
+        """
+        Inserta las cabeceras con un INSERT multi-fila (RETURNING id en el
+        orden de los parámetros) y todas las líneas con otro INSERT multi-fila.
+        """
+        cabeceras = [
+            {
+                "detalles": v.detalles,
+                "fecha": v.fecha or date.today(),
+                "precio_total": 0,
+            }
+            for v in ventas
+        ]
+        stmt = insert(Venta).returning(Venta.id, sort_by_parameter_order=True)
+        venta_ids = list(db.execute(stmt, cabeceras).scalars().all())
         
-        detalles_escaped = detalles.replace("'", "''")
-        venta_detalle_escaped = venta_detalle_json.replace("'", "''")
+        lineas = [
+            {
+                "id_venta": venta_id,
+                "id_producto": d.id_producto,
+                "cantidad": d.cantidad,
+                "precio": d.precio,
+                "variante": d.variante,
+            }
+            for venta_id, v in zip(venta_ids, ventas)
+            for d in v.venta_detalle
+        ]
+        db.execute(insert(VentaDetalle), lineas)
+        return venta_ids
+    
+    @staticmethod
+    def insertar_ventas_lote(
+        db: Session,
+        ventas: List[InsertarVentaRequest]
+    ) -> List[Tuple[Optional[int], Optional[str]]]:
+        """
+        Inserta un lote de tickets en una sola transacción.
+        Devuelve (id, error) por ticket, en el orden recibido.
         
-        if fecha:
-            fecha_str = fecha.isoformat() if isinstance(fecha, date) else fecha
-            sql = f"SELECT insertar_venta('{detalles_escaped}', '{venta_detalle_escaped}'::jsonb, '{fecha_str}'::date)"
-        else:
-            sql = f"SELECT insertar_venta('{detalles_escaped}', '{venta_detalle_escaped}'::jsonb)"
+        Si algún ticket viola un trigger (producto inexistente o agotado),
+        el lote se repite ticket por ticket dentro de SAVEPOINTs para
+        aislar los fallidos sin perder los válidos.
+        """
+        try:
+            with db.begin_nested():
+                venta_ids = VentaRepository._insertar_tickets(db, ventas)
+            resultados = [(venta_id, None) for venta_id in venta_ids]
+        except DBAPIError:
+            resultados = []
+            for venta in ventas:
+                try:
+                    with db.begin_nested():
+                        [venta_id] = VentaRepository._insertar_tickets(db, [venta])
+                    resultados.append((venta_id, None))
+                except DBAPIError as e:
+                    resultados.append((None, str(e.orig).split("\n")[0]))
         
-        result = db.execute(text(sql))
-        venta_id = result.scalar()
-        db.commit()
-        return venta_id
+        confirmar(db)
+        return resultados
     
     @staticmethod
-    def obtener_ventas_detalles(db: Session) -> List[dict]:
+    def obtener_ventas_detalles(
+        db: Session,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        despues_de: Optional[Tuple[date, int]] = None,
+        limit: Optional[int] = None
+    ) -> List[dict]:
         """
-        Obtiene el historial completo de ventas usando la función SQL obtener_ventas_detalles().
+        Obtiene el historial de ventas (mismas columnas que la función SQL
+        obtener_ventas_detalles()) con los filtros aplicados en la consulta.
         Retorna una lista de diccionarios con id_venta, fecha, productos (JSON) y total.
         """
-        sql = "SELECT * FROM obtener_ventas_detalles()"
-        result = db.execute(text(sql))
-        
-        ventas = []
-        for row in result:
-            ventas.append({
-                "id_venta": row[0],
-                "fecha": row[1].isoformat() if row[1] else None,
-                "productos": row[2],
-                "total": float(row[3]) if row[3] else 0.0
-            })
-        
-        return ventas
+        stmt = VentaRepository.historial_stmt(desde, hasta, despues_de, limit)
+        result = db.execute(stmt)
+        
+        return [VentaRepository.historial_a_dict(row) for row in result]
+    
+    @staticmethod
+    def historial_stmt(
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        despues_de: Optional[Tuple[date, int]] = None,
+        limit: Optional[int] = None
+    ) -> Select:
+        """
+        Misma consulta que obtener_ventas_detalles(), escrita en línea.
+        Una función plpgsql con RETURN QUERY materializa todo su resultado
+        antes de devolverlo; la consulta directa permite leerla con un
+        cursor del lado del servidor y aplicar los filtros de fecha y el
+        keyset antes de agrupar.
+        """
+        productos = func.json_agg(
+            func.json_build_object(
+                literal_column("'id_producto'"), VentaDetalle.id_producto,
+                literal_column("'cantidad'"), VentaDetalle.cantidad,
+                literal_column("'precio_unitario'"), VentaDetalle.precio,
+                literal_column("'variante'"), VentaDetalle.variante,
+            ),
+            type_=JSON
+        )
+        stmt = (
+            select(
+                Venta.id.label("id_venta"),
+                Venta.fecha,
+                productos.label("productos"),
+                Venta.precio_total.label("total"),
+            )
+            .outerjoin(VentaDetalle, VentaDetalle.id_venta == Venta.id)
+            .group_by(Venta.id, Venta.fecha, Venta.precio_total)
+            .order_by(Venta.fecha.desc(), Venta.id.desc())
+        )
+        stmt = VentaRepository._filtrar(stmt, desde, hasta, despues_de)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+    
+    @staticmethod
+    def historial_a_dict(row) -> dict:
+        return {
+            "id_venta": row[0],
+            "fecha": row[1].isoformat() if row[1] else None,
+            "productos": row[2],
+            "total": float(row[3]) if row[3] else 0.0
+        }
 
 
 class VentaDetalleRepository:
 
     @staticmethod
     def create(db: Session, detalle: VentaDetalleCreate, venta_id: int) -> VentaDetalle:
-
-        db_detalle = VentaDetalle(
+        db_detalle = insertar(db, VentaDetalle, dict(
             id_venta=venta_id,
             id_producto=detalle.id_producto,
             cantidad=detalle.cantidad,
-            precio=detalle.precio
-        )
-        db.add(db_detalle)
-        db.commit()
-        db.refresh(db_detalle)
+            precio=detalle.precio,
+            variante=detalle.variante
+        ))
+        confirmar(db)
         return db_detalle
     
     @staticmethod
@@ -141,26 +319,72 @@ class VentaDetalleRepository:
         stmt = select(VentaDetalle).where(VentaDetalle.id_venta == venta_id)
         return list(db.execute(stmt).scalars().all())
     
+    @staticmethod
+    def get_ids_by_venta(db: Session, venta_id: int) -> List[int]:
+        stmt = select(VentaDetalle.id).where(VentaDetalle.id_venta == venta_id)
+        return list(db.execute(stmt).scalars().all())
+    
+    @staticmethod
+    def aplicar_cambios(db: Session, venta_id: int, cambios: VentaDetallesCambios) -> Venta:
+        """
+        Elimina, modifica y agrega líneas de una venta con una sentencia por
+        tipo de cambio. El trigger del total se omite mientras tanto y el
+        total se recalcula una sola vez al final (UPDATE ... RETURNING).
+        Las líneas deben pertenecer a la venta (lo verifica el servicio).
+        """
+        db.execute(_OMITIR_TOTAL_SQL, {"valor": "on"})
+        
+        if cambios.eliminar:
+            stmt = (
+                delete(VentaDetalle)
+                .where(VentaDetalle.id_venta == venta_id, por_ids(VentaDetalle.id, cambios.eliminar))
+                .execution_options(synchronize_session=False)
+            )
+            db.execute(stmt)
+        
+        modificaciones = [d.model_dump(exclude_none=True) for d in cambios.actualizar]
+        modificaciones = [m for m in modificaciones if len(m) > 1]
+        if modificaciones:
+            # UPDATE por clave primaria con executemany
+            db.execute(update(VentaDetalle), modificaciones)
+        
+        if cambios.agregar:
+            lineas = [dict(id_venta=venta_id, **d.model_dump()) for d in cambios.agregar]
+            db.execute(insert(VentaDetalle), lineas)
+        
+        db.execute(_OMITIR_TOTAL_SQL, {"valor": "off"})
+        total = (
+            select(func.coalesce(func.sum(VentaDetalle.cantidad * VentaDetalle.precio), 0))
+            .where(VentaDetalle.id_venta == venta_id)
+            .scalar_subquery()
+        )
+        db_venta = actualizar(db, Venta, venta_id, {"precio_total": total})
+        stmt = (
+            select(VentaDetalle)
+            .where(VentaDetalle.id_venta == venta_id)
+            .order_by(VentaDetalle.id)
+            .execution_options(populate_existing=True)
+        )
+        detalles = list(db.scalars(stmt))
+        
+        confirmar(db)
+        set_committed_value(db_venta, "detalles_venta", detalles)
+        return db_venta
+    
     @staticmethod
     def update(db: Session, detalle_id: int, detalle_update: VentaDetalleUpdate) -> Optional[VentaDetalle]:
-        db_detalle = VentaDetalleRepository.get_by_id(db, detalle_id)
+        update_data = detalle_update.model_dump(exclude_unset=True)
+        db_detalle = actualizar(db, VentaDetalle, detalle_id, update_data)
         if not db_detalle:
             return None
         
-        update_data = detalle_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_detalle, field, value)
-        
-        db.commit()
-        db.refresh(db_detalle)
+        confirmar(db)
         return db_detalle
     
     @staticmethod
     def delete(db: Session, detalle_id: int) -> bool:
-        db_detalle = VentaDetalleRepository.get_by_id(db, detalle_id)
-        if not db_detalle:
+        if not eliminar(db, VentaDetalle, detalle_id):
             return False
         
-        db.delete(db_detalle)
-        db.commit()
+        confirmar(db)
         return True
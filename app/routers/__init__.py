@@ -5,6 +5,7 @@ from .pan import router as pan_router
 from .bebida import router as bebida_router
 from .extra import router as extra_router
 from .venta import router as venta_router
+from .catalogo import router as catalogo_router
 
 __all__ = [
     "producto_router",
@@ -13,4 +14,5 @@ __all__ = [
     "bebida_router",
     "extra_router",
     "venta_router",
+    "catalogo_router",
 ]
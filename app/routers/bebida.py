@@ -1,10 +1,16 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
 from typing import List, Optional
-from app.database import get_db
+from app.database import DBRunner, get_runner
+from app.routers.respuestas import respuesta_lista
+from app.routers.parametros import encabezados_ids, lista_ids
+from app.routers.condicional import etag_catalogo
+from app.services.cache import tablas_categoria
 from app.services.bebida_service import BebidaService
-from app.schemas.bebida import BebidaCreate, BebidaUpdate, BebidaOut
+from app.schemas.bebida import BebidaCreate, BebidaUpdate, BebidaOut, BebidaFiltro
+from app.schemas.catalogo import CatalogoBulkOut, DisponibilidadTamanoLote, DisponibilidadLoteOut
+from app.models.types import TypeDrink
+from decimal import Decimal
 
 
 router = APIRouter(
@@ -14,24 +20,57 @@ router = APIRouter(
 
 
 @router.post("/", response_model=BebidaOut, status_code=status.HTTP_201_CREATED)
-def create_bebida(
+async def create_bebida(
     bebida: BebidaCreate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Crear una nueva bebida"""
     try:
-        return BebidaService.create_bebida(db, bebida)
+        return await db.run(BebidaService.create_bebida, bebida)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/{bebida_id}", response_model=BebidaOut)
-def get_bebida(
+@router.post("/bulk", response_model=CatalogoBulkOut)
+async def upsert_bebidas(
+    bebidas: List[BebidaCreate] = Body(..., min_length=1, max_length=1000),
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Crear o actualizar varias bebidas en una sola transacción.
+    Si ya existe una con el mismo nombre se actualiza (su disponibilidad
+    se conserva). Devuelve los IDs en el orden recibido.
+    """
+    try:
+        return await db.run(BebidaService.upsert_bebidas, bebidas)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch("/disponibilidad", response_model=DisponibilidadLoteOut)
+async def actualizar_disponibilidad_bebidas(
+    cambio: DisponibilidadTamanoLote,
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Cambiar la disponibilidad por tamaño de varias bebidas en una sola
+    transacción, p. ej. {"ids": [2, 5], "big": false}. Los tamaños
+    omitidos no cambian; los IDs inexistentes se reportan en no_encontrados.
+    """
+    return await db.run(BebidaService.actualizar_disponibilidad, cambio)
+
+
+@router.get(
+    "/{bebida_id}",
+    response_model=BebidaOut,
+    dependencies=[Depends(etag_catalogo(*tablas_categoria("bebida")))]
+)
+async def get_bebida(
     bebida_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Obtener bebida por ID"""
-    bebida = BebidaService.get_bebida(db, bebida_id)
+    bebida = await db.run(BebidaService.get_bebida, bebida_id)
     if not bebida:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -41,33 +80,51 @@ def get_bebida(
 
 
 @router.get("/", response_model=List[BebidaOut])
-def get_all_bebidas(
-    tipo: Optional[str] = Query(None, description="Filtrar por tipo de bebida"),
+async def get_all_bebidas(
+    tipo: Optional[TypeDrink] = Query(None, description="Filtrar por tipo de bebida"),
     fria: Optional[bool] = Query(None, description="Filtrar por temperatura (true=fría, false=caliente)"),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    disponible: Optional[bool] = Query(None, description="Filtrar por disponibilidad (algún tamaño disponible)"),
+    precio_min: Optional[Decimal] = Query(None, ge=0, description="Precio mínimo"),
+    precio_max: Optional[Decimal] = Query(None, ge=0, description="Precio máximo"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    ids: Optional[List[int]] = Depends(lista_ids),
+    etag: str = Depends(etag_catalogo(*tablas_categoria("bebida"))),
+    db: DBRunner = Depends(get_runner)
 ):
-    """Obtener todas las bebidas con paginación y filtros opcionales"""
-    if tipo:
-        return BebidaService.get_bebidas_by_tipo(db, tipo)
-    if fria is not None:
-        if fria:
-            return BebidaService.get_bebidas_frias(db)
-        else:
-            return BebidaService.get_bebidas_calientes(db)
-    return BebidaService.get_all_bebidas(db, skip, limit)
+    """
+    Obtener bebidas con paginación; los filtros se pueden combinar.
+    Con ?ids=1,5,9 devuelve esos bebidas en ese orden (sin filtros ni
+    paginación); los IDs inexistentes se informan en X-Missing-Ids.
+    """
+    if ids is not None:
+        bebidas, faltantes = await db.run(BebidaService.get_bebidas_by_ids, ids)
+        return respuesta_lista(BebidaOut, bebidas, encabezados_ids(etag, faltantes))
+    try:
+        filtro = BebidaFiltro(
+            tipo=tipo,
+            es_fria=fria,
+            disponible=disponible,
+            precio_min=precio_min,
+            precio_max=precio_max,
+            skip=skip,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    bebidas = await db.run(BebidaService.filtrar_bebidas, filtro)
+    return respuesta_lista(BebidaOut, bebidas, {"ETag": etag})
 
 
 @router.put("/{bebida_id}", response_model=BebidaOut)
-def update_bebida(
+async def update_bebida(
     bebida_id: int,
     bebida_update: BebidaUpdate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Actualizar una bebida"""
     try:
-        bebida = BebidaService.update_bebida(db, bebida_id, bebida_update)
+        bebida = await db.run(BebidaService.update_bebida, bebida_id, bebida_update)
         if not bebida:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -79,12 +136,12 @@ def update_bebida(
 
 
 @router.delete("/{bebida_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_bebida(
+async def delete_bebida(
     bebida_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Eliminar una bebida"""
-    if not BebidaService.delete_bebida(db, bebida_id):
+    if not await db.run(BebidaService.delete_bebida, bebida_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Bebida con ID {bebida_id} no encontrado"
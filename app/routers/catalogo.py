@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List
+from app.database import DBRunner, get_runner
+from app.routers.respuestas import respuesta_lista
+from app.routers.condicional import etag_catalogo, TABLAS_CATALOGO
+from app.services.catalogo_service import CatalogoService
+from app.schemas.catalogo import AjustePrecios, AjustePreciosOut, ItemCatalogo
+from app.schemas.filtros import IngredientesFiltro, ModoIngredientes
+
+
+router = APIRouter(
+    prefix="/catalogo",
+    tags=["catalogo"]
+)
+
+
+@router.get("/", response_model=List[ItemCatalogo])
+async def get_catalogo(
+    etag: str = Depends(etag_catalogo(*TABLAS_CATALOGO)),
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Catálogo completo en una sola petición.
+    Cada producto incluye "categoria" (postre, pan, bebida o extra),
+    que indica qué campos trae.
+    """
+    catalogo = await db.run(CatalogoService.get_catalogo)
+    return respuesta_lista(ItemCatalogo, catalogo, {"ETag": etag})
+
+
+@router.get("/ingredientes", response_model=List[ItemCatalogo])
+async def buscar_por_ingredientes(
+    ingrediente: List[str] = Query(..., description="Ingrediente a buscar (se puede repetir)"),
+    modo: ModoIngredientes = Query(ModoIngredientes.ALGUNO, description="alguno, todos o ninguno"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    etag: str = Depends(etag_catalogo("producto", "postre", "pan", "bebida")),
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Buscar postres, panes y bebidas por ingredientes, p. ej.
+    ?ingrediente=nuez&modo=ninguno para consultas de alérgenos.
+    La búsqueda no distingue mayúsculas.
+    """
+    try:
+        filtro = IngredientesFiltro(ingredientes=ingrediente, modo=modo, skip=skip, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    productos = await db.run(CatalogoService.buscar_por_ingredientes, filtro)
+    return respuesta_lista(ItemCatalogo, productos, {"ETag": etag})
+
+
+@router.post("/precios/ajuste", response_model=AjustePreciosOut)
+async def ajustar_precios(ajuste: AjustePrecios, db: DBRunner = Depends(get_runner)):
+    """
+    Ajustar precios de una categoría completa o de un tipo, p. ej.
+    +8 % a todos los pasteles. Se aplica en una sola sentencia; si algún
+    precio resultante es inválido no se modifica ninguno.
+    """
+    try:
+        return await db.run(CatalogoService.ajustar_precios, ajuste)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
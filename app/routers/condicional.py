@@ -0,0 +1,60 @@
+"""
+GET condicional (ETag / If-None-Match) para los endpoints del catálogo.
+
+El ETag se deriva de la versión de las tablas consultadas (tabla
+catalogo_version, mantenida por triggers) y de la URL pedida. Si el
+cliente ya tiene esa versión se responde 304 antes de ejecutar el
+endpoint, sin consultar productos ni construir schemas.
+
+Cada GET con ETag cuesta por tanto una consulta (un viaje a Postgres) a
+catalogo_version, también cuando el cuerpo sale de la caché en memoria;
+lo que la caché ahorra es la consulta de productos, la validación y la
+serialización. Las versiones leídas se registran en la caché
+(observar_versiones) para que no sirva entradas anteriores a este ETag.
+"""
+import hashlib
+from typing import Callable, Optional
+from fastapi import Depends, HTTPException, Request, Response, status
+from app.database import DBRunner, get_runner
+from app.services import cache
+from app.services.catalogo_service import CatalogoService
+
+# producto (INHERITS) incluye las filas de todas las tablas hijas, y un
+# UPDATE/DELETE sobre producto modifica filas hijas sin cambiar su versión:
+# todo ETag de una categoría debe incluir también la versión de producto
+TABLAS_CATALOGO = cache.TABLAS_CATALOGO
+
+
+def _coincide(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match usa comparación débil
+    etiquetas = (e.strip().removeprefix("W/") for e in if_none_match.split(","))
+    return etag in etiquetas
+
+
+def etag_catalogo(*tablas: str) -> Callable:
+    """
+    Dependencia que calcula el ETag de las tablas dadas, responde 304 si
+    coincide con If-None-Match y, si no, lo agrega a la respuesta.
+    Devuelve el ETag para los endpoints que arman su propia Response.
+    """
+    async def dependencia(
+        request: Request,
+        response: Response,
+        db: DBRunner = Depends(get_runner)
+    ) -> str:
+        versiones = await db.run(CatalogoService.get_versiones, tablas)
+        cache.observar_versiones(versiones)
+        firma = "|".join(
+            [request.url.path, str(request.query_params)]
+            + [f"{tabla}:{versiones.get(tabla, 0)}" for tabla in tablas]
+        )
+        etag = '"' + hashlib.sha1(firma.encode()).hexdigest() + '"'
+        if _coincide(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return etag
+    return dependencia
@@ -1,10 +1,16 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
 from typing import List, Optional
-from app.database import get_db
+from app.database import DBRunner, get_runner
+from app.routers.respuestas import respuesta_lista
+from app.routers.parametros import encabezados_ids, lista_ids
+from app.routers.condicional import etag_catalogo
+from app.services.cache import tablas_categoria
 from app.services.extra_service import ExtraService
-from app.schemas.extra import ExtraCreate, ExtraUpdate, ExtraOut
+from app.schemas.extra import ExtraCreate, ExtraUpdate, ExtraOut, ExtraFiltro
+from app.schemas.catalogo import CatalogoBulkOut, DisponibilidadLote, DisponibilidadLoteOut
+from app.models.types import TypeExtra
+from decimal import Decimal
 
 
 router = APIRouter(
@@ -14,24 +20,56 @@ router = APIRouter(
 
 
 @router.post("/", response_model=ExtraOut, status_code=status.HTTP_201_CREATED)
-def create_extra(
+async def create_extra(
     extra: ExtraCreate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Crear un nuevo extra"""
     try:
-        return ExtraService.create_extra(db, extra)
+        return await db.run(ExtraService.create_extra, extra)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/{extra_id}", response_model=ExtraOut)
-def get_extra(
+@router.post("/bulk", response_model=CatalogoBulkOut)
+async def upsert_extras(
+    extras: List[ExtraCreate] = Body(..., min_length=1, max_length=1000),
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Crear o actualizar varios extras en una sola transacción.
+    Si ya existe uno con el mismo nombre se actualiza (su disponibilidad
+    se conserva). Devuelve los IDs en el orden recibido.
+    """
+    try:
+        return await db.run(ExtraService.upsert_extras, extras)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch("/disponibilidad", response_model=DisponibilidadLoteOut)
+async def actualizar_disponibilidad_extras(
+    cambio: DisponibilidadLote,
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Marcar varios extras como agotados (o disponibles) en una sola
+    transacción. Los IDs inexistentes se reportan en no_encontrados.
+    """
+    return await db.run(ExtraService.actualizar_disponibilidad, cambio)
+
+
+@router.get(
+    "/{extra_id}",
+    response_model=ExtraOut,
+    dependencies=[Depends(etag_catalogo(*tablas_categoria("extra")))]
+)
+async def get_extra(
     extra_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Obtener extra por ID"""
-    extra = ExtraService.get_extra(db, extra_id)
+    extra = await db.run(ExtraService.get_extra, extra_id)
     if not extra:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -41,27 +79,49 @@ def get_extra(
 
 
 @router.get("/", response_model=List[ExtraOut])
-def get_all_extras(
-    tipo: Optional[str] = Query(None, description="Filtrar por tipo de extra"),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+async def get_all_extras(
+    tipo: Optional[TypeExtra] = Query(None, description="Filtrar por tipo de extra"),
+    disponible: Optional[bool] = Query(None, description="Filtrar por disponibilidad"),
+    precio_min: Optional[Decimal] = Query(None, ge=0, description="Precio mínimo"),
+    precio_max: Optional[Decimal] = Query(None, ge=0, description="Precio máximo"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    ids: Optional[List[int]] = Depends(lista_ids),
+    etag: str = Depends(etag_catalogo(*tablas_categoria("extra"))),
+    db: DBRunner = Depends(get_runner)
 ):
-    """Obtener todos los extras con paginación y filtro opcional por tipo"""
-    if tipo:
-        return ExtraService.get_extras_by_tipo(db, tipo)
-    return ExtraService.get_all_extras(db, skip, limit)
+    """
+    Obtener extras con paginación; los filtros se pueden combinar.
+    Con ?ids=1,5,9 devuelve esos extras en ese orden (sin filtros ni
+    paginación); los IDs inexistentes se informan en X-Missing-Ids.
+    """
+    if ids is not None:
+        extras, faltantes = await db.run(ExtraService.get_extras_by_ids, ids)
+        return respuesta_lista(ExtraOut, extras, encabezados_ids(etag, faltantes))
+    try:
+        filtro = ExtraFiltro(
+            tipo=tipo,
+            disponible=disponible,
+            precio_min=precio_min,
+            precio_max=precio_max,
+            skip=skip,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    extras = await db.run(ExtraService.filtrar_extras, filtro)
+    return respuesta_lista(ExtraOut, extras, {"ETag": etag})
 
 
 @router.put("/{extra_id}", response_model=ExtraOut)
-def update_extra(
+async def update_extra(
     extra_id: int,
     extra_update: ExtraUpdate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Actualizar un extra"""
     try:
-        extra = ExtraService.update_extra(db, extra_id, extra_update)
+        extra = await db.run(ExtraService.update_extra, extra_id, extra_update)
         if not extra:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -73,12 +133,12 @@ def update_extra(
 
 
 @router.delete("/{extra_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_extra(
+async def delete_extra(
     extra_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Eliminar un extra"""
-    if not ExtraService.delete_extra(db, extra_id):
+    if not await db.run(ExtraService.delete_extra, extra_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Extra con ID {extra_id} no encontrado"
@@ -1,10 +1,16 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
 from typing import List, Optional
-from app.database import get_db
+from app.database import DBRunner, get_runner
+from app.routers.respuestas import respuesta_lista
+from app.routers.parametros import encabezados_ids, lista_ids
+from app.routers.condicional import etag_catalogo
+from app.services.cache import tablas_categoria
 from app.services.pan_service import PanService
-from app.schemas.pan import PanCreate, PanUpdate, PanOut
+from app.schemas.pan import PanCreate, PanUpdate, PanOut, PanFiltro
+from app.schemas.catalogo import CatalogoBulkOut, DisponibilidadLote, DisponibilidadLoteOut
+from app.models.types import TypeBread
+from decimal import Decimal
 
 
 router = APIRouter(
@@ -14,24 +20,56 @@ router = APIRouter(
 
 
 @router.post("/", response_model=PanOut, status_code=status.HTTP_201_CREATED)
-def create_pan(
+async def create_pan(
     pan: PanCreate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Crear un nuevo pan"""
     try:
-        return PanService.create_pan(db, pan)
+        return await db.run(PanService.create_pan, pan)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/{pan_id}", response_model=PanOut)
-def get_pan(
+@router.post("/bulk", response_model=CatalogoBulkOut)
+async def upsert_panes(
+    panes: List[PanCreate] = Body(..., min_length=1, max_length=1000),
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Crear o actualizar varios panes en una sola transacción.
+    Si ya existe uno con el mismo nombre se actualiza (su disponibilidad
+    se conserva). Devuelve los IDs en el orden recibido.
+    """
+    try:
+        return await db.run(PanService.upsert_panes, panes)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch("/disponibilidad", response_model=DisponibilidadLoteOut)
+async def actualizar_disponibilidad_panes(
+    cambio: DisponibilidadLote,
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Marcar varios panes como agotados (o disponibles) en una sola
+    transacción. Los IDs inexistentes se reportan en no_encontrados.
+    """
+    return await db.run(PanService.actualizar_disponibilidad, cambio)
+
+
+@router.get(
+    "/{pan_id}",
+    response_model=PanOut,
+    dependencies=[Depends(etag_catalogo(*tablas_categoria("pan")))]
+)
+async def get_pan(
     pan_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Obtener pan por ID"""
-    pan = PanService.get_pan(db, pan_id)
+    pan = await db.run(PanService.get_pan, pan_id)
     if not pan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -41,27 +79,49 @@ def get_pan(
 
 
 @router.get("/", response_model=List[PanOut])
-def get_all_panes(
-    tipo: Optional[str] = Query(None, description="Filtrar por tipo de pan (Dulce/Salado)"),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+async def get_all_panes(
+    tipo: Optional[TypeBread] = Query(None, description="Filtrar por tipo de pan (Dulce/Salado)"),
+    disponible: Optional[bool] = Query(None, description="Filtrar por disponibilidad"),
+    precio_min: Optional[Decimal] = Query(None, ge=0, description="Precio mínimo"),
+    precio_max: Optional[Decimal] = Query(None, ge=0, description="Precio máximo"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    ids: Optional[List[int]] = Depends(lista_ids),
+    etag: str = Depends(etag_catalogo(*tablas_categoria("pan"))),
+    db: DBRunner = Depends(get_runner)
 ):
-    """Obtener todos los panes con paginación y filtro opcional por tipo"""
-    if tipo:
-        return PanService.get_panes_by_tipo(db, tipo)
-    return PanService.get_all_panes(db, skip, limit)
+    """
+    Obtener panes con paginación; los filtros se pueden combinar.
+    Con ?ids=1,5,9 devuelve esos panes en ese orden (sin filtros ni
+    paginación); los IDs inexistentes se informan en X-Missing-Ids.
+    """
+    if ids is not None:
+        panes, faltantes = await db.run(PanService.get_panes_by_ids, ids)
+        return respuesta_lista(PanOut, panes, encabezados_ids(etag, faltantes))
+    try:
+        filtro = PanFiltro(
+            tipo=tipo,
+            disponible=disponible,
+            precio_min=precio_min,
+            precio_max=precio_max,
+            skip=skip,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    panes = await db.run(PanService.filtrar_panes, filtro)
+    return respuesta_lista(PanOut, panes, {"ETag": etag})
 
 
 @router.put("/{pan_id}", response_model=PanOut)
-def update_pan(
+async def update_pan(
     pan_id: int,
     pan_update: PanUpdate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Actualizar un pan"""
     try:
-        pan = PanService.update_pan(db, pan_id, pan_update)
+        pan = await db.run(PanService.update_pan, pan_id, pan_update)
         if not pan:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -73,12 +133,12 @@ def update_pan(
 
 
 @router.delete("/{pan_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_pan(
+async def delete_pan(
     pan_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Eliminar un pan"""
-    if not PanService.delete_pan(db, pan_id):
+    if not await db.run(PanService.delete_pan, pan_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Pan con ID {pan_id} no encontrado"
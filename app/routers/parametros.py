@@ -0,0 +1,43 @@
+"""
+Parámetros de consulta compartidos por los routers.
+"""
+from typing import Dict, List, Optional, Sequence
+from fastapi import HTTPException, Query, status
+
+MAX_IDS = 200
+
+# Encabezado con los IDs pedidos en ?ids= que no existen
+ENCABEZADO_FALTANTES = "X-Missing-Ids"
+
+
+def lista_ids(
+    ids: Optional[str] = Query(
+        None,
+        description=f"IDs separados por coma, p. ej. 1,5,9 (máximo {MAX_IDS}); ignora la paginación",
+    )
+) -> Optional[List[int]]:
+    """Convierte ?ids=1,5,9 en [1, 5, 9]"""
+    if ids is None:
+        return None
+    try:
+        valores = [int(valor) for valor in ids.split(",") if valor.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids debe ser una lista de enteros separados por coma",
+        )
+    if not valores:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids no puede estar vacío")
+    if len(valores) > MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Se permiten como máximo {MAX_IDS} IDs",
+        )
+    return valores
+
+
+def encabezados_ids(etag: str, faltantes: Sequence[int]) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    if faltantes:
+        headers[ENCABEZADO_FALTANTES] = ",".join(str(producto_id) for producto_id in faltantes)
+    return headers
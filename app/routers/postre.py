@@ -1,10 +1,16 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
 from typing import List, Optional
-from app.database import get_db
+from app.database import DBRunner, get_runner
+from app.routers.respuestas import respuesta_lista
+from app.routers.parametros import encabezados_ids, lista_ids
+from app.routers.condicional import etag_catalogo
+from app.services.cache import tablas_categoria
 from app.services.postre_service import PostreService
-from app.schemas.postre import PostreCreate, PostreUpdate, PostreOut
+from app.schemas.postre import PostreCreate, PostreUpdate, PostreOut, PostreFiltro
+from app.schemas.catalogo import CatalogoBulkOut, DisponibilidadTamanoLote, DisponibilidadLoteOut
+from app.models.types import TypeDessert
+from decimal import Decimal
 
 
 router = APIRouter(
@@ -14,24 +20,57 @@ router = APIRouter(
 
 
 @router.post("/", response_model=PostreOut, status_code=status.HTTP_201_CREATED)
-def create_postre(
+async def create_postre(
     postre: PostreCreate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Crear un nuevo postre"""
     try:
-        return PostreService.create_postre(db, postre)
+        return await db.run(PostreService.create_postre, postre)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/{postre_id}", response_model=PostreOut)
-def get_postre(
+@router.post("/bulk", response_model=CatalogoBulkOut)
+async def upsert_postres(
+    postres: List[PostreCreate] = Body(..., min_length=1, max_length=1000),
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Crear o actualizar varios postres en una sola transacción.
+    Si ya existe uno con el mismo nombre se actualiza (su disponibilidad
+    se conserva). Devuelve los IDs en el orden recibido.
+    """
+    try:
+        return await db.run(PostreService.upsert_postres, postres)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch("/disponibilidad", response_model=DisponibilidadLoteOut)
+async def actualizar_disponibilidad_postres(
+    cambio: DisponibilidadTamanoLote,
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Cambiar la disponibilidad por tamaño de varios postres en una sola
+    transacción, p. ej. {"ids": [2, 5], "big": false}. Los tamaños
+    omitidos no cambian; los IDs inexistentes se reportan en no_encontrados.
+    """
+    return await db.run(PostreService.actualizar_disponibilidad, cambio)
+
+
+@router.get(
+    "/{postre_id}",
+    response_model=PostreOut,
+    dependencies=[Depends(etag_catalogo(*tablas_categoria("postre")))]
+)
+async def get_postre(
     postre_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Obtener postre por ID"""
-    postre = PostreService.get_postre(db, postre_id)
+    postre = await db.run(PostreService.get_postre, postre_id)
     if not postre:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -41,27 +80,51 @@ def get_postre(
 
 
 @router.get("/", response_model=List[PostreOut])
-def get_all_postres(
-    tipo: Optional[str] = Query(None, description="Filtrar por tipo de postre"),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+async def get_all_postres(
+    tipo: Optional[TypeDessert] = Query(None, description="Filtrar por tipo de postre"),
+    es_dulce: Optional[bool] = Query(None, description="Filtrar por postres dulces (true) o salados (false)"),
+    disponible: Optional[bool] = Query(None, description="Filtrar por disponibilidad (algún tamaño disponible)"),
+    precio_min: Optional[Decimal] = Query(None, ge=0, description="Precio mínimo"),
+    precio_max: Optional[Decimal] = Query(None, ge=0, description="Precio máximo"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    ids: Optional[List[int]] = Depends(lista_ids),
+    etag: str = Depends(etag_catalogo(*tablas_categoria("postre"))),
+    db: DBRunner = Depends(get_runner)
 ):
-    """Obtener todos los postres con paginación y filtro opcional por tipo"""
-    if tipo:
-        return PostreService.get_postres_by_tipo(db, tipo)
-    return PostreService.get_all_postres(db, skip, limit)
+    """
+    Obtener postres con paginación; los filtros se pueden combinar.
+    Con ?ids=1,5,9 devuelve esos postres en ese orden (sin filtros ni
+    paginación); los IDs inexistentes se informan en X-Missing-Ids.
+    """
+    if ids is not None:
+        postres, faltantes = await db.run(PostreService.get_postres_by_ids, ids)
+        return respuesta_lista(PostreOut, postres, encabezados_ids(etag, faltantes))
+    try:
+        filtro = PostreFiltro(
+            tipo=tipo,
+            es_dulce=es_dulce,
+            disponible=disponible,
+            precio_min=precio_min,
+            precio_max=precio_max,
+            skip=skip,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    postres = await db.run(PostreService.filtrar_postres, filtro)
+    return respuesta_lista(PostreOut, postres, {"ETag": etag})
 
 
 @router.put("/{postre_id}", response_model=PostreOut)
-def update_postre(
+async def update_postre(
     postre_id: int,
     postre_update: PostreUpdate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Actualizar un postre"""
     try:
-        postre = PostreService.update_postre(db, postre_id, postre_update)
+        postre = await db.run(PostreService.update_postre, postre_id, postre_update)
         if not postre:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -73,12 +136,12 @@ def update_postre(
 
 
 @router.delete("/{postre_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_postre(
+async def delete_postre(
     postre_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Eliminar un postre"""
-    if not PostreService.delete_postre(db, postre_id):
+    if not await db.run(PostreService.delete_postre, postre_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Postre con ID {postre_id} no encontrado"
@@ -1,10 +1,12 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
+from app.database import DBRunner, get_runner
+from app.routers.respuestas import respuesta_lista
+from app.routers.parametros import encabezados_ids, lista_ids
+from app.routers.condicional import etag_catalogo, TABLAS_CATALOGO
 from app.services.producto_service import ProductoService
-from app.schemas.producto import ProductoCreate, ProductoUpdate, ProductoOut
+from app.schemas.producto import ProductoCreate, ProductoUpdate, ProductoOut, ProductoBusqueda
 
 
 router = APIRouter(
@@ -14,24 +16,47 @@ router = APIRouter(
 
 
 @router.post("/", response_model=ProductoOut, status_code=status.HTTP_201_CREATED)
-def create_producto(
+async def create_producto(
     producto: ProductoCreate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Crear un nuevo producto"""
     try:
-        return ProductoService.create_producto(db, producto)
+        return await db.run(ProductoService.create_producto, producto)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/{producto_id}", response_model=ProductoOut)
-def get_producto(
+@router.get("/buscar", response_model=List[ProductoBusqueda])
+async def buscar_productos(
+    q: str = Query(..., min_length=2, max_length=100, description="Texto a buscar en nombre y descripción"),
+    limit: int = Query(20, ge=1, le=100),
+    etag: str = Depends(etag_catalogo(*TABLAS_CATALOGO)),
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Buscar productos de todas las categorías por nombre o descripción.
+    No distingue acentos ni mayúsculas y tolera errores de escritura;
+    los resultados se ordenan por relevancia.
+    """
+    try:
+        productos = await db.run(ProductoService.buscar_productos, q, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return respuesta_lista(ProductoBusqueda, productos, {"ETag": etag})
+
+
+@router.get(
+    "/{producto_id}",
+    response_model=ProductoOut,
+    dependencies=[Depends(etag_catalogo(*TABLAS_CATALOGO))]
+)
+async def get_producto(
     producto_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Obtener producto por ID"""
-    producto = ProductoService.get_producto(db, producto_id)
+    producto = await db.run(ProductoService.get_producto, producto_id)
     if not producto:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -41,24 +66,34 @@ def get_producto(
 
 
 @router.get("/", response_model=List[ProductoOut])
-def get_all_productos(
+async def get_all_productos(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    ids: Optional[List[int]] = Depends(lista_ids),
+    etag: str = Depends(etag_catalogo(*TABLAS_CATALOGO)),
+    db: DBRunner = Depends(get_runner)
 ):
-    """Obtener todos los productos con paginación"""
-    return ProductoService.get_all_productos(db, skip, limit)
+    """
+    Obtener todos los productos con paginación.
+    Con ?ids=1,5,9 devuelve esos productos en ese orden (sin filtros ni
+    paginación); los IDs inexistentes se informan en X-Missing-Ids.
+    """
+    if ids is not None:
+        productos, faltantes = await db.run(ProductoService.get_productos_by_ids, ids)
+        return respuesta_lista(ProductoOut, productos, encabezados_ids(etag, faltantes))
+    productos = await db.run(ProductoService.get_all_productos, skip, limit)
+    return respuesta_lista(ProductoOut, productos, {"ETag": etag})
 
 
 @router.put("/{producto_id}", response_model=ProductoOut)
-def update_producto(
+async def update_producto(
     producto_id: int,
     producto_update: ProductoUpdate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Actualizar un producto"""
     try:
-        producto = ProductoService.update_producto(db, producto_id, producto_update)
+        producto = await db.run(ProductoService.update_producto, producto_id, producto_update)
         if not producto:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -70,12 +105,12 @@ def update_producto(
 
 
 @router.delete("/{producto_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_producto(
+async def delete_producto(
     producto_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Eliminar un producto"""
-    if not ProductoService.delete_producto(db, producto_id):
+    if not await db.run(ProductoService.delete_producto, producto_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Producto con ID {producto_id} no encontrado"
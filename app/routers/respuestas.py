@@ -0,0 +1,30 @@
+"""
+Respuestas JSON serializadas en una sola pasada.
+
+Los servicios ya devuelven modelos *Out validados; al devolver una
+Response con los bytes de TypeAdapter.dump_json, FastAPI no vuelve a
+validarlos contra response_model ni pasa por jsonable_encoder.
+response_model se conserva en los decoradores para la documentación.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adaptador_lista(modelo: Any) -> TypeAdapter:
+    return TypeAdapter(List[modelo])
+
+
+def respuesta_lista(
+    modelo: Any,
+    items: Sequence[Any],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Serializa una lista de modelos directamente a bytes JSON"""
+    return Response(
+        content=_adaptador_lista(modelo).dump_json(items),
+        media_type="application/json",
+        headers=headers,
+    )
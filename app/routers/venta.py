@@ -1,11 +1,21 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import date
-from app.database import get_db
+import json
+from app.database import DBRunner, get_runner
+from app.routers.respuestas import respuesta_lista
 from app.services.venta_service import VentaService
-from app.schemas.venta import VentaCreate, VentaUpdate, VentaOut, InsertarVentaRequest
+from app.services.escritor_ventas import EscritorDetenido, EscritorVentas
+from app.schemas.venta import (
+    VentaCreate,
+    VentaUpdate,
+    VentaOut,
+    VentaDetallesCambios,
+    InsertarVentaRequest,
+    VentaBulkOut,
+)
 
 
 router = APIRouter(
@@ -15,9 +25,9 @@ router = APIRouter(
 
 
 @router.post("/", response_model=VentaOut, status_code=status.HTTP_201_CREATED)
-def create_venta(
+async def create_venta(
     venta: VentaCreate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """
     Crear una nueva venta con sus detalles.
@@ -28,15 +38,21 @@ def create_venta(
     - Calcular precio_total
     """
     try:
-        return VentaService.create_venta(db, venta)
+        return await db.run(VentaService.create_venta, venta)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+def escritor_ventas(http: Request) -> Optional[EscritorVentas]:
+    """Escritor de group commit, si BAKERY_VENTAS_AGRUPADAS está activo"""
+    return getattr(http.app.state, "escritor_ventas", None)
+
+
 @router.post("/crear", status_code=status.HTTP_201_CREATED)
-def insertar_venta_sql(
+async def insertar_venta_sql(
     request: InsertarVentaRequest,
-    db: Session = Depends(get_db)
+    escritor: Optional[EscritorVentas] = Depends(escritor_ventas),
+    db: DBRunner = Depends(get_runner)
 ):
     """
     Crear venta usando la función SQL insertar_venta() de PostgreSQL.
@@ -47,23 +63,56 @@ def insertar_venta_sql(
     - Actualización de stock
     - Cálculo de total
     
+    Con BAKERY_VENTAS_AGRUPADAS=1 el ticket se confirma junto con los
+    que lleguen en los siguientes milisegundos, en una sola transacción.
+    
     Returns:
         ID de la venta creada
     """
     try:
-        venta_id = VentaService.insertar_venta_sql(db, request)
+        if escritor is not None:
+            VentaService.validar_venta_sql(request)
+            venta_id = await escritor.encolar(request)
+        else:
+            venta_id = await db.run(VentaService.insertar_venta_sql, request)
         return {"id": venta_id, "message": "Venta creada exitosamente"}
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except EscritorDetenido as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="La venta no se confirmó a tiempo; puede haberse registrado, verifique antes de reintentar"
+        )
+
+
+@router.post("/bulk", response_model=VentaBulkOut, status_code=status.HTTP_201_CREATED)
+async def insertar_ventas_bulk(
+    ventas: List[InsertarVentaRequest] = Body(..., min_length=1, max_length=5000),
+    lote: Optional[int] = Query(None, ge=1, description="Tickets por transacción (por defecto, todos en una)"),
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Insertar muchos tickets en una sola petición.
+    
+    Pensado para las terminales que reenvían su cola tras perder la red.
+    Cabeceras y líneas se escriben con INSERT multi-fila; los tickets que
+    fallen se reportan individualmente sin afectar al resto.
+    """
+    try:
+        return await db.run(VentaService.insertar_ventas_bulk, ventas, lote)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{venta_id}", response_model=VentaOut)
-def get_venta(
+async def get_venta(
     venta_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """Obtener venta por ID con sus detalles"""
-    venta = VentaService.get_venta(db, venta_id)
+    venta = await db.run(VentaService.get_venta, venta_id)
     if not venta:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -73,23 +122,39 @@ def get_venta(
 
 
 @router.get("/", response_model=List[VentaOut])
-def get_all_ventas(
+async def get_all_ventas(
     fecha: Optional[date] = Query(None, description="Filtrar por fecha"),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    desde: Optional[date] = Query(None, description="Fecha inicial (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha final (inclusive)"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en X-Next-Cursor (paginación por keyset)"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: DBRunner = Depends(get_runner)
 ):
-    """Obtener todas las ventas con paginación y filtro opcional por fecha"""
+    """
+    Obtener ventas con paginación y filtros opcionales por fecha.
+    
+    Si la página está llena se devuelve el encabezado X-Next-Cursor; al
+    enviarlo como ?cursor= la siguiente página se obtiene por keyset
+    (fecha, id) en lugar de OFFSET.
+    """
     if fecha:
-        return VentaService.get_ventas_by_fecha(db, fecha)
-    return VentaService.get_all_ventas(db, skip, limit)
+        desde = hasta = fecha
+    try:
+        ventas = await db.run(VentaService.get_all_ventas, skip, limit, desde, hasta, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    headers = {}
+    if ventas and len(ventas) == limit and ventas[-1].fecha is not None:
+        headers["X-Next-Cursor"] = VentaService.codificar_cursor(ventas[-1].fecha, ventas[-1].id)
+    return respuesta_lista(VentaOut, ventas, headers)
 
 
 @router.put("/{venta_id}", response_model=VentaOut)
-def update_venta(
+async def update_venta(
     venta_id: int,
     venta_update: VentaUpdate,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """
     Actualizar una venta (solo detalles y fecha).
@@ -98,7 +163,7 @@ def update_venta(
     se recalcula automáticamente por trigger.
     """
     try:
-        venta = VentaService.update_venta(db, venta_id, venta_update)
+        venta = await db.run(VentaService.update_venta, venta_id, venta_update)
         if not venta:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -109,38 +174,101 @@ def update_venta(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.patch("/{venta_id}/detalles", response_model=VentaOut)
+async def actualizar_detalles_venta(
+    venta_id: int,
+    cambios: VentaDetallesCambios,
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Corregir un ticket: agregar, modificar y eliminar líneas en una sola
+    transacción. El total se recalcula una vez, al final; si algún cambio
+    falla no se aplica ninguno.
+    """
+    try:
+        venta = await db.run(VentaService.actualizar_detalles, venta_id, cambios)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not venta:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Venta con ID {venta_id} no encontrada"
+        )
+    return venta
+
+
 @router.get("/historial/detalles", response_model=List[dict])
-def get_ventas_historial(
-    db: Session = Depends(get_db)
+async def get_ventas_historial(
+    desde: Optional[date] = Query(None, description="Fecha inicial (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha final (inclusive)"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en X-Next-Cursor (paginación por keyset)"),
+    limit: Optional[int] = Query(None, ge=1, description="Máximo de ventas (por defecto, todas)"),
+    db: DBRunner = Depends(get_runner)
 ):
     """
-    Obtener historial completo de ventas con detalles.
-    Usa la función SQL obtener_ventas_detalles() que retorna:
+    Obtener historial de ventas con detalles.
+    Mismo formato que la función SQL obtener_ventas_detalles():
     - id_venta
     - fecha
     - productos (JSON con detalles)
     - total
     """
     try:
-        return VentaService.obtener_ventas_detalles(db)
+        ventas = await db.run(VentaService.obtener_ventas_detalles, desde, hasta, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al obtener historial de ventas: {str(e)}"
         )
+    headers = {}
+    if ventas and len(ventas) == limit and ventas[-1]["fecha"] is not None:
+        ultima = ventas[-1]
+        headers["X-Next-Cursor"] = VentaService.codificar_cursor(
+            date.fromisoformat(ultima["fecha"]), ultima["id_venta"]
+        )
+    return respuesta_lista(dict, ventas, headers)
+
+
+@router.get("/historial/detalles/stream")
+async def stream_ventas_historial(
+    desde: Optional[date] = Query(None, description="Fecha inicial (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha final (inclusive)"),
+    db: DBRunner = Depends(get_runner)
+):
+    """
+    Historial de ventas en formato NDJSON (una venta por línea).
+    
+    Las filas se leen con un cursor del lado del servidor y se envían por
+    lotes, así la memoria no crece con el tamaño del historial.
+    """
+    try:
+        consulta = VentaService.consulta_historial(desde, hasta)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    async def ndjson():
+        async for lote in db.stream(consulta):
+            yield "".join(
+                json.dumps(VentaService.historial_a_dict(fila)) + "\n"
+                for fila in lote
+            )
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 
 @router.delete("/{venta_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_venta(
+async def delete_venta(
     venta_id: int,
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_runner)
 ):
     """
     Eliminar una venta.
     
     IMPORTANTE: Los triggers devuelven el stock automáticamente.
     """
-    if not VentaService.delete_venta(db, venta_id):
+    if not await db.run(VentaService.delete_venta, venta_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Venta con ID {venta_id} no encontrada"
@@ -1,10 +1,26 @@
 
 from .types import PriceSizeSchema, PriceAmountSchema
-from .producto import ProductoBase, ProductoCreate, ProductoUpdate, ProductoOut
-from .postre import PostreBase, PostreCreate, PostreUpdate, PostreOut
-from .pan import PanBase, PanCreate, PanUpdate, PanOut
-from .bebida import BebidaBase, BebidaCreate, BebidaUpdate, BebidaOut
-from .extra import ExtraBase, ExtraCreate, ExtraUpdate, ExtraOut
+from .filtros import CatalogoFiltro, ModoIngredientes, IngredientesFiltro
+from .producto import ProductoBase, ProductoCreate, ProductoUpdate, ProductoOut, ProductoBusqueda
+from .postre import PostreBase, PostreCreate, PostreUpdate, PostreOut, PostreFiltro
+from .pan import PanBase, PanCreate, PanUpdate, PanOut, PanFiltro
+from .bebida import BebidaBase, BebidaCreate, BebidaUpdate, BebidaOut, BebidaFiltro
+from .extra import ExtraBase, ExtraCreate, ExtraUpdate, ExtraOut, ExtraFiltro
+from .catalogo import (
+    PostreCatalogo,
+    PanCatalogo,
+    BebidaCatalogo,
+    ExtraCatalogo,
+    ItemCatalogo,
+    CatalogoAdapter,
+    CatalogoBulkOut,
+    CategoriaCatalogo,
+    AjustePrecios,
+    AjustePreciosOut,
+    DisponibilidadLote,
+    DisponibilidadTamanoLote,
+    DisponibilidadLoteOut,
+)
 from .venta import (
     VentaBase,
     VentaCreate,
@@ -13,40 +29,67 @@ from .venta import (
     VentaDetalleBase,
     VentaDetalleCreate,
     VentaDetalleUpdate,
+    VentaDetalleCambio,
+    VentaDetallesCambios,
     VentaDetalleOut,
     InsertarVentaRequest,
     VentaDetalleJSON,
+    VentaBulkResultado,
+    VentaBulkOut,
 )
 
 __all__ = [
     # Types
     "PriceSizeSchema",
     "PriceAmountSchema",
+    # Filtros
+    "CatalogoFiltro",
+    "ModoIngredientes",
+    "IngredientesFiltro",
     # Producto
     "ProductoBase",
     "ProductoCreate",
     "ProductoUpdate",
     "ProductoOut",
+    "ProductoBusqueda",
     # Postre
     "PostreBase",
     "PostreCreate",
     "PostreUpdate",
     "PostreOut",
+    "PostreFiltro",
     # Pan
     "PanBase",
     "PanCreate",
     "PanUpdate",
     "PanOut",
+    "PanFiltro",
     # Bebida
     "BebidaBase",
     "BebidaCreate",
     "BebidaUpdate",
     "BebidaOut",
+    "BebidaFiltro",
     # Extra
     "ExtraBase",
     "ExtraCreate",
     "ExtraUpdate",
     "ExtraOut",
+    "ExtraFiltro",
+    # Catálogo
+    "PostreCatalogo",
+    "PanCatalogo",
+    "BebidaCatalogo",
+    "ExtraCatalogo",
+    "ItemCatalogo",
+    "CatalogoAdapter",
+    "CatalogoBulkOut",
+    "CategoriaCatalogo",
+    "AjustePrecios",
+    "AjustePreciosOut",
+    "DisponibilidadLote",
+    "DisponibilidadTamanoLote",
+    "DisponibilidadLoteOut",
     # Venta
     "VentaBase",
     "VentaCreate",
@@ -55,7 +98,11 @@ __all__ = [
     "VentaDetalleBase",
     "VentaDetalleCreate",
     "VentaDetalleUpdate",
+    "VentaDetalleCambio",
+    "VentaDetallesCambios",
     "VentaDetalleOut",
     "InsertarVentaRequest",
     "VentaDetalleJSON",
+    "VentaBulkResultado",
+    "VentaBulkOut",
 ]
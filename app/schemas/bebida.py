@@ -1,9 +1,9 @@
 
 from pydantic import BaseModel, Field, ConfigDict, field_validator
-from typing import Optional, List, Union
+from typing import Optional, List
 from app.models.types import TypeDrink
 from .types import PriceSizeSchema, StatusSizeSchema
-from decimal import Decimal
+from .filtros import CatalogoFiltro
 
 
 class BebidaBase(BaseModel):
@@ -11,8 +11,8 @@ class BebidaBase(BaseModel):
     descripcion: Optional[str] = Field(None, description="Descripción de la bebida")
     imagen_url: Optional[str] = Field(None, description="URL de la imagen")
     tipo_bebida: Optional[TypeDrink] = Field(None, description="Tipo de bebida")
-    precio: Optional[Union[PriceSizeSchema, tuple]] = Field(None, description="Precio según tamaño")
-    disponible: Optional[Union[StatusSizeSchema, tuple]] = Field(None, description="Disponibilidad según tamaño")
+    precio: Optional[PriceSizeSchema] = Field(None, description="Precio según tamaño")
+    disponible: Optional[StatusSizeSchema] = Field(None, description="Disponibilidad según tamaño")
     ingredientes: Optional[List[str]] = Field(None, description="Lista de ingredientes")
     es_fria: Optional[bool] = Field(None, description="Indica si es fría")
 
@@ -36,57 +36,20 @@ class BebidaUpdate(BaseModel):
     es_fria: Optional[bool] = None
 
 
+class BebidaFiltro(CatalogoFiltro):
+    tipo: Optional[TypeDrink] = Field(None, description="Tipo de bebida")
+    es_fria: Optional[bool] = Field(None, description="Indica si es fría")
+
+
 class BebidaOut(BebidaBase):
     id: int = Field(..., description="ID de la bebida")
     
-    @field_validator('precio', mode='before')
-    @classmethod
-    def convert_precio_tuple(cls, v):
-        """Convierte tupla de PostgreSQL a PriceSizeSchema"""
-        if v is None:
-            return None
-        
-        if isinstance(v, str):
-            cleaned = v.strip('()')
-            parts = cleaned.split(',')
-            if len(parts) == 3:
-                return PriceSizeSchema(
-                    small=Decimal(parts[0]),
-                    medium=Decimal(parts[1]),
-                    big=Decimal(parts[2])
-                )
-        
-        if isinstance(v, tuple) and len(v) == 3:
-            return PriceSizeSchema(
-                small=Decimal(str(v[0])),
-                medium=Decimal(str(v[1])),
-                big=Decimal(str(v[2]))
-            )
-        return v
-    
     @field_validator('disponible', mode='before')
     @classmethod
-    def convert_disponible_tuple(cls, v):
-        """Convierte tupla de PostgreSQL a StatusSizeSchema"""
+    def disponible_por_defecto(cls, v):
+        # NULL en la base equivale a todos los tamaños disponibles
         if v is None:
-            return StatusSizeSchema(small=True, medium=True, big=True)
-        
-        if isinstance(v, str):
-            cleaned = v.strip('()')
-            parts = cleaned.split(',')
-            if len(parts) == 3:
-                return StatusSizeSchema(
-                    small=parts[0].lower() == 't',
-                    medium=parts[1].lower() == 't',
-                    big=parts[2].lower() == 't'
-                )
-        
-        if isinstance(v, tuple) and len(v) == 3:
-            return StatusSizeSchema(
-                small=bool(v[0]),
-                medium=bool(v[1]),
-                big=bool(v[2])
-            )
+            return StatusSizeSchema()
         return v
     
     model_config = ConfigDict(
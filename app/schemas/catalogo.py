@@ -0,0 +1,124 @@
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
+from typing import Annotated, List, Literal, Optional, Union
+from decimal import Decimal
+import enum
+from .postre import PostreOut
+from .pan import PanOut
+from .bebida import BebidaOut
+from .extra import ExtraOut
+
+
+class PostreCatalogo(PostreOut):
+    categoria: Literal["postre"] = Field("postre", description="Categoría del producto")
+
+
+class PanCatalogo(PanOut):
+    categoria: Literal["pan"] = Field("pan", description="Categoría del producto")
+
+
+class BebidaCatalogo(BebidaOut):
+    categoria: Literal["bebida"] = Field("bebida", description="Categoría del producto")
+
+
+class ExtraCatalogo(ExtraOut):
+    categoria: Literal["extra"] = Field("extra", description="Categoría del producto")
+
+
+# Un producto del catálogo; "categoria" indica cuál de los schemas aplica
+ItemCatalogo = Annotated[
+    Union[PostreCatalogo, PanCatalogo, BebidaCatalogo, ExtraCatalogo],
+    Field(discriminator="categoria"),
+]
+
+CatalogoAdapter = TypeAdapter(List[ItemCatalogo])
+
+
+class CatalogoBulkOut(BaseModel):
+    ids: List[int] = Field(..., description="IDs en el mismo orden del lote recibido")
+    creados: int = Field(..., description="Productos insertados")
+    actualizados: int = Field(..., description="Productos existentes (mismo nombre) actualizados")
+
+
+class CategoriaCatalogo(str, enum.Enum):
+    POSTRE = "postre"
+    PAN = "pan"
+    BEBIDA = "bebida"
+    EXTRA = "extra"
+
+
+class AjustePrecios(BaseModel):
+    categoria: CategoriaCatalogo = Field(..., description="Categoría a ajustar")
+    tipo: Optional[str] = Field(None, description="Solo productos de este tipo (p. ej. Pastel)")
+    porcentaje: Optional[Decimal] = Field(None, gt=-100, le=1000, description="Cambio porcentual (8 = +8 %)")
+    monto: Optional[Decimal] = Field(None, description="Cambio absoluto en cada precio")
+    campos: Optional[List[str]] = Field(
+        None,
+        min_length=1,
+        description="Precios a ajustar (small/medium/big o retail_sale/wholesale); por defecto todos",
+    )
+
+    @model_validator(mode='after')
+    def validar_cambio(self):
+        if (self.porcentaje is None) == (self.monto is None):
+            raise ValueError("Debe indicar porcentaje o monto (solo uno)")
+        return self
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "categoria": "postre",
+                "tipo": "Pastel",
+                "porcentaje": "8"
+            }
+        }
+    )
+
+
+class AjustePreciosOut(BaseModel):
+    actualizados: int = Field(..., description="Productos con precio ajustado")
+    ids: List[int] = Field(..., description="IDs de los productos ajustados")
+
+
+class DisponibilidadLote(BaseModel):
+    """Disponibilidad de varios panes o extras"""
+    ids: List[int] = Field(..., min_length=1, max_length=1000, description="IDs a modificar")
+    disponible: bool = Field(..., description="Nueva disponibilidad")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "ids": [3, 7, 12],
+                "disponible": False
+            }
+        }
+    )
+
+
+class DisponibilidadTamanoLote(BaseModel):
+    """Disponibilidad por tamaño de varios postres o bebidas; los tamaños omitidos no cambian"""
+    ids: List[int] = Field(..., min_length=1, max_length=1000, description="IDs a modificar")
+    small: Optional[bool] = Field(None, description="Disponibilidad tamaño pequeño")
+    medium: Optional[bool] = Field(None, description="Disponibilidad tamaño mediano")
+    big: Optional[bool] = Field(None, description="Disponibilidad tamaño grande")
+
+    @model_validator(mode='after')
+    def validar_tamanos(self):
+        if self.small is None and self.medium is None and self.big is None:
+            raise ValueError("Debe indicar la disponibilidad de al menos un tamaño")
+        return self
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "ids": [2, 5],
+                "big": False
+            }
+        }
+    )
+
+
+class DisponibilidadLoteOut(BaseModel):
+    actualizados: int = Field(..., description="Productos modificados")
+    ids: List[int] = Field(..., description="IDs modificados, en el orden recibido")
+    no_encontrados: List[int] = Field(..., description="IDs recibidos que no existen")
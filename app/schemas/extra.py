@@ -1,9 +1,9 @@
 
-from pydantic import BaseModel, Field, ConfigDict, field_validator
-from typing import Optional, Union
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
 from app.models.types import TypeExtra
 from .types import PriceAmountSchema
-from decimal import Decimal
+from .filtros import CatalogoFiltro
 
 
 class ExtraBase(BaseModel):
@@ -11,7 +11,7 @@ class ExtraBase(BaseModel):
     descripcion: Optional[str] = Field(None, description="Descripción del extra")
     imagen_url: Optional[str] = Field(None, description="URL de la imagen")
     tipo_extra: Optional[TypeExtra] = Field(None, description="Tipo de extra")
-    precio: Optional[Union[PriceAmountSchema, tuple]] = Field(None, description="Precio según cantidad")
+    precio: Optional[PriceAmountSchema] = Field(None, description="Precio según cantidad")
     disponible: Optional[bool] = Field(None, description="Disponibilidad del producto")
 
 
@@ -30,31 +30,13 @@ class ExtraUpdate(BaseModel):
     disponible: Optional[bool] = None
 
 
+class ExtraFiltro(CatalogoFiltro):
+    tipo: Optional[TypeExtra] = Field(None, description="Tipo de extra")
+
+
 class ExtraOut(ExtraBase):
     id: int = Field(..., description="ID del extra")
     
-    @field_validator('precio', mode='before')
-    @classmethod
-    def convert_precio_tuple(cls, v):
-        if v is None:
-            return None
-        
-        if isinstance(v, str):
-            cleaned = v.strip('()')
-            parts = cleaned.split(',')
-            if len(parts) == 2:
-                return PriceAmountSchema(
-                    retail_sale=Decimal(parts[0]),
-                    wholesale=Decimal(parts[1])
-                )
-        
-        if isinstance(v, tuple) and len(v) == 2:
-            return PriceAmountSchema(
-                retail_sale=Decimal(str(v[0])),
-                wholesale=Decimal(str(v[1]))
-            )
-        return v
-    
     model_config = ConfigDict(
         from_attributes=True,
         json_schema_extra={
@@ -0,0 +1,43 @@
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
+from decimal import Decimal
+import enum
+
+
+class CatalogoFiltro(BaseModel):
+    tipo: Optional[str] = Field(None, description="Tipo de producto de la categoría")
+    disponible: Optional[bool] = Field(None, description="Solo productos con (o sin) disponibilidad")
+    precio_min: Optional[Decimal] = Field(None, ge=0, description="Precio mínimo")
+    precio_max: Optional[Decimal] = Field(None, ge=0, description="Precio máximo")
+    skip: int = Field(0, ge=0, description="Registros a omitir")
+    limit: int = Field(100, ge=1, le=500, description="Máximo de registros")
+
+    @model_validator(mode='after')
+    def validar_rango_precio(self):
+        if self.precio_min is not None and self.precio_max is not None and self.precio_min > self.precio_max:
+            raise ValueError("precio_min no puede ser mayor a precio_max")
+        return self
+
+
+class ModoIngredientes(str, enum.Enum):
+    """Cómo se combinan los ingredientes buscados"""
+    ALGUNO = "alguno"    # contiene al menos uno
+    TODOS = "todos"      # contiene todos
+    NINGUNO = "ninguno"  # no contiene ninguno
+
+
+class IngredientesFiltro(BaseModel):
+    ingredientes: List[str] = Field(..., min_length=1, max_length=50, description="Ingredientes a buscar")
+    modo: ModoIngredientes = Field(ModoIngredientes.ALGUNO, description="alguno, todos o ninguno")
+    skip: int = Field(0, ge=0, description="Registros a omitir")
+    limit: int = Field(100, ge=1, le=500, description="Máximo de registros")
+
+    @field_validator('ingredientes')
+    @classmethod
+    def normalizar(cls, v: List[str]) -> List[str]:
+        # Igual que normalizar_ingredientes() en la base: minúsculas y sin espacios extremos
+        normalizados = sorted({i.strip().lower() for i in v if i.strip()})
+        if not normalizados:
+            raise ValueError("Debe indicar al menos un ingrediente")
+        return normalizados
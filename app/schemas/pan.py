@@ -1,9 +1,9 @@
 
-from pydantic import BaseModel, Field, ConfigDict, field_validator
-from typing import Optional, List, Union
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional, List
 from app.models.types import TypeBread
 from .types import PriceAmountSchema
-from decimal import Decimal
+from .filtros import CatalogoFiltro
 
 
 class PanBase(BaseModel):
@@ -11,7 +11,7 @@ class PanBase(BaseModel):
     descripcion: Optional[str] = Field(None, description="Descripción del pan")
     imagen_url: Optional[str] = Field(None, description="URL de la imagen")
     tipo_pan: Optional[TypeBread] = Field(None, description="Tipo de pan")
-    precio: Optional[Union[PriceAmountSchema, tuple]] = Field(None, description="Precio según cantidad")
+    precio: Optional[PriceAmountSchema] = Field(None, description="Precio según cantidad")
     disponible: Optional[bool] = Field(None, description="Disponibilidad del producto")
     ingredientes: Optional[List[str]] = Field(None, description="Lista de ingredientes")
 
@@ -33,31 +33,13 @@ class PanUpdate(BaseModel):
     ingredientes: Optional[List[str]] = None
 
 
+class PanFiltro(CatalogoFiltro):
+    tipo: Optional[TypeBread] = Field(None, description="Tipo de pan")
+
+
 class PanOut(PanBase):
     id: int = Field(..., description="ID del pan")
     
-    @field_validator('precio', mode='before')
-    @classmethod
-    def convert_precio_tuple(cls, v):
-        if v is None:
-            return None
-        
-        if isinstance(v, str):
-            cleaned = v.strip('()')
-            parts = cleaned.split(',')
-            if len(parts) == 2:
-                return PriceAmountSchema(
-                    retail_sale=Decimal(parts[0]),
-                    wholesale=Decimal(parts[1])
-                )
-        
-        if isinstance(v, tuple) and len(v) == 2:
-            return PriceAmountSchema(
-                retail_sale=Decimal(str(v[0])),
-                wholesale=Decimal(str(v[1]))
-            )
-        return v
-    
     model_config = ConfigDict(
         from_attributes=True,
         json_schema_extra={
@@ -1,9 +1,9 @@
 
 from pydantic import BaseModel, Field, ConfigDict, field_serializer, field_validator
-from typing import Optional, List, Union
+from typing import Optional, List
 from app.models.types import TypeDessert
 from .types import PriceSizeSchema, StatusSizeSchema
-from decimal import Decimal
+from .filtros import CatalogoFiltro
 
 
 class PostreBase(BaseModel):
@@ -11,8 +11,8 @@ class PostreBase(BaseModel):
     descripcion: Optional[str] = Field(None, description="Descripción del postre")
     imagen_url: Optional[str] = Field(None, description="URL de la imagen")
     tipo_postre: Optional[TypeDessert] = Field(None, description="Tipo de postre")
-    precio: Optional[Union[PriceSizeSchema, tuple]] = Field(None, description="Precio según tamaño")
-    disponible: Optional[Union[StatusSizeSchema, tuple]] = Field(None, description="Disponibilidad según tamaño")
+    precio: Optional[PriceSizeSchema] = Field(None, description="Precio según tamaño")
+    disponible: Optional[StatusSizeSchema] = Field(None, description="Disponibilidad según tamaño")
     ingredientes: Optional[List[str]] = Field(None, description="Lista de ingredientes")
     es_dulce: Optional[bool] = Field(None, description="Indica si es dulce")
 
@@ -36,55 +36,20 @@ class PostreUpdate(BaseModel):
     es_dulce: Optional[bool] = None
 
 
+class PostreFiltro(CatalogoFiltro):
+    tipo: Optional[TypeDessert] = Field(None, description="Tipo de postre")
+    es_dulce: Optional[bool] = Field(None, description="Indica si es dulce")
+
+
 class PostreOut(PostreBase):
     id: int = Field(..., description="ID del postre")
     
-    @field_validator('precio', mode='before')
-    @classmethod
-    def convert_precio_tuple(cls, v):
-        if v is None:
-            return None
-        
-        if isinstance(v, str):
-            cleaned = v.strip('()')
-            parts = cleaned.split(',')
-            if len(parts) == 3:
-                return PriceSizeSchema(
-                    small=Decimal(parts[0]),
-                    medium=Decimal(parts[1]),
-                    big=Decimal(parts[2])
-                )
-        
-        if isinstance(v, tuple) and len(v) == 3:
-            return PriceSizeSchema(
-                small=Decimal(str(v[0])),
-                medium=Decimal(str(v[1])),
-                big=Decimal(str(v[2]))
-            )
-        return v
-    
     @field_validator('disponible', mode='before')
     @classmethod
-    def convert_disponible_tuple(cls, v):
+    def disponible_por_defecto(cls, v):
+        # NULL en la base equivale a todos los tamaños disponibles
         if v is None:
-            return StatusSizeSchema(small=True, medium=True, big=True)
-        
-        if isinstance(v, str):
-            cleaned = v.strip('()')
-            parts = cleaned.split(',')
-            if len(parts) == 3:
-                return StatusSizeSchema(
-                    small=parts[0].lower() == 't',
-                    medium=parts[1].lower() == 't',
-                    big=parts[2].lower() == 't'
-                )
-        
-        if isinstance(v, tuple) and len(v) == 3:
-            return StatusSizeSchema(
-                small=bool(v[0]),
-                medium=bool(v[1]),
-                big=bool(v[2])
-            )
+            return StatusSizeSchema()
         return v
     
     model_config = ConfigDict(
@@ -24,3 +24,8 @@ class ProductoOut(ProductoBase):
     id: int = Field(..., description="ID del producto")
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductoBusqueda(ProductoOut):
+    categoria: str = Field(..., description="Tabla de origen (producto, postre, pan, bebida o extra)")
+    relevancia: float = Field(..., description="Similitud con el texto buscado (0 a 1)")
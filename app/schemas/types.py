@@ -10,6 +10,7 @@ class PriceSizeSchema(BaseModel):
     big: Decimal = Field(..., ge=0, decimal_places=2, description="Precio tamaño grande")
     
     model_config = ConfigDict(
+        from_attributes=True,
         json_schema_extra={
             "example": {
                 "small": "250.00",
@@ -26,6 +27,7 @@ class PriceAmountSchema(BaseModel):
     wholesale: Decimal = Field(..., ge=0, decimal_places=2, description="Precio al por mayor")
     
     model_config = ConfigDict(
+        from_attributes=True,
         json_schema_extra={
             "example": {
                 "retail_sale": "5.00",
@@ -42,6 +44,7 @@ class StatusSizeSchema(BaseModel):
     big: bool = Field(True, description="Disponibilidad tamaño grande")
     
     model_config = ConfigDict(
+        from_attributes=True,
         json_schema_extra={
             "example": {
                 "small": True,
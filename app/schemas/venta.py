@@ -1,8 +1,9 @@
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from typing import Optional, List
 from datetime import date
 from decimal import Decimal
+from app.models.types import TypeVariant
 
 
 
@@ -20,13 +21,15 @@ class VentaDetalleCreate(VentaDetalleBase):
     id_producto: int = Field(..., description="ID del producto vendido")
     cantidad: int = Field(..., ge=1, description="Cantidad vendida")
     precio: Decimal = Field(..., ge=0, decimal_places=2, description="Precio unitario")
+    variante: Optional[TypeVariant] = Field(None, description="Variante del producto: small, medium, big, retail, wholesale")
     
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
                 "id_producto": 1,
                 "cantidad": 2,
-                "precio": "380.00"
+                "precio": "380.00",
+                "variante": "medium"
             }
         }
     )
@@ -38,6 +41,36 @@ class VentaDetalleUpdate(BaseModel):
     precio: Optional[Decimal] = Field(None, ge=0, decimal_places=2)
 
 
+class VentaDetalleCambio(VentaDetalleUpdate):
+    id: int = Field(..., description="ID del detalle a modificar")
+
+
+class VentaDetallesCambios(BaseModel):
+    """Diferencias a aplicar a las líneas de una venta en una sola transacción"""
+    agregar: List[VentaDetalleCreate] = Field(default_factory=list, description="Líneas nuevas")
+    actualizar: List[VentaDetalleCambio] = Field(default_factory=list, description="Líneas a modificar")
+    eliminar: List[int] = Field(default_factory=list, description="IDs de las líneas a eliminar")
+
+    @model_validator(mode='after')
+    def validar_cambios(self):
+        if not (self.agregar or self.actualizar or self.eliminar):
+            raise ValueError("Debe indicar al menos un cambio")
+        ids = [d.id for d in self.actualizar] + self.eliminar
+        if len(ids) != len(set(ids)):
+            raise ValueError("Una línea no puede aparecer más de una vez en actualizar/eliminar")
+        return self
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "agregar": [{"id_producto": 15, "cantidad": 1, "precio": "45.00", "variante": "small"}],
+                "actualizar": [{"id": 2, "cantidad": 3}],
+                "eliminar": [1]
+            }
+        }
+    )
+
+
 class VentaDetalleOut(VentaDetalleBase):
     id: int = Field(..., description="ID del detalle")
     id_venta: int = Field(..., description="ID de la venta")
@@ -136,7 +169,7 @@ class VentaDetalleJSON(BaseModel):
     id_producto: int = Field(..., description="ID del producto")
     cantidad: int = Field(..., ge=1, description="Cantidad")
     precio: Decimal = Field(..., ge=0, decimal_places=2, description="Precio unitario")
-    variante: str = Field(..., description="Variante del producto: small, medium, big, retail, wholesale")
+    variante: TypeVariant = Field(..., description="Variante del producto: small, medium, big, retail, wholesale")
 
 
 class InsertarVentaRequest(BaseModel):
@@ -161,3 +194,17 @@ class InsertarVentaRequest(BaseModel):
             }
         }
     )
+
+
+class VentaBulkResultado(BaseModel):
+
+    indice: int = Field(..., description="Posición del ticket en la petición")
+    id: Optional[int] = Field(None, description="ID de la venta creada")
+    error: Optional[str] = Field(None, description="Motivo por el que no se insertó el ticket")
+
+
+class VentaBulkOut(BaseModel):
+
+    creadas: int = Field(..., description="Tickets insertados")
+    fallidas: int = Field(..., description="Tickets rechazados")
+    resultados: List[VentaBulkResultado] = Field(..., description="Resultado por ticket, en el orden recibido")
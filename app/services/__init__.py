@@ -4,6 +4,7 @@ from .postre_service import PostreService
 from .pan_service import PanService
 from .bebida_service import BebidaService
 from .extra_service import ExtraService
+from .catalogo_service import CatalogoService
 from .venta_service import VentaService
 
 __all__ = [
@@ -12,5 +13,6 @@ __all__ = [
     "PanService",
     "BebidaService",
     "ExtraService",
+    "CatalogoService",
     "VentaService",
 ]
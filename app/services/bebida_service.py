@@ -1,69 +1,113 @@
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.database import unidad_de_trabajo
 from app.repositories.bebida import BebidaRepository
-from app.schemas.bebida import BebidaCreate, BebidaUpdate, BebidaOut
+from app.services import cache
+from app.services.catalogo_service import CatalogoService
+from app.services.validaciones import es_nombre_duplicado, validar_precio_tamano
+from app.schemas.catalogo import CatalogoBulkOut, DisponibilidadTamanoLote, DisponibilidadLoteOut
+from app.schemas.bebida import BebidaCreate, BebidaUpdate, BebidaOut, BebidaFiltro
+
+_cache = cache.crear_cache("bebida", cache.tablas_categoria("bebida"))
 
 
 class BebidaService:
     
     @staticmethod
-    def create_bebida(db: Session, bebida: BebidaCreate) -> BebidaOut:
+    def _validar_bebida(bebida: BebidaCreate) -> None:
         if not bebida.nombre or bebida.nombre.strip() == "":
             raise ValueError("El nombre de la bebida no puede estar vacío")
         
         if not bebida.ingredientes or len(bebida.ingredientes) == 0:
             raise ValueError("La bebida debe tener al menos un ingrediente")
         
-        if bebida.precio.small > bebida.precio.medium:
-            raise ValueError("El precio pequeño no puede ser mayor al mediano")
-        if bebida.precio.medium > bebida.precio.big:
-            raise ValueError("El precio mediano no puede ser mayor al grande")
+        if not bebida.imagen_url or bebida.imagen_url.strip() == "":
+            raise ValueError("La bebida debe tener una URL de imagen")
         
-        db_bebida = BebidaRepository.create(db, bebida)
-        return BebidaOut.model_validate(db_bebida)
+        validar_precio_tamano(bebida.precio)
     
     @staticmethod
-    def get_bebida(db: Session, bebida_id: int) -> Optional[BebidaOut]:
-        db_bebida = BebidaRepository.get_by_id(db, bebida_id)
-        if not db_bebida:
-            return None
+    def create_bebida(db: Session, bebida: BebidaCreate) -> BebidaOut:
+        BebidaService._validar_bebida(bebida)
+        try:
+            # SAVEPOINT: un nombre repetido descarta solo esta escritura; dentro
+            # de una unidad_de_trabajo exterior, ella decide si revierte lo demás
+            with unidad_de_trabajo(db), db.begin_nested():
+                db_bebida = BebidaRepository.create(db, bebida)
+        except IntegrityError as e:
+            if es_nombre_duplicado(e, "bebida"):
+                raise ValueError(f"Ya existe una bebida con el nombre '{bebida.nombre}'")
+            raise
+        cache.invalidar("bebida", db_bebida.id)
         return BebidaOut.model_validate(db_bebida)
     
     @staticmethod
-    def get_all_bebidas(db: Session, skip: int = 0, limit: int = 100) -> List[BebidaOut]:
-        bebidas = BebidaRepository.get_all(db, skip, limit)
-        return [BebidaOut.model_validate(b) for b in bebidas]
+    def upsert_bebidas(db: Session, bebidas: List[BebidaCreate]) -> CatalogoBulkOut:
+        """Crea o actualiza (por nombre) un lote de bebidas en una sola transacción"""
+        return CatalogoService.upsert_lote(db, BebidaRepository, bebidas, BebidaService._validar_bebida)
     
     @staticmethod
-    def get_bebidas_by_tipo(db: Session, tipo_bebida: str) -> List[BebidaOut]:
-        bebidas = BebidaRepository.get_by_tipo(db, tipo_bebida)
-        return [BebidaOut.model_validate(b) for b in bebidas]
+    def get_bebida(db: Session, bebida_id: int) -> Optional[BebidaOut]:
+        def cargar() -> Optional[BebidaOut]:
+            db_bebida = BebidaRepository.get_by_id(db, bebida_id)
+            return BebidaOut.model_validate(db_bebida) if db_bebida else None
+        return _cache.obtener(("id", bebida_id), cargar)
     
     @staticmethod
-    def get_bebidas_frias(db: Session) -> List[BebidaOut]:
-        bebidas = BebidaRepository.get_by_temperatura(db, es_fria=True)
-        return [BebidaOut.model_validate(b) for b in bebidas]
+    def get_bebidas_by_ids(db: Session, bebida_ids: List[int]) -> Tuple[List[BebidaOut], List[int]]:
+        """
+        Bebidas en el orden pedido y los IDs que no existen. Los que no
+        están en caché se leen en una sola consulta.
+        """
+        return _cache.obtener_por_ids(
+            bebida_ids,
+            lambda faltantes: [BebidaOut.model_validate(p) for p in BebidaRepository.get_by_ids(db, faltantes)]
+        )
     
     @staticmethod
-    def get_bebidas_calientes(db: Session) -> List[BebidaOut]:
-        bebidas = BebidaRepository.get_by_temperatura(db, es_fria=False)
-        return [BebidaOut.model_validate(b) for b in bebidas]
+    def get_all_bebidas(db: Session, skip: int = 0, limit: int = 100) -> List[BebidaOut]:
+        return _cache.obtener(
+            ("lista", skip, limit),
+            lambda: [BebidaOut.model_validate(b) for b in BebidaRepository.get_all(db, skip, limit)]
+        )
+    
+    @staticmethod
+    def filtrar_bebidas(db: Session, filtro: BebidaFiltro) -> List[BebidaOut]:
+        return _cache.obtener(
+            cache.clave_filtro(filtro),
+            lambda: [BebidaOut.model_validate(b) for b in BebidaRepository.buscar(db, filtro)]
+        )
     
     @staticmethod
     def update_bebida(db: Session, bebida_id: int, bebida_update: BebidaUpdate) -> Optional[BebidaOut]:
         if bebida_update.precio:
-            if bebida_update.precio.small > bebida_update.precio.medium:
-                raise ValueError("El precio pequeño no puede ser mayor al mediano")
-            if bebida_update.precio.medium > bebida_update.precio.big:
-                raise ValueError("El precio mediano no puede ser mayor al grande")
+            validar_precio_tamano(bebida_update.precio)
         
-        db_bebida = BebidaRepository.update(db, bebida_id, bebida_update)
+        try:
+            # SAVEPOINT: un nombre repetido descarta solo esta escritura; dentro
+            # de una unidad_de_trabajo exterior, ella decide si revierte lo demás
+            with unidad_de_trabajo(db), db.begin_nested():
+                db_bebida = BebidaRepository.update(db, bebida_id, bebida_update)
+        except IntegrityError as e:
+            if es_nombre_duplicado(e, "bebida"):
+                raise ValueError(f"Ya existe una bebida con el nombre '{bebida_update.nombre}'")
+            raise
         if not db_bebida:
             return None
+        cache.invalidar("bebida", bebida_id)
         return BebidaOut.model_validate(db_bebida)
     
+    @staticmethod
+    def actualizar_disponibilidad(db: Session, cambio: DisponibilidadTamanoLote) -> DisponibilidadLoteOut:
+        """Marca varias bebidas como (no) disponibles en una sola transacción"""
+        return CatalogoService.actualizar_disponibilidad(db, BebidaRepository, cambio)
+    
     @staticmethod
     def delete_bebida(db: Session, bebida_id: int) -> bool:
         """Eliminar bebida"""
-        return BebidaRepository.delete(db, bebida_id)
+        eliminado = BebidaRepository.delete(db, bebida_id)
+        if eliminado:
+            cache.invalidar("bebida", bebida_id)
+        return eliminado
@@ -0,0 +1,197 @@
+"""
+Caché en memoria (por proceso) para las lecturas del catálogo.
+LRU acotado por tamaño con expiración por TTL; los servicios la invalidan
+en sus propias escrituras.
+
+Además cada entrada guarda la versión de sus tablas (catalogo_version)
+vigente cuando se cargó. Los GET condicionales leen esas versiones de la
+base y las registran con observar_versiones; una entrada de una versión
+anterior ya no se sirve. Así el cuerpo nunca es más viejo que el ETag,
+aunque la escritura haya ocurrido en otro worker o aún no se haya
+llamado a invalidar().
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+CACHE_TTL = float(os.getenv("BAKERY_CACHE_TTL", "60"))
+CACHE_MAX_ENTRADAS = int(os.getenv("BAKERY_CACHE_MAX", "1024"))
+
+T = TypeVar("T")
+
+# Versión más reciente observada de cada tabla (solo crece)
+_versiones: Dict[str, int] = {}
+_versiones_lock = threading.Lock()
+
+
+def observar_versiones(versiones: Dict[str, int]) -> None:
+    """Registra las versiones leídas de catalogo_version"""
+    with _versiones_lock:
+        for tabla, version in versiones.items():
+            if version > _versiones.get(tabla, 0):
+                _versiones[tabla] = version
+
+
+class CacheCatalogo:
+
+    def __init__(
+        self,
+        nombre: str,
+        tablas: Sequence[str] = (),
+        ttl: float = CACHE_TTL,
+        max_entradas: int = CACHE_MAX_ENTRADAS,
+    ):
+        self.nombre = nombre
+        # Tablas cuyas escrituras pueden cambiar lo que guarda esta caché
+        self.tablas = tuple(tablas) or (nombre,)
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._datos: "OrderedDict[Hashable, tuple[float, tuple, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self) -> Tuple[int, ...]:
+        """Versiones observadas de las tablas de esta caché"""
+        return tuple(_versiones.get(tabla, 0) for tabla in self.tablas)
+
+    def get(self, clave: Hashable) -> Optional[Any]:
+        """Devuelve el valor guardado o None si no está, expiró o es de una versión anterior"""
+        version = self.version()
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None or entrada[0] < time.monotonic() or entrada[1] != version:
+                if entrada is not None:
+                    del self._datos[clave]
+                self.misses += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return entrada[2]
+
+    def set(self, clave: Hashable, valor: Any, version: Optional[Tuple[int, ...]] = None) -> Any:
+        """
+        Guarda valor (None no se guarda). `version` debe leerse antes de
+        consultar la base (ver obtener); por defecto es la actual.
+        """
+        if self.ttl <= 0 or valor is None:
+            return valor
+        if version is None:
+            version = self.version()
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self.ttl, version, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+        return valor
+
+    def obtener(self, clave: Hashable, cargar: Callable[[], T]) -> T:
+        """Devuelve el valor guardado o lo calcula con cargar() y lo guarda"""
+        valor = self.get(clave)
+        if valor is None:
+            # Versión tomada antes de cargar: si otra petición observa una
+            # versión nueva mientras tanto, esta entrada ya no se sirve
+            version = self.version()
+            valor = self.set(clave, cargar(), version)
+        return valor
+
+    def obtener_por_ids(
+        self,
+        ids: Sequence[int],
+        cargar: Callable[[List[int]], List[T]],
+    ) -> Tuple[List[T], List[int]]:
+        """
+        Entidades por ID usando las entradas ("id", n) ya guardadas; las que
+        faltan se piden juntas con cargar(ids_faltantes) (valores con .id).
+        Devuelve las encontradas en el orden de `ids` (sin repetir) y los
+        IDs que no existen.
+        """
+        pedidos = list(dict.fromkeys(ids))
+        encontrados: Dict[int, T] = {}
+        faltantes = []
+        for entidad_id in pedidos:
+            valor = self.get(("id", entidad_id))
+            if valor is None:
+                faltantes.append(entidad_id)
+            else:
+                encontrados[entidad_id] = valor
+        if faltantes:
+            version = self.version()
+            for valor in cargar(faltantes):
+                encontrados[valor.id] = self.set(("id", valor.id), valor, version)
+        return (
+            [encontrados[entidad_id] for entidad_id in pedidos if entidad_id in encontrados],
+            [entidad_id for entidad_id in pedidos if entidad_id not in encontrados],
+        )
+
+    def invalidar(self, entidad_id: Optional[int] = None) -> None:
+        """
+        Sin entidad_id vacía la caché. Con entidad_id elimina esa entidad
+        y todos los listados (que podrían contenerla).
+        """
+        with self._lock:
+            if entidad_id is None:
+                self._datos.clear()
+                return
+            for clave in list(self._datos):
+                if clave[0] != "id" or clave == ("id", entidad_id):
+                    del self._datos[clave]
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entradas": len(self._datos),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl": self.ttl,
+                "max_entradas": self.max_entradas,
+            }
+
+
+_registro: Dict[str, CacheCatalogo] = {}
+
+
+# producto (INHERITS) incluye las filas de las tablas hijas, y un
+# UPDATE/DELETE sobre producto también modifica las filas de las hijas
+TABLAS_CATALOGO = ("producto", "postre", "pan", "bebida", "extra")
+
+
+def tablas_categoria(categoria: str) -> Tuple[str, ...]:
+    """Tablas de las que depende una categoría: la suya y producto"""
+    return ("producto", categoria)
+
+
+def crear_cache(nombre: str, tablas: Sequence[str] = ()) -> CacheCatalogo:
+    cache = CacheCatalogo(nombre, tablas)
+    _registro[nombre] = cache
+    return cache
+
+
+def invalidar(tabla: str, entidad_id: Optional[int] = None) -> None:
+    """
+    Invalida toda caché que dependa de la tabla escrita: una categoría
+    invalida la suya, la de producto y la del catálogo completo; producto
+    las invalida todas.
+    """
+    for cache in _registro.values():
+        if tabla in cache.tablas:
+            cache.invalidar(entidad_id)
+
+
+def estadisticas() -> Dict[str, Dict[str, Any]]:
+    return {nombre: cache.estadisticas() for nombre, cache in _registro.items()}
+
+
+def clave_filtro(filtro) -> tuple:
+    """Clave hashable para un schema de filtros"""
+    return ("filtro",) + tuple(
+        (campo, tuple(valor) if isinstance(valor, list) else valor)
+        for campo, valor in filtro.model_dump().items()
+    )
+
+
+def invalidar_todo() -> None:
+    for cache in _registro.values():
+        cache.invalidar()
@@ -0,0 +1,146 @@
+from sqlalchemy.orm import Session
+from collections import Counter
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Type
+from app.database import unidad_de_trabajo
+from app.repositories.catalogo import CatalogoRepository, RepositorioCategoria
+from app.services import cache
+from app.services.validaciones import validar_precio_cantidad, validar_precio_tamano
+from app.schemas.catalogo import (
+    AjustePrecios, AjustePreciosOut, CatalogoAdapter, CatalogoBulkOut, CategoriaCatalogo,
+    DisponibilidadLoteOut, ItemCatalogo
+)
+from app.schemas.filtros import IngredientesFiltro
+
+_cache = cache.crear_cache("catalogo", cache.TABLAS_CATALOGO)
+
+
+class CatalogoService:
+
+    @staticmethod
+    def get_catalogo(db: Session) -> List[ItemCatalogo]:
+        """
+        Catálogo completo (postres, panes, bebidas y extras) en una consulta.
+        El JSON que arma PostgreSQL se valida directamente con el schema
+        discriminado por "categoria", sin pasar por objetos ORM.
+        """
+        return _cache.obtener(
+            ("catalogo",),
+            lambda: CatalogoAdapter.validate_json(CatalogoRepository.get_catalogo_json(db))
+        )
+
+    @staticmethod
+    def buscar_por_ingredientes(db: Session, filtro: IngredientesFiltro) -> List[ItemCatalogo]:
+        """Postres, panes y bebidas que contienen alguno, todos o ninguno de los ingredientes"""
+        return _cache.obtener(
+            ("ingredientes",) + cache.clave_filtro(filtro),
+            lambda: CatalogoAdapter.validate_json(CatalogoRepository.buscar_por_ingredientes_json(db, filtro))
+        )
+
+    @staticmethod
+    def get_versiones(db: Session, tablas: Sequence[str]) -> Dict[str, int]:
+        return CatalogoRepository.get_versiones(db, tablas)
+
+    @staticmethod
+    def validar_nombres_lote(nombres: Sequence[str]) -> None:
+        """El upsert se resuelve por nombre: un lote no puede repetirlo"""
+        repetidos = sorted(n for n, veces in Counter(nombres).items() if veces > 1)
+        if repetidos:
+            raise ValueError(f"Nombres repetidos en el lote: {', '.join(repetidos)}")
+
+    @staticmethod
+    def upsert_lote(
+        db: Session,
+        repositorio: Type[RepositorioCategoria],
+        items: List[Any],
+        validar: Callable[[Any], None],
+    ) -> CatalogoBulkOut:
+        """Crea o actualiza (por nombre) un lote de una categoría en una sola transacción"""
+        CatalogoService.validar_nombres_lote([item.nombre for item in items])
+        for indice, item in enumerate(items):
+            try:
+                validar(item)
+            except ValueError as e:
+                raise ValueError(f"Elemento {indice}: {e}")
+
+        resultado = repositorio.upsert_lote(db, items)
+        cache.invalidar(repositorio.categoria)
+        return CatalogoService.resumen_lote(resultado)
+
+    @staticmethod
+    def actualizar_disponibilidad(
+        db: Session,
+        repositorio: Type[RepositorioCategoria],
+        cambio: Any,
+    ) -> DisponibilidadLoteOut:
+        """Marca varios productos de una categoría como (no) disponibles en una sola transacción"""
+        encontrados = repositorio.actualizar_disponibilidad(db, cambio)
+        cache.invalidar(repositorio.categoria)
+        return CatalogoService.resumen_disponibilidad(cambio.ids, encontrados)
+
+    @staticmethod
+    def resumen_lote(resultado: List[Tuple[int, bool]]) -> CatalogoBulkOut:
+        creados = sum(1 for _, insertado in resultado if insertado)
+        return CatalogoBulkOut(
+            ids=[producto_id for producto_id, _ in resultado],
+            creados=creados,
+            actualizados=len(resultado) - creados,
+        )
+
+    @staticmethod
+    def resumen_disponibilidad(pedidos: Sequence[int], encontrados: Sequence[int]) -> DisponibilidadLoteOut:
+        """IDs modificados y faltantes, en el orden en que se pidieron (sin repetir)"""
+        existentes = set(encontrados)
+        pedidos = list(dict.fromkeys(pedidos))
+        ids = [producto_id for producto_id in pedidos if producto_id in existentes]
+        return DisponibilidadLoteOut(
+            actualizados=len(ids),
+            ids=ids,
+            no_encontrados=[producto_id for producto_id in pedidos if producto_id not in existentes],
+        )
+
+    @staticmethod
+    def ajustar_precios(db: Session, ajuste: AjustePrecios) -> AjustePreciosOut:
+        """
+        Cambio porcentual o absoluto de precios sobre una categoría (y tipo)
+        en un solo UPDATE. Si algún precio resultante queda negativo, está
+        incompleto (algún campo NULL) o rompe el orden entre
+        tamaños/modalidades, no se aplica ningún cambio.
+        """
+        modelo = CatalogoRepository.modelo_de(ajuste.categoria.value)
+        campos_precio = modelo.__table__.c.precio.type.clase._fields
+        invalidos = [campo for campo in ajuste.campos or () if campo not in campos_precio]
+        if invalidos:
+            raise ValueError(
+                f"Campos de precio inválidos para {ajuste.categoria.value}: {', '.join(invalidos)}. "
+                f"Válidos: {', '.join(campos_precio)}"
+            )
+
+        tipo = None
+        if ajuste.tipo is not None:
+            enum_tipo = getattr(modelo, f"tipo_{ajuste.categoria.value}").type.enum_class
+            try:
+                tipo = enum_tipo(ajuste.tipo)
+            except ValueError:
+                validos = ', '.join(t.value for t in enum_tipo)
+                raise ValueError(f"Tipo '{ajuste.tipo}' inválido. Tipos válidos: {validos}")
+
+        orden = (
+            validar_precio_tamano
+            if ajuste.categoria in (CategoriaCatalogo.POSTRE, CategoriaCatalogo.BEBIDA)
+            else validar_precio_cantidad
+        )
+
+        def validar(precio) -> None:
+            # Un campo NULL sigue NULL tras el ajuste y no se puede comparar
+            vacios = [campo for campo, monto in zip(precio._fields, precio) if monto is None]
+            if vacios:
+                raise ValueError(f"Precio incompleto ({', '.join(vacios)} sin valor)")
+            if any(monto < 0 for monto in precio):
+                raise ValueError("El precio no puede quedar negativo")
+            orden(precio)
+
+        # Si algún precio no pasa la validación se revierte todo el UPDATE
+        with unidad_de_trabajo(db):
+            ids = CatalogoRepository.ajustar_precios(db, ajuste, tipo, validar)
+        cache.invalidar(ajuste.categoria.value)
+        return AjustePreciosOut(actualizados=len(ids), ids=ids)
@@ -0,0 +1,142 @@
+"""
+Escritura agrupada (group commit) de ventas para las horas pico.
+
+Con BAKERY_VENTAS_AGRUPADAS=1, POST /ventas/crear no abre su propia
+transacción: encola el ticket y espera su resultado. Un escritor en segundo
+plano junta los tickets que llegan durante BAKERY_VENTAS_ESPERA_MS (o hasta
+BAKERY_VENTAS_LOTE tickets) y los inserta con insertar_venta() en una
+sola transacción, es decir, un commit (un fsync del WAL) por grupo.
+
+Cada petición recibe su propio id o su propio error, el mismo que sin
+agrupar: un ticket inválido no afecta a los demás del grupo (ver
+VentaService.insertar_ventas_agrupadas).
+
+Ninguna petición queda esperando para siempre: una vez iniciado el apagado
+encolar() se rechaza con EscritorDetenido, si el escritor termina por un
+error inesperado los tickets pendientes reciben ese error, y la espera de
+cada ticket está acotada por BAKERY_VENTAS_TIMEOUT_S.
+"""
+import asyncio
+import logging
+import os
+from contextlib import aclosing
+from typing import List, Optional, Set, Tuple
+from app.database import get_runner
+from app.schemas.venta import InsertarVentaRequest
+from app.services.venta_service import VentaService
+
+VENTAS_AGRUPADAS = os.getenv("BAKERY_VENTAS_AGRUPADAS", "0") == "1"
+VENTAS_ESPERA_MS = float(os.getenv("BAKERY_VENTAS_ESPERA_MS", "5"))
+VENTAS_LOTE = int(os.getenv("BAKERY_VENTAS_LOTE", "100"))
+VENTAS_TIMEOUT_S = float(os.getenv("BAKERY_VENTAS_TIMEOUT_S", "10"))
+
+logger = logging.getLogger(__name__)
+
+Pendiente = Tuple[InsertarVentaRequest, asyncio.Future]
+
+
+class EscritorDetenido(RuntimeError):
+    """El escritor no acepta tickets (apagándose o terminó por un error)"""
+
+
+class EscritorVentas:
+
+    def __init__(
+        self,
+        espera_ms: float = VENTAS_ESPERA_MS,
+        max_lote: int = VENTAS_LOTE,
+        timeout_s: float = VENTAS_TIMEOUT_S,
+    ):
+        self.espera = espera_ms / 1000
+        self.max_lote = max_lote
+        self.timeout = timeout_s
+        self._cola: "asyncio.Queue[Optional[Pendiente]]" = asyncio.Queue()
+        self._tarea: Optional[asyncio.Task] = None
+        self._deteniendo = False
+        # Futuros sin resolver, encolados o en el grupo que se está confirmando
+        self._pendientes: Set[asyncio.Future] = set()
+
+    def iniciar(self) -> None:
+        self._deteniendo = False
+        self._tarea = asyncio.create_task(self._ejecutar())
+
+    async def detener(self) -> None:
+        """Deja de aceptar tickets, confirma los ya encolados y termina"""
+        self._deteniendo = True
+        if self._tarea is not None:
+            await self._cola.put(None)
+            await self._tarea
+            self._tarea = None
+
+    async def encolar(self, venta: InsertarVentaRequest) -> int:
+        """
+        Espera a que el grupo del ticket se confirme. ValueError si el ticket
+        falló, EscritorDetenido si el escritor no está activo y TimeoutError
+        si no hubo respuesta en `timeout` (el ticket aún puede confirmarse).
+        """
+        if self._deteniendo or self._tarea is None or self._tarea.done():
+            raise EscritorDetenido("El escritor de ventas no está disponible")
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendientes.add(futuro)
+        futuro.add_done_callback(self._pendientes.discard)
+        self._cola.put_nowait((venta, futuro))
+        return await asyncio.wait_for(futuro, timeout=self.timeout)
+
+    async def _ejecutar(self) -> None:
+        error = EscritorDetenido("El escritor de ventas se detuvo")
+        try:
+            await self._escribir()
+        except Exception as e:
+            logger.exception("El escritor de ventas terminó por un error")
+            error = EscritorDetenido(f"El escritor de ventas terminó por un error: {e}")
+        finally:
+            self._deteniendo = True
+            # Nadie más va a resolver estos futuros
+            for futuro in list(self._pendientes):
+                if not futuro.done():
+                    futuro.set_exception(error)
+
+    async def _escribir(self) -> None:
+        loop = asyncio.get_running_loop()
+        terminar = False
+        while not terminar:
+            primero = await self._cola.get()
+            if primero is None:
+                return
+            grupo: List[Pendiente] = [primero]
+            limite = loop.time() + self.espera
+            while len(grupo) < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    # Duerme hasta que llegue un ticket o venza la ventana
+                    pendiente = await asyncio.wait_for(self._cola.get(), timeout=restante)
+                except TimeoutError:
+                    break
+                if pendiente is None:
+                    terminar = True
+                    break
+                grupo.append(pendiente)
+            await self._confirmar(grupo)
+
+    async def _confirmar(self, grupo: List[Pendiente]) -> None:
+        ventas = [venta for venta, _ in grupo]
+        try:
+            # aclosing cierra la sesión aunque run() lance una excepción,
+            # en lugar de dejar el generador suspendido
+            async with aclosing(get_runner()) as runners:
+                async for db in runners:
+                    resultados = await db.run(VentaService.insertar_ventas_agrupadas, ventas)
+        except Exception as e:
+            # Falló el grupo completo (p. ej. el COMMIT o la conexión)
+            resultados = [(None, f"Error al crear venta: {e}")] * len(grupo)
+
+        for (_, futuro), (venta_id, error) in zip(grupo, resultados):
+            if futuro.done():
+                # La petición se canceló mientras esperaba
+                continue
+            if error:
+                futuro.set_exception(ValueError(error))
+            else:
+                futuro.set_result(venta_id)
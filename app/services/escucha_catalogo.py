@@ -0,0 +1,68 @@
+"""
+Escucha de avisos del catálogo (LISTEN/NOTIFY) para invalidar la caché
+local de cada worker cuando otro worker escribe en el catálogo.
+Se activa con BAKERY_CACHE_LISTEN=1.
+"""
+import logging
+import os
+import select
+import threading
+from typing import Optional
+import psycopg2
+import psycopg2.extensions
+from app.database import URL_DATABASE
+from app.repositories.notificacion import CANAL_CATALOGO
+from app.services import cache
+
+CACHE_LISTEN = os.getenv("BAKERY_CACHE_LISTEN", "0") == "1"
+
+logger = logging.getLogger(__name__)
+
+
+class EscuchaCatalogo(threading.Thread):
+    """
+    Hilo en segundo plano con una conexión dedicada en LISTEN.
+    Si la conexión se pierde se reconecta y vacía la caché completa,
+    porque los avisos emitidos mientras estuvo caída no se reciben.
+    """
+
+    def __init__(self, dsn: str = URL_DATABASE, espera: float = 5.0):
+        super().__init__(name="escucha-catalogo", daemon=True)
+        self.dsn = dsn
+        self.espera = espera
+        self._detener = threading.Event()
+
+    def detener(self) -> None:
+        self._detener.set()
+
+    def run(self) -> None:
+        while not self._detener.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CANAL_CATALOGO}")
+                cache.invalidar_todo()
+                self._escuchar(conn)
+            except psycopg2.Error as e:
+                logger.warning("Escucha del catálogo desconectada: %s", e)
+                self._detener.wait(self.espera)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _escuchar(self, conn) -> None:
+        while not self._detener.is_set():
+            if select.select([conn], [], [], self.espera) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                EscuchaCatalogo.procesar(conn.notifies.pop(0).payload)
+
+    @staticmethod
+    def procesar(payload: str) -> None:
+        """Payload 'tabla:id' o 'tabla:*'; producto invalida también las categorías"""
+        tabla, _, entidad = payload.partition(":")
+        entidad_id: Optional[int] = int(entidad) if entidad.isdigit() else None
+        cache.invalidar(tabla, entidad_id)
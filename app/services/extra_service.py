@@ -1,51 +1,109 @@
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.database import unidad_de_trabajo
 from app.repositories.extra import ExtraRepository
-from app.schemas.extra import ExtraCreate, ExtraUpdate, ExtraOut
+from app.services import cache
+from app.services.catalogo_service import CatalogoService
+from app.services.validaciones import es_nombre_duplicado, validar_precio_cantidad
+from app.schemas.catalogo import CatalogoBulkOut, DisponibilidadLote, DisponibilidadLoteOut
+from app.schemas.extra import ExtraCreate, ExtraUpdate, ExtraOut, ExtraFiltro
+
+_cache = cache.crear_cache("extra", cache.tablas_categoria("extra"))
 
 
 class ExtraService:    
     @staticmethod
-    def create_extra(db: Session, extra: ExtraCreate) -> ExtraOut:
+    def _validar_extra(extra: ExtraCreate) -> None:
         if not extra.nombre or extra.nombre.strip() == "":
             raise ValueError("El nombre del extra no puede estar vacío")
         
-        if extra.precio.wholesale > extra.precio.retail_sale:
-            raise ValueError("El precio al por mayor no puede ser mayor al precio al por menor")
+        if not extra.imagen_url or extra.imagen_url.strip() == "":
+            raise ValueError("El extra debe tener una URL de imagen")
         
-        db_extra = ExtraRepository.create(db, extra)
+        validar_precio_cantidad(extra.precio)
+    
+    @staticmethod
+    def create_extra(db: Session, extra: ExtraCreate) -> ExtraOut:
+        ExtraService._validar_extra(extra)
+        try:
+            # SAVEPOINT: un nombre repetido descarta solo esta escritura; dentro
+            # de una unidad_de_trabajo exterior, ella decide si revierte lo demás
+            with unidad_de_trabajo(db), db.begin_nested():
+                db_extra = ExtraRepository.create(db, extra)
+        except IntegrityError as e:
+            if es_nombre_duplicado(e, "extra"):
+                raise ValueError(f"Ya existe un extra con el nombre '{extra.nombre}'")
+            raise
+        cache.invalidar("extra", db_extra.id)
         return ExtraOut.model_validate(db_extra)
     
+    @staticmethod
+    def upsert_extras(db: Session, extras: List[ExtraCreate]) -> CatalogoBulkOut:
+        """Crea o actualiza (por nombre) un lote de extras en una sola transacción"""
+        return CatalogoService.upsert_lote(db, ExtraRepository, extras, ExtraService._validar_extra)
+    
     @staticmethod
     def get_extra(db: Session, extra_id: int) -> Optional[ExtraOut]:
-        db_extra = ExtraRepository.get_by_id(db, extra_id)
-        if not db_extra:
-            return None
-        return ExtraOut.model_validate(db_extra)
+        def cargar() -> Optional[ExtraOut]:
+            db_extra = ExtraRepository.get_by_id(db, extra_id)
+            return ExtraOut.model_validate(db_extra) if db_extra else None
+        return _cache.obtener(("id", extra_id), cargar)
+    
+    @staticmethod
+    def get_extras_by_ids(db: Session, extra_ids: List[int]) -> Tuple[List[ExtraOut], List[int]]:
+        """
+        Extras en el orden pedido y los IDs que no existen. Los que no
+        están en caché se leen en una sola consulta.
+        """
+        return _cache.obtener_por_ids(
+            extra_ids,
+            lambda faltantes: [ExtraOut.model_validate(p) for p in ExtraRepository.get_by_ids(db, faltantes)]
+        )
     
     @staticmethod
     def get_all_extras(db: Session, skip: int = 0, limit: int = 100) -> List[ExtraOut]:
-        extras = ExtraRepository.get_all(db, skip, limit)
-        return [ExtraOut.model_validate(e) for e in extras]
+        return _cache.obtener(
+            ("lista", skip, limit),
+            lambda: [ExtraOut.model_validate(e) for e in ExtraRepository.get_all(db, skip, limit)]
+        )
     
     @staticmethod
-    def get_extras_by_tipo(db: Session, tipo_extra: str) -> List[ExtraOut]:
-        extras = ExtraRepository.get_by_tipo(db, tipo_extra)
-        return [ExtraOut.model_validate(e) for e in extras]
+    def filtrar_extras(db: Session, filtro: ExtraFiltro) -> List[ExtraOut]:
+        return _cache.obtener(
+            cache.clave_filtro(filtro),
+            lambda: [ExtraOut.model_validate(e) for e in ExtraRepository.buscar(db, filtro)]
+        )
     
     @staticmethod
     def update_extra(db: Session, extra_id: int, extra_update: ExtraUpdate) -> Optional[ExtraOut]:
 
         if extra_update.precio:
-            if extra_update.precio.wholesale > extra_update.precio.retail_sale:
-                raise ValueError("El precio al por mayor no puede ser mayor al precio al por menor")
+            validar_precio_cantidad(extra_update.precio)
         
-        db_extra = ExtraRepository.update(db, extra_id, extra_update)
+        try:
+            # SAVEPOINT: un nombre repetido descarta solo esta escritura; dentro
+            # de una unidad_de_trabajo exterior, ella decide si revierte lo demás
+            with unidad_de_trabajo(db), db.begin_nested():
+                db_extra = ExtraRepository.update(db, extra_id, extra_update)
+        except IntegrityError as e:
+            if es_nombre_duplicado(e, "extra"):
+                raise ValueError(f"Ya existe un extra con el nombre '{extra_update.nombre}'")
+            raise
         if not db_extra:
             return None
+        cache.invalidar("extra", extra_id)
         return ExtraOut.model_validate(db_extra)
     
+    @staticmethod
+    def actualizar_disponibilidad(db: Session, cambio: DisponibilidadLote) -> DisponibilidadLoteOut:
+        """Marca varios extras como (no) disponibles en una sola transacción"""
+        return CatalogoService.actualizar_disponibilidad(db, ExtraRepository, cambio)
+    
     @staticmethod
     def delete_extra(db: Session, extra_id: int) -> bool:
-        return ExtraRepository.delete(db, extra_id)
+        eliminado = ExtraRepository.delete(db, extra_id)
+        if eliminado:
+            cache.invalidar("extra", extra_id)
+        return eliminado
@@ -1,54 +1,109 @@
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.database import unidad_de_trabajo
 from app.repositories.pan import PanRepository
-from app.schemas.pan import PanCreate, PanUpdate, PanOut
+from app.services import cache
+from app.services.catalogo_service import CatalogoService
+from app.services.validaciones import es_nombre_duplicado, validar_precio_cantidad
+from app.schemas.catalogo import CatalogoBulkOut, DisponibilidadLote, DisponibilidadLoteOut
+from app.schemas.pan import PanCreate, PanUpdate, PanOut, PanFiltro
+
+_cache = cache.crear_cache("pan", cache.tablas_categoria("pan"))
 
 
 class PanService:
     
     @staticmethod
-    def create_pan(db: Session, pan: PanCreate) -> PanOut:
-
+    def _validar_pan(pan: PanCreate) -> None:
         if not pan.nombre or pan.nombre.strip() == "":
             raise ValueError("El nombre del pan no puede estar vacío")
         if not pan.ingredientes or len(pan.ingredientes) == 0:
             raise ValueError("El pan debe tener al menos un ingrediente")
-        if pan.precio.wholesale > pan.precio.retail_sale:
-            raise ValueError("El precio al por mayor no puede ser mayor al precio al por menor")
-        
-        db_pan = PanRepository.create(db, pan)
+        if not pan.imagen_url or pan.imagen_url.strip() == "":
+            raise ValueError("El pan debe tener una URL de imagen")
+        validar_precio_cantidad(pan.precio)
+    
+    @staticmethod
+    def create_pan(db: Session, pan: PanCreate) -> PanOut:
+        PanService._validar_pan(pan)
+        try:
+            # SAVEPOINT: un nombre repetido descarta solo esta escritura; dentro
+            # de una unidad_de_trabajo exterior, ella decide si revierte lo demás
+            with unidad_de_trabajo(db), db.begin_nested():
+                db_pan = PanRepository.create(db, pan)
+        except IntegrityError as e:
+            if es_nombre_duplicado(e, "pan"):
+                raise ValueError(f"Ya existe un pan con el nombre '{pan.nombre}'")
+            raise
+        cache.invalidar("pan", db_pan.id)
         return PanOut.model_validate(db_pan)
     
+    @staticmethod
+    def upsert_panes(db: Session, panes: List[PanCreate]) -> CatalogoBulkOut:
+        """Crea o actualiza (por nombre) un lote de panes en una sola transacción"""
+        return CatalogoService.upsert_lote(db, PanRepository, panes, PanService._validar_pan)
+    
     @staticmethod
     def get_pan(db: Session, pan_id: int) -> Optional[PanOut]:
-
-        db_pan = PanRepository.get_by_id(db, pan_id)
-        if not db_pan:
-            return None
-        return PanOut.model_validate(db_pan)
+        def cargar() -> Optional[PanOut]:
+            db_pan = PanRepository.get_by_id(db, pan_id)
+            return PanOut.model_validate(db_pan) if db_pan else None
+        return _cache.obtener(("id", pan_id), cargar)
+    
+    @staticmethod
+    def get_panes_by_ids(db: Session, pan_ids: List[int]) -> Tuple[List[PanOut], List[int]]:
+        """
+        Panes en el orden pedido y los IDs que no existen. Los que no
+        están en caché se leen en una sola consulta.
+        """
+        return _cache.obtener_por_ids(
+            pan_ids,
+            lambda faltantes: [PanOut.model_validate(p) for p in PanRepository.get_by_ids(db, faltantes)]
+        )
     
     @staticmethod
     def get_all_panes(db: Session, skip: int = 0, limit: int = 100) -> List[PanOut]:
-        panes = PanRepository.get_all(db, skip, limit)
-        return [PanOut.model_validate(p) for p in panes]
+        return _cache.obtener(
+            ("lista", skip, limit),
+            lambda: [PanOut.model_validate(p) for p in PanRepository.get_all(db, skip, limit)]
+        )
     
     @staticmethod
-    def get_panes_by_tipo(db: Session, tipo_pan: str) -> List[PanOut]:
-        panes = PanRepository.get_by_tipo(db, tipo_pan)
-        return [PanOut.model_validate(p) for p in panes]
+    def filtrar_panes(db: Session, filtro: PanFiltro) -> List[PanOut]:
+        return _cache.obtener(
+            cache.clave_filtro(filtro),
+            lambda: [PanOut.model_validate(p) for p in PanRepository.buscar(db, filtro)]
+        )
     
     @staticmethod
     def update_pan(db: Session, pan_id: int, pan_update: PanUpdate) -> Optional[PanOut]:
         if pan_update.precio:
-            if pan_update.precio.wholesale > pan_update.precio.retail_sale:
-                raise ValueError("El precio al por mayor no puede ser mayor al precio al por menor")
+            validar_precio_cantidad(pan_update.precio)
         
-        db_pan = PanRepository.update(db, pan_id, pan_update)
+        try:
+            # SAVEPOINT: un nombre repetido descarta solo esta escritura; dentro
+            # de una unidad_de_trabajo exterior, ella decide si revierte lo demás
+            with unidad_de_trabajo(db), db.begin_nested():
+                db_pan = PanRepository.update(db, pan_id, pan_update)
+        except IntegrityError as e:
+            if es_nombre_duplicado(e, "pan"):
+                raise ValueError(f"Ya existe un pan con el nombre '{pan_update.nombre}'")
+            raise
         if not db_pan:
             return None
+        cache.invalidar("pan", pan_id)
         return PanOut.model_validate(db_pan)
     
+    @staticmethod
+    def actualizar_disponibilidad(db: Session, cambio: DisponibilidadLote) -> DisponibilidadLoteOut:
+        """Marca varios panes como (no) disponibles en una sola transacción"""
+        return CatalogoService.actualizar_disponibilidad(db, PanRepository, cambio)
+    
     @staticmethod
     def delete_pan(db: Session, pan_id: int) -> bool:
-        return PanRepository.delete(db, pan_id)
+        eliminado = PanRepository.delete(db, pan_id)
+        if eliminado:
+            cache.invalidar("pan", pan_id)
+        return eliminado
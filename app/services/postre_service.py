@@ -1,58 +1,112 @@
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.database import unidad_de_trabajo
 from app.repositories.postre import PostreRepository
-from app.schemas.postre import PostreCreate, PostreUpdate, PostreOut
+from app.services import cache
+from app.services.catalogo_service import CatalogoService
+from app.services.validaciones import es_nombre_duplicado, validar_precio_tamano
+from app.schemas.catalogo import CatalogoBulkOut, DisponibilidadTamanoLote, DisponibilidadLoteOut
+from app.schemas.postre import PostreCreate, PostreUpdate, PostreOut, PostreFiltro
+
+_cache = cache.crear_cache("postre", cache.tablas_categoria("postre"))
 
 
 class PostreService:
     
     @staticmethod
-    def create_postre(db: Session, postre: PostreCreate) -> PostreOut:
+    def _validar_postre(postre: PostreCreate) -> None:
         if not postre.nombre or postre.nombre.strip() == "":
             raise ValueError("El nombre del postre no puede estar vacío")
         
         if not postre.ingredientes or len(postre.ingredientes) == 0:
             raise ValueError("El postre debe tener al menos un ingrediente")
         
-        if postre.precio.small > postre.precio.medium:
-            raise ValueError("El precio pequeño no puede ser mayor al mediano")
-        if postre.precio.medium > postre.precio.big:
-            raise ValueError("El precio mediano no puede ser mayor al grande")
+        if not postre.imagen_url or postre.imagen_url.strip() == "":
+            raise ValueError("El postre debe tener una URL de imagen")
         
-        db_postre = PostreRepository.create(db, postre)
+        validar_precio_tamano(postre.precio)
+    
+    @staticmethod
+    def create_postre(db: Session, postre: PostreCreate) -> PostreOut:
+        PostreService._validar_postre(postre)
+        try:
+            # SAVEPOINT: un nombre repetido descarta solo esta escritura; dentro
+            # de una unidad_de_trabajo exterior, ella decide si revierte lo demás
+            with unidad_de_trabajo(db), db.begin_nested():
+                db_postre = PostreRepository.create(db, postre)
+        except IntegrityError as e:
+            if es_nombre_duplicado(e, "postre"):
+                raise ValueError(f"Ya existe un postre con el nombre '{postre.nombre}'")
+            raise
+        cache.invalidar("postre", db_postre.id)
         return PostreOut.model_validate(db_postre)
     
+    @staticmethod
+    def upsert_postres(db: Session, postres: List[PostreCreate]) -> CatalogoBulkOut:
+        """Crea o actualiza (por nombre) un lote de postres en una sola transacción"""
+        return CatalogoService.upsert_lote(db, PostreRepository, postres, PostreService._validar_postre)
+    
     @staticmethod
     def get_postre(db: Session, postre_id: int) -> Optional[PostreOut]:
-        db_postre = PostreRepository.get_by_id(db, postre_id)
-        if not db_postre:
-            return None
-        return PostreOut.model_validate(db_postre)
+        def cargar() -> Optional[PostreOut]:
+            db_postre = PostreRepository.get_by_id(db, postre_id)
+            return PostreOut.model_validate(db_postre) if db_postre else None
+        return _cache.obtener(("id", postre_id), cargar)
+    
+    @staticmethod
+    def get_postres_by_ids(db: Session, postre_ids: List[int]) -> Tuple[List[PostreOut], List[int]]:
+        """
+        Postres en el orden pedido y los IDs que no existen. Los que no
+        están en caché se leen en una sola consulta.
+        """
+        return _cache.obtener_por_ids(
+            postre_ids,
+            lambda faltantes: [PostreOut.model_validate(p) for p in PostreRepository.get_by_ids(db, faltantes)]
+        )
     
     @staticmethod
     def get_all_postres(db: Session, skip: int = 0, limit: int = 100) -> List[PostreOut]:
-        postres = PostreRepository.get_all(db, skip, limit)
-        return [PostreOut.model_validate(p) for p in postres]
+        return _cache.obtener(
+            ("lista", skip, limit),
+            lambda: [PostreOut.model_validate(p) for p in PostreRepository.get_all(db, skip, limit)]
+        )
     
     @staticmethod
-    def get_postres_by_tipo(db: Session, tipo_postre: str) -> List[PostreOut]:
-        postres = PostreRepository.get_by_tipo(db, tipo_postre)
-        return [PostreOut.model_validate(p) for p in postres]
+    def filtrar_postres(db: Session, filtro: PostreFiltro) -> List[PostreOut]:
+        return _cache.obtener(
+            cache.clave_filtro(filtro),
+            lambda: [PostreOut.model_validate(p) for p in PostreRepository.buscar(db, filtro)]
+        )
     
     @staticmethod
     def update_postre(db: Session, postre_id: int, postre_update: PostreUpdate) -> Optional[PostreOut]:
         if postre_update.precio:
-            if postre_update.precio.small > postre_update.precio.medium:
-                raise ValueError("El precio pequeño no puede ser mayor al mediano")
-            if postre_update.precio.medium > postre_update.precio.big:
-                raise ValueError("El precio mediano no puede ser mayor al grande")
+            validar_precio_tamano(postre_update.precio)
         
-        db_postre = PostreRepository.update(db, postre_id, postre_update)
+        try:
+            # SAVEPOINT: un nombre repetido descarta solo esta escritura; dentro
+            # de una unidad_de_trabajo exterior, ella decide si revierte lo demás
+            with unidad_de_trabajo(db), db.begin_nested():
+                db_postre = PostreRepository.update(db, postre_id, postre_update)
+        except IntegrityError as e:
+            if es_nombre_duplicado(e, "postre"):
+                raise ValueError(f"Ya existe un postre con el nombre '{postre_update.nombre}'")
+            raise
         if not db_postre:
             return None
+        cache.invalidar("postre", postre_id)
         return PostreOut.model_validate(db_postre)
     
+    @staticmethod
+    def actualizar_disponibilidad(db: Session, cambio: DisponibilidadTamanoLote) -> DisponibilidadLoteOut:
+        """Marca varios postres como (no) disponibles en una sola transacción"""
+        return CatalogoService.actualizar_disponibilidad(db, PostreRepository, cambio)
+    
     @staticmethod
     def delete_postre(db: Session, postre_id: int) -> bool:
-        return PostreRepository.delete(db, postre_id)
+        eliminado = PostreRepository.delete(db, postre_id)
+        if eliminado:
+            cache.invalidar("postre", postre_id)
+        return eliminado
@@ -1,10 +1,13 @@
 
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.repositories.producto import ProductoRepository
-from app.schemas.producto import ProductoCreate, ProductoUpdate, ProductoOut
+from app.services import cache
+from app.schemas.producto import ProductoCreate, ProductoUpdate, ProductoOut, ProductoBusqueda
 from app.models import Producto
 
+_cache = cache.crear_cache("producto", cache.TABLAS_CATALOGO)
+
 
 class ProductoService:
 
@@ -14,19 +17,43 @@ class ProductoService:
             raise ValueError("El nombre del producto no puede estar vacío")
         
         db_producto = ProductoRepository.create(db, producto)
+        cache.invalidar("producto", db_producto.id)
         return ProductoOut.model_validate(db_producto)
     
     @staticmethod
     def get_producto(db: Session, producto_id: int) -> Optional[ProductoOut]:
-        db_producto = ProductoRepository.get_by_id(db, producto_id)
-        if not db_producto:
-            return None
-        return ProductoOut.model_validate(db_producto)
+        def cargar() -> Optional[ProductoOut]:
+            db_producto = ProductoRepository.get_by_id(db, producto_id)
+            return ProductoOut.model_validate(db_producto) if db_producto else None
+        return _cache.obtener(("id", producto_id), cargar)
+    
+    @staticmethod
+    def get_productos_by_ids(db: Session, producto_ids: List[int]) -> Tuple[List[ProductoOut], List[int]]:
+        """
+        Productos en el orden pedido y los IDs que no existen. Los que no
+        están en caché se leen en una sola consulta.
+        """
+        return _cache.obtener_por_ids(
+            producto_ids,
+            lambda faltantes: [ProductoOut.model_validate(p) for p in ProductoRepository.get_by_ids(db, faltantes)]
+        )
     
     @staticmethod
     def get_all_productos(db: Session, skip: int = 0, limit: int = 100) -> List[ProductoOut]:
-        productos = ProductoRepository.get_all(db, skip, limit)
-        return [ProductoOut.model_validate(p) for p in productos]
+        return _cache.obtener(
+            ("lista", skip, limit),
+            lambda: [ProductoOut.model_validate(p) for p in ProductoRepository.get_all(db, skip, limit)]
+        )
+    
+    @staticmethod
+    def buscar_productos(db: Session, q: str, limit: int = 20) -> List[ProductoBusqueda]:
+        texto = q.strip()
+        if len(texto) < 2:
+            raise ValueError("La búsqueda debe tener al menos 2 caracteres")
+        return _cache.obtener(
+            ("buscar", texto.lower(), limit),
+            lambda: [ProductoBusqueda.model_validate(fila) for fila in ProductoRepository.buscar(db, texto, limit)]
+        )
     
     @staticmethod
     def update_producto(db: Session, producto_id: int, producto_update: ProductoUpdate) -> Optional[ProductoOut]:
@@ -36,8 +63,12 @@ class ProductoService:
         db_producto = ProductoRepository.update(db, producto_id, producto_update)
         if not db_producto:
             return None
+        cache.invalidar("producto", producto_id)
         return ProductoOut.model_validate(db_producto)
     
     @staticmethod
     def delete_producto(db: Session, producto_id: int) -> bool:
-        return ProductoRepository.delete(db, producto_id)
+        eliminado = ProductoRepository.delete(db, producto_id)
+        if eliminado:
+            cache.invalidar("producto", producto_id)
+        return eliminado
@@ -0,0 +1,40 @@
+"""
+Reglas de precios compartidas por los servicios del catálogo.
+Reciben cualquier objeto con los campos del tipo compuesto
+(schema de entrada o NamedTuple leído de la base).
+
+es_nombre_duplicado distingue, entre los IntegrityError de las
+escrituras, el nombre repetido de las demás restricciones.
+"""
+from sqlalchemy.exc import IntegrityError
+
+# SQLSTATE de unique_violation
+VIOLACION_UNICA = "23505"
+
+
+def validar_precio_tamano(precio) -> None:
+    """price_size: pequeño <= mediano <= grande"""
+    if precio.small > precio.medium:
+        raise ValueError("El precio pequeño no puede ser mayor al mediano")
+    if precio.medium > precio.big:
+        raise ValueError("El precio mediano no puede ser mayor al grande")
+
+
+def validar_precio_cantidad(precio) -> None:
+    """price_amount: al por mayor <= al por menor"""
+    if precio.wholesale > precio.retail_sale:
+        raise ValueError("El precio al por mayor no puede ser mayor al precio al por menor")
+
+
+def es_nombre_duplicado(error: IntegrityError, tabla: str) -> bool:
+    """
+    True solo si el error es la violación del índice uq_<tabla>_nombre;
+    cualquier otra restricción (NOT NULL, CHECK, FK...) no es un nombre repetido.
+    """
+    orig = error.orig
+    if getattr(orig, "pgcode", None) != VIOLACION_UNICA:
+        return False
+    # psycopg2 expone diag; con asyncpg el error original queda en __cause__
+    diag = getattr(orig, "diag", None)
+    restriccion = getattr(diag, "constraint_name", None) or getattr(orig.__cause__, "constraint_name", None)
+    return restriccion == f"uq_{tabla}_nombre"
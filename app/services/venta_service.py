@@ -1,11 +1,22 @@
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, Select
+from sqlalchemy.exc import DBAPIError
+from typing import List, Optional, Tuple
 from datetime import date
-from app.repositories.venta import VentaRepository
+import base64
+from app.database import unidad_de_trabajo
+from app.repositories.venta import VentaRepository, VentaDetalleRepository
 from app.repositories.producto import ProductoRepository
-from app.schemas.venta import VentaCreate, VentaUpdate, VentaOut, InsertarVentaRequest
+from app.schemas.venta import (
+    VentaCreate,
+    VentaUpdate,
+    VentaOut,
+    VentaDetallesCambios,
+    InsertarVentaRequest,
+    VentaBulkResultado,
+    VentaBulkOut,
+)
 from app.models import Producto
 
 
@@ -18,18 +29,27 @@ class VentaService:
             raise ValueError("La venta debe tener al menos un producto")
         
         for detalle in venta.detalles_venta:
-            producto = ProductoRepository.get_by_id(db, detalle.id_producto)
-            if not producto:
-                raise ValueError(f"El producto con ID {detalle.id_producto} no existe")
-            
             if detalle.cantidad <= 0:
                 raise ValueError("La cantidad debe ser mayor a 0")
             if detalle.precio <= 0:
                 raise ValueError("El precio debe ser mayor a 0")
         
-        db_venta = VentaRepository.create(db, venta)
+        # Verificación y escritura en la misma transacción (un solo COMMIT)
+        with unidad_de_trabajo(db):
+            VentaService._validar_productos(db, [d.id_producto for d in venta.detalles_venta])
+            db_venta = VentaRepository.create(db, venta)
         return VentaOut.model_validate(db_venta)
     
+    @staticmethod
+    def _validar_productos(db: Session, ids_solicitados: List[int]) -> None:
+        existentes = ProductoRepository.get_ids_existentes(db, ids_solicitados)
+        faltantes = sorted(set(ids_solicitados) - existentes)
+        if faltantes:
+            if len(faltantes) == 1:
+                raise ValueError(f"El producto con ID {faltantes[0]} no existe")
+            ids_texto = ", ".join(str(i) for i in faltantes)
+            raise ValueError(f"Los productos con ID {ids_texto} no existen")
+    
     @staticmethod
     def get_venta(db: Session, venta_id: int) -> Optional[VentaOut]:
         db_venta = VentaRepository.get_by_id(db, venta_id)
@@ -38,13 +58,17 @@ class VentaService:
         return VentaOut.model_validate(db_venta)
     
     @staticmethod
-    def get_all_ventas(db: Session, skip: int = 0, limit: int = 100) -> List[VentaOut]:
-        ventas = VentaRepository.get_all(db, skip, limit)
-        return [VentaOut.model_validate(v) for v in ventas]
-    
-    @staticmethod
-    def get_ventas_by_fecha(db: Session, fecha: date) -> List[VentaOut]:
-        ventas = VentaRepository.get_by_fecha(db, fecha)
+    def get_all_ventas(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        cursor: Optional[str] = None
+    ) -> List[VentaOut]:
+        VentaService._validar_rango(desde, hasta)
+        despues_de = VentaService.decodificar_cursor(cursor) if cursor else None
+        ventas = VentaRepository.get_all(db, skip, limit, desde, hasta, despues_de)
         return [VentaOut.model_validate(v) for v in ventas]
     
     @staticmethod
@@ -54,23 +78,61 @@ class VentaService:
             return None
         return VentaOut.model_validate(db_venta)
     
+    @staticmethod
+    def actualizar_detalles(db: Session, venta_id: int, cambios: VentaDetallesCambios) -> Optional[VentaOut]:
+        """
+        Agrega, modifica y elimina líneas de una venta en una sola
+        transacción; precio_total se recalcula una vez al final.
+        """
+        for detalle in cambios.agregar + cambios.actualizar:
+            if detalle.cantidad is not None and detalle.cantidad <= 0:
+                raise ValueError("La cantidad debe ser mayor a 0")
+            if detalle.precio is not None and detalle.precio <= 0:
+                raise ValueError("El precio debe ser mayor a 0")
+        
+        with unidad_de_trabajo(db):
+            if not VentaRepository.bloquear(db, venta_id):
+                return None
+            
+            existentes = set(VentaDetalleRepository.get_ids_by_venta(db, venta_id))
+            ajenos = sorted(({d.id for d in cambios.actualizar} | set(cambios.eliminar)) - existentes)
+            if ajenos:
+                ids_texto = ", ".join(str(i) for i in ajenos)
+                raise ValueError(f"Las líneas con ID {ids_texto} no pertenecen a la venta {venta_id}")
+            if len(existentes) - len(cambios.eliminar) + len(cambios.agregar) == 0:
+                raise ValueError("La venta debe tener al menos un producto")
+            
+            productos = [d.id_producto for d in cambios.agregar + cambios.actualizar if d.id_producto is not None]
+            if productos:
+                VentaService._validar_productos(db, productos)
+            
+            try:
+                db_venta = VentaDetalleRepository.aplicar_cambios(db, venta_id, cambios)
+            except DBAPIError as e:
+                # Triggers de venta_detalle (p. ej. producto agotado)
+                raise ValueError(f"Error al modificar la venta: {str(e.orig).splitlines()[0]}")
+        return VentaOut.model_validate(db_venta)
+    
     @staticmethod
     def delete_venta(db: Session, venta_id: int) -> bool:
 
         return VentaRepository.delete(db, venta_id)
     
     @staticmethod
-    def insertar_venta_sql(db: Session, request: InsertarVentaRequest) -> int:
-
+    def validar_venta_sql(request: InsertarVentaRequest) -> None:
         if not request.venta_detalle or len(request.venta_detalle) == 0:
             raise ValueError("La venta debe tener al menos un producto")
+    
+    @staticmethod
+    def insertar_venta_sql(db: Session, request: InsertarVentaRequest) -> int:
+        VentaService.validar_venta_sql(request)
         
         venta_detalle_dicts = [
             {
                 "id_producto": d.id_producto,
                 "cantidad": d.cantidad,
                 "precio": str(d.precio),
-                "variante": d.variante
+                "variante": d.variante.value
             }
             for d in request.venta_detalle
         ]
@@ -87,9 +149,107 @@ class VentaService:
             raise ValueError(f"Error al crear venta: {str(e)}")
     
     @staticmethod
-    def obtener_ventas_detalles(db: Session) -> List[dict]:
+    def insertar_ventas_agrupadas(
+        db: Session,
+        ventas: List[InsertarVentaRequest]
+    ) -> List[Tuple[Optional[int], Optional[str]]]:
+        """
+        Un grupo de tickets de distintas peticiones en una sola transacción
+        (modo group commit, ver escritor_ventas). Devuelve (id, error) por ticket.
+        
+        Cada ticket pasa por insertar_venta_sql, igual que POST /ventas/crear
+        sin agrupar, así que los errores son los mismos; su SAVEPOINT
+        descarta solo ese ticket y el grupo se confirma con un COMMIT.
+        """
+        resultados: List[Tuple[Optional[int], Optional[str]]] = []
+        with unidad_de_trabajo(db):
+            for venta in ventas:
+                try:
+                    with db.begin_nested():
+                        resultados.append((VentaService.insertar_venta_sql(db, venta), None))
+                except ValueError as e:
+                    resultados.append((None, str(e)))
+        return resultados
+    
+    @staticmethod
+    def insertar_ventas_bulk(
+        db: Session,
+        ventas: List[InsertarVentaRequest],
+        tamano_lote: Optional[int] = None
+    ) -> VentaBulkOut:
+        """
+        Inserta muchos tickets (p. ej. la cola de una terminal que estuvo
+        sin red). Sin tamano_lote todo va en una transacción; con tamano_lote
+        se confirma cada lote por separado.
+        """
+        if not ventas:
+            raise ValueError("Debe enviar al menos una venta")
+        
+        tamano = tamano_lote or len(ventas)
+        resultados: List[VentaBulkResultado] = []
+        for inicio in range(0, len(ventas), tamano):
+            lote = ventas[inicio:inicio + tamano]
+            for desplazamiento, (venta_id, error) in enumerate(
+                VentaRepository.insertar_ventas_lote(db, lote)
+            ):
+                resultados.append(VentaBulkResultado(
+                    indice=inicio + desplazamiento,
+                    id=venta_id,
+                    error=f"Error al crear venta: {error}" if error else None
+                ))
+        
+        creadas = sum(1 for r in resultados if r.id is not None)
+        return VentaBulkOut(
+            creadas=creadas,
+            fallidas=len(resultados) - creadas,
+            resultados=resultados
+        )
+    
+    @staticmethod
+    def obtener_ventas_detalles(
+        db: Session,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[dict]:
         """
         Obtiene el historial de ventas con sus detalles completos.
-        Usa la función SQL obtener_ventas_detalles().
+        Mismo formato que la función SQL obtener_ventas_detalles().
         """
-        return VentaRepository.obtener_ventas_detalles(db)
+        VentaService._validar_rango(desde, hasta)
+        despues_de = VentaService.decodificar_cursor(cursor) if cursor else None
+        return VentaRepository.obtener_ventas_detalles(db, desde, hasta, despues_de, limit)
+    
+    @staticmethod
+    def consulta_historial(
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None
+    ) -> Select:
+        """Consulta del historial para leerla en streaming (ver DBRunner.stream)."""
+        VentaService._validar_rango(desde, hasta)
+        return VentaRepository.historial_stmt(desde, hasta)
+    
+    @staticmethod
+    def historial_a_dict(row) -> dict:
+        return VentaRepository.historial_a_dict(row)
+    
+    @staticmethod
+    def codificar_cursor(fecha: date, venta_id: int) -> str:
+        """Cursor opaco para paginar por (fecha, id)."""
+        crudo = f"{fecha.isoformat()}|{venta_id}".encode()
+        return base64.urlsafe_b64encode(crudo).decode().rstrip("=")
+    
+    @staticmethod
+    def decodificar_cursor(cursor: str) -> Tuple[date, int]:
+        try:
+            relleno = "=" * (-len(cursor) % 4)
+            fecha, venta_id = base64.urlsafe_b64decode(cursor + relleno).decode().split("|")
+            return date.fromisoformat(fecha), int(venta_id)
+        except ValueError:
+            raise ValueError("Cursor de paginación inválido")
+    
+    @staticmethod
+    def _validar_rango(desde: Optional[date], hasta: Optional[date]) -> None:
+        if desde and hasta and desde > hasta:
+            raise ValueError("La fecha 'desde' no puede ser posterior a 'hasta'")
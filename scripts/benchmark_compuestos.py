@@ -0,0 +1,209 @@
+"""
+Micro-benchmark de la decodificación de precio y disponible (tipos compuestos).
+
+Compara, para una página de postres, la decodificación de cada fila
+(driver + result_processor) y el total con PostreOut.model_validate:
+  - texto: lo anterior. psycopg2 entregaba '(250.00,380.00,500.00)' y
+    PostreOut lo separaba con strip/split/Decimal en un field_validator
+    (por eso su "decodificar" solo copia la fila: el análisis va en "total")
+  - caster_psycopg2: el CompositeCaster de psycopg2 sin cambios
+    (tokenize con expresiones regulares + curs.cast por campo), como se
+    registró primero
+  - compuesto: lo actual. registrar_compuestos instala un caster que usa
+    TipoCompuesto.decodificar (split + Decimal/bool) y PostreOut valida el
+    NamedTuple directamente; es el mismo código que result_processor usa
+    si el adaptador no está registrado
+
+Con asyncpg los compuestos llegan decodificados por el driver (protocolo
+binario), así que ese caso no se puede medir sin una base.
+
+Solo usa psycopg2 y pydantic, no necesita base de datos:
+
+    python -m scripts.benchmark_compuestos [--filas 100] [--repeticiones 200]
+"""
+import argparse
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import psycopg2.extensions
+import psycopg2.extras
+from pydantic import field_validator
+
+from app.models.compuestos import PriceSizeType, StatusSizeType, _caster
+from app.schemas.postre import PostreOut
+from app.schemas.types import PriceSizeSchema, StatusSizeSchema
+from scripts.benchmark_serializacion import medir
+
+PRECIO_TEXTO = "(250.00,380.00,500.00)"
+DISPONIBLE_TEXTO = "(t,t,f)"
+
+# OIDs de numeric y boolean en pg_type
+_NUMERIC, _BOOLEAN = 1700, 16
+
+
+class PostreOutTexto(PostreOut):
+    """PostreOut antes de los tipos compuestos (validadores copiados tal cual)"""
+
+    precio: Optional[Union[PriceSizeSchema, tuple]] = None
+    disponible: Optional[Union[StatusSizeSchema, tuple]] = None
+
+    @field_validator('precio', mode='before')
+    @classmethod
+    def convert_precio_tuple(cls, v):
+        if v is None:
+            return None
+
+        if isinstance(v, str):
+            cleaned = v.strip('()')
+            parts = cleaned.split(',')
+            if len(parts) == 3:
+                return PriceSizeSchema(
+                    small=Decimal(parts[0]),
+                    medium=Decimal(parts[1]),
+                    big=Decimal(parts[2])
+                )
+
+        if isinstance(v, tuple) and len(v) == 3:
+            return PriceSizeSchema(
+                small=Decimal(str(v[0])),
+                medium=Decimal(str(v[1])),
+                big=Decimal(str(v[2]))
+            )
+        return v
+
+    @field_validator('disponible', mode='before')
+    @classmethod
+    def convert_disponible_tuple(cls, v):
+        if v is None:
+            return StatusSizeSchema(small=True, medium=True, big=True)
+
+        if isinstance(v, str):
+            cleaned = v.strip('()')
+            parts = cleaned.split(',')
+            if len(parts) == 3:
+                return StatusSizeSchema(
+                    small=parts[0].lower() == 't',
+                    medium=parts[1].lower() == 't',
+                    big=parts[2].lower() == 't'
+                )
+
+        if isinstance(v, tuple) and len(v) == 3:
+            return StatusSizeSchema(
+                small=bool(v[0]),
+                medium=bool(v[1]),
+                big=bool(v[2])
+            )
+        return v
+
+
+class _Cursor:
+    """Lo único que CompositeCaster.parse de psycopg2 usa del cursor: cast(oid, texto)"""
+
+    _tipos = {_NUMERIC: psycopg2.extensions.DECIMAL, _BOOLEAN: psycopg2.extensions.BOOLEAN}
+
+    def cast(self, oid: int, valor: Optional[str]) -> Any:
+        return self._tipos[oid](valor, None)
+
+
+def _atributos(oid: int) -> List[tuple]:
+    return [("small", oid), ("medium", oid), ("big", oid)]
+
+
+def generar_filas(cantidad: int) -> List[SimpleNamespace]:
+    """Filas de postre como las devuelve el ORM, con los compuestos en texto"""
+    ejemplo = PostreOut.model_config["json_schema_extra"]["example"]
+    return [
+        SimpleNamespace(**{**ejemplo, "id": n + 1, "precio": PRECIO_TEXTO, "disponible": DISPONIBLE_TEXTO})
+        for n in range(cantidad)
+    ]
+
+
+def _sin_cambios(texto: str) -> str:
+    return texto
+
+
+def con_decodificador(
+    modelo: Any,
+    decodificar_precio: Callable[[str], Any],
+    decodificar_disponible: Callable[[str], Any],
+) -> Dict[str, Callable[[List[SimpleNamespace]], List[Any]]]:
+    """
+    decodificar: solo el paso del driver/result_processor (una fila nueva
+    con los compuestos decodificados); total: además modelo.model_validate.
+    """
+    def decodificar(filas: List[SimpleNamespace]) -> List[SimpleNamespace]:
+        return [
+            SimpleNamespace(**{
+                **vars(f),
+                "precio": decodificar_precio(f.precio),
+                "disponible": decodificar_disponible(f.disponible),
+            })
+            for f in filas
+        ]
+
+    def total(filas: List[SimpleNamespace]) -> List[Any]:
+        return [modelo.model_validate(f) for f in decodificar(filas)]
+    return {"decodificar": decodificar, "total": total}
+
+
+def con_texto() -> Dict[str, Callable[[List[SimpleNamespace]], List[Any]]]:
+    # El texto llegaba sin tocar; el trabajo lo hacían los validadores
+    return con_decodificador(PostreOutTexto, _sin_cambios, _sin_cambios)
+
+
+def con_caster(caster: Callable[[Any], Any]) -> Dict[str, Callable[[List[SimpleNamespace]], List[Any]]]:
+    """El driver decodifica con `caster`; result_processor deja pasar el NamedTuple"""
+    cursor = _Cursor()
+    precio = caster(PriceSizeType)("price_size", 0, _atributos(_NUMERIC))
+    disponible = caster(StatusSizeType)("status_size", 0, _atributos(_BOOLEAN))
+    procesar_precio = PriceSizeType().result_processor(None, None)
+    procesar_disponible = StatusSizeType().result_processor(None, None)
+    return con_decodificador(
+        PostreOut,
+        lambda texto: procesar_precio(precio.parse(texto, cursor)),
+        lambda texto: procesar_disponible(disponible.parse(texto, cursor)),
+    )
+
+
+def _caster_psycopg2(tipo: Any) -> Any:
+    class Caster(psycopg2.extras.CompositeCaster):
+        def make(self, values):
+            return tipo.clase._make(values)
+    return Caster
+
+
+MODOS = {
+    "texto": con_texto,
+    "caster_psycopg2": lambda: con_caster(_caster_psycopg2),
+    "compuesto": lambda: con_caster(_caster),
+}
+
+
+def comparar(cantidad: int, repeticiones: int) -> Dict[str, Dict[str, float]]:
+    filas = generar_filas(cantidad)
+    modos = {nombre: crear() for nombre, crear in MODOS.items()}
+    # Todas las variantes deben producir la misma respuesta
+    esperado = [p.model_dump() for p in modos["texto"]["total"](filas)]
+    for pasos in modos.values():
+        assert [p.model_dump() for p in pasos["total"](filas)] == esperado
+    return {
+        nombre: {paso: medir(lambda f=funcion: f(filas), repeticiones) for paso, funcion in pasos.items()}
+        for nombre, pasos in modos.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=100, help="Postres por página")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.filas} filas, mejor de {args.repeticiones} (ms por página)")
+    print(f"{'modo':<18}{'decodificar':>12}{'total':>10}")
+    for nombre, t in comparar(args.filas, args.repeticiones).items():
+        print(f"{nombre:<18}{t['decodificar']:>12.3f}{t['total']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark de la llamada a insertar_venta() que hace POST /ventas/crear.
+
+Compara:
+  - interpolado: el SQL anterior, armado con f-strings y comillas
+    escapadas a mano (un texto distinto por venta: se analiza y planifica
+    en cada llamada)
+  - parametros: VentaRepository.insertar_venta_sql, un texto constante
+    con parámetros enlazados (asyncpg lo prepara una vez por conexión)
+
+Usa la base configurada en app.database y el modo de BAKERY_DB_MODE
+(sync: psycopg2 en hilos, async: asyncpg como la API). Cada trabajador
+inserta dentro de una unidad_de_trabajo que se revierte al final: no
+quedan ventas en la base.
+
+    BAKERY_DB_MODE=async python -m scripts.benchmark_insertar_venta --ventas 2000 --concurrencia 8
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import database
+from app.repositories.venta import VentaRepository
+
+Insertar = Callable[[Session, str, List[dict], date], int]
+
+
+def insertar_interpolado(db: Session, detalles: str, venta_detalle: List[dict], fecha: date) -> int:
+    """Versión anterior de VentaRepository.insertar_venta_sql (sin el commit)"""
+    detalles_escaped = detalles.replace("'", "''")
+    venta_detalle_escaped = json.dumps(venta_detalle).replace("'", "''")
+    sql = (
+        f"SELECT insertar_venta('{detalles_escaped}', "
+        f"'{venta_detalle_escaped}'::jsonb, '{fecha.isoformat()}'::date)"
+    )
+    return db.execute(text(sql)).scalar()
+
+
+def insertar_parametros(db: Session, detalles: str, venta_detalle: List[dict], fecha: date) -> int:
+    return VentaRepository.insertar_venta_sql(db, detalles, venta_detalle, fecha)
+
+
+MODOS: Dict[str, Insertar] = {
+    "interpolado": insertar_interpolado,
+    "parametros": insertar_parametros,
+}
+
+
+def producto_de_prueba(db: Session) -> List[dict]:
+    """Una línea de venta válida: un pan disponible, vendido al por menor"""
+    fila = db.execute(text(
+        "SELECT id, (precio).retail_sale FROM pan WHERE coalesce(disponible, true) ORDER BY id LIMIT 1"
+    )).first()
+    if fila is None:
+        raise SystemExit("Se necesita al menos un pan disponible en la base")
+    return [{"id_producto": fila[0], "cantidad": 1, "precio": str(fila[1]), "variante": "retail"}]
+
+
+class _Revertir(Exception):
+    pass
+
+
+def ejecutar_lote(db: Session, insertar: Insertar, cuantas: int, inicio: int, venta_detalle: List[dict]) -> None:
+    """
+    Inserta `cuantas` ventas dentro de una unidad_de_trabajo (los
+    repositorios solo hacen flush) y la revierte al terminar.
+    """
+    try:
+        with database.unidad_de_trabajo(db):
+            for n in range(inicio, inicio + cuantas):
+                # Texto distinto por venta, como los tickets reales
+                insertar(db, f"Benchmark {n}", venta_detalle, date.today())
+            raise _Revertir
+    except _Revertir:
+        pass
+
+
+def medir_sync(insertar: Insertar, ventas: int, concurrencia: int, venta_detalle: List[dict]) -> float:
+    por_trabajador = ventas // concurrencia
+
+    def trabajador(indice: int) -> None:
+        with database.SessionLocal() as db:
+            ejecutar_lote(db, insertar, por_trabajador, indice * por_trabajador, venta_detalle)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(concurrencia) as hilos:
+        list(hilos.map(trabajador, range(concurrencia)))
+    return por_trabajador * concurrencia / (time.perf_counter() - inicio)
+
+
+async def medir_async(insertar: Insertar, ventas: int, concurrencia: int, venta_detalle: List[dict]) -> float:
+    por_trabajador = ventas // concurrencia
+
+    async def trabajador(indice: int) -> None:
+        # run_sync como AsyncRunner: E/S con asyncpg y su caché de sentencias preparadas
+        async with database.AsyncSessionLocal() as db:
+            await db.run_sync(ejecutar_lote, insertar, por_trabajador, indice * por_trabajador, venta_detalle)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajador(i) for i in range(concurrencia)))
+    return por_trabajador * concurrencia / (time.perf_counter() - inicio)
+
+
+async def medir_modos_async(args, venta_detalle: List[dict]) -> Dict[str, float]:
+    # Un solo event loop: el pool de asyncpg queda ligado al loop que lo creó
+    resultados = {}
+    try:
+        for nombre, insertar in MODOS.items():
+            await medir_async(insertar, args.calentamiento, args.concurrencia, venta_detalle)
+            resultados[nombre] = await medir_async(insertar, args.ventas, args.concurrencia, venta_detalle)
+    finally:
+        await database.async_engine.dispose()
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ventas", type=int, default=2000, help="Ventas por modo")
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--calentamiento", type=int, default=100, help="Ventas previas sin medir")
+    args = parser.parse_args()
+
+    with database.SessionLocal() as db:
+        venta_detalle = producto_de_prueba(db)
+
+    if database.DB_MODE == "async":
+        resultados = asyncio.run(medir_modos_async(args, venta_detalle))
+    else:
+        resultados = {}
+        for nombre, insertar in MODOS.items():
+            medir_sync(insertar, args.calentamiento, args.concurrencia, venta_detalle)
+            resultados[nombre] = medir_sync(insertar, args.ventas, args.concurrencia, venta_detalle)
+
+    print(f"modo {database.DB_MODE}, {args.ventas} ventas, concurrencia {args.concurrencia}")
+    for nombre, ventas_s in resultados.items():
+        print(f"{nombre:<12}{ventas_s:>10.0f} ventas/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark de la serialización de listados.
+
+Compara, para listas de PostreOut, BebidaOut y VentaOut:
+  - dump_json: respuesta_lista (TypeAdapter(List[modelo]).dump_json)
+  - response_model: lo que hace FastAPI al devolver la lista con
+    response_model (serialize_response + JSONResponse)
+  - jsonable_encoder: jsonable_encoder + JSONResponse, sin response_model
+
+Solo usa pydantic/FastAPI, no necesita base de datos:
+
+    python -m scripts.benchmark_serializacion [--items 100] [--repeticiones 200]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.routers.respuestas import respuesta_lista
+from app.schemas.bebida import BebidaOut
+from app.schemas.postre import PostreOut
+from app.schemas.venta import VentaOut
+
+MODELOS = (PostreOut, BebidaOut, VentaOut)
+
+
+def generar_items(modelo: Any, cantidad: int) -> List[Any]:
+    """Copias del ejemplo del schema con IDs distintos"""
+    ejemplo = modelo.model_config["json_schema_extra"]["example"]
+    return [modelo.model_validate({**ejemplo, "id": n + 1}) for n in range(cantidad)]
+
+
+def con_dump_json(modelo: Any, items: List[Any]) -> bytes:
+    return respuesta_lista(modelo, items).body
+
+
+def con_response_model(modelo: Any) -> Callable[[List[Any]], bytes]:
+    campo = create_model_field(name="Response", type_=List[modelo], mode="serialization")
+    # Un solo loop para no medir la creación de uno por llamada
+    loop = asyncio.new_event_loop()
+
+    def serializar(items: List[Any]) -> bytes:
+        contenido = loop.run_until_complete(serialize_response(field=campo, response_content=items))
+        return JSONResponse(contenido).body
+    return serializar
+
+
+def con_jsonable_encoder(items: List[Any]) -> bytes:
+    return JSONResponse(jsonable_encoder(items)).body
+
+
+def medir(funcion: Callable[[], Any], repeticiones: int) -> float:
+    """Mejor tiempo por llamada en milisegundos"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos) * 1000
+
+
+def comparar(modelo: Any, cantidad: int, repeticiones: int) -> Dict[str, float]:
+    items = generar_items(modelo, cantidad)
+    response_model = con_response_model(modelo)
+    return {
+        "dump_json": medir(lambda: con_dump_json(modelo, items), repeticiones),
+        "response_model": medir(lambda: response_model(items), repeticiones),
+        "jsonable_encoder": medir(lambda: con_jsonable_encoder(items), repeticiones),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100, help="Elementos por lista")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.items} elementos, mejor de {args.repeticiones} (ms por lista)")
+    print(f"{'modelo':<12}{'dump_json':>12}{'response_model':>16}{'jsonable_encoder':>18}")
+    for modelo in MODELOS:
+        t = comparar(modelo, args.items, args.repeticiones)
+        print(
+            f"{modelo.__name__:<12}{t['dump_json']:>12.3f}"
+            f"{t['response_model']:>16.3f}{t['jsonable_encoder']:>18.3f}"
+            f"   x{t['response_model'] / t['dump_json']:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
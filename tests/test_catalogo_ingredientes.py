@@ -0,0 +1,75 @@
+"""
+SQL de la búsqueda por ingredientes: para que Postgres use los índices
+GIN, el filtro debe aplicar && o @> sobre la misma expresión indexada,
+normalizar_ingredientes(ingredientes). Se compila la sentencia con el
+dialecto de Postgres (no hace falta una base) y se compara con los
+CREATE INDEX del esquema y de la migración.
+"""
+import re
+from pathlib import Path
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.catalogo import CatalogoRepository
+from app.schemas.filtros import IngredientesFiltro, ModoIngredientes
+
+DATABASES = Path(__file__).resolve().parent.parent / "app" / "databases"
+INDICE = re.compile(
+    r"CREATE INDEX (?:IF NOT EXISTS )?idx_\w+_ingredientes ON (\w+) USING GIN \((.+)\);"
+)
+BUSCADOS = "ARRAY['harina', 'huevo']"
+
+
+class _SesionFalsa:
+    """Guarda la sentencia en lugar de ejecutarla"""
+
+    def execute(self, stmt):
+        self.stmt = stmt
+        return self
+
+    def scalar_one(self):
+        return "[]"
+
+
+def _sql(modo: ModoIngredientes) -> str:
+    db = _SesionFalsa()
+    filtro = IngredientesFiltro(ingredientes=[" Harina", "HUEVO ", "harina"], modo=modo)
+    CatalogoRepository.buscar_por_ingredientes_json(db, filtro)
+    return str(db.stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def _indices(archivo: str) -> dict:
+    return dict(INDICE.findall((DATABASES / archivo).read_text(encoding="utf-8")))
+
+
+@pytest.mark.parametrize("archivo", ["bakery_bd.sql", "migracion_001_catalogo.sql"])
+def test_indices_sobre_todas_las_categorias(archivo):
+    indices = _indices(archivo)
+    assert sorted(indices) == sorted(CatalogoRepository.categorias_con_ingredientes)
+    assert set(indices.values()) == {"normalizar_ingredientes(ingredientes)"}
+
+
+@pytest.mark.parametrize("modo, operador", [
+    (ModoIngredientes.ALGUNO, "&&"),
+    (ModoIngredientes.TODOS, "@>"),
+])
+def test_filtro_usa_la_expresion_indexada(modo, operador):
+    sql = _sql(modo)
+    for tabla, expresion in _indices("bakery_bd.sql").items():
+        # La expresión del índice, calificada con la tabla de la consulta
+        indexada = expresion.replace("(ingredientes)", f"({tabla}.ingredientes)")
+        assert f"WHERE {indexada} {operador} {BUSCADOS}" in sql
+
+
+def test_ninguno_trata_null_como_sin_coincidencias():
+    sql = _sql(ModoIngredientes.NINGUNO)
+    for tabla in CatalogoRepository.categorias_con_ingredientes:
+        # normalizar_ingredientes es STRICT: sin ingredientes, && da NULL y
+        # NOT NULL excluiría la fila; coalesce(..., false) la conserva
+        assert f"WHERE NOT coalesce(normalizar_ingredientes({tabla}.ingredientes) && {BUSCADOS}, false)" in sql
+
+
+def test_buscados_normalizados_como_en_la_base():
+    """Mismo criterio que normalizar_ingredientes(): minúsculas y sin espacios extremos"""
+    assert IngredientesFiltro(ingredientes=[" Harina", "HUEVO ", "harina"]).ingredientes == ["harina", "huevo"]
@@ -0,0 +1,48 @@
+"""
+Decodificación del texto de los tipos compuestos ('(250.00,380.00,500.00)')
+que usan el adaptador de psycopg2 y el respaldo de result_processor.
+"""
+from decimal import Decimal
+
+import psycopg2
+import psycopg2.extras
+import pytest
+
+from app.models.compuestos import PriceAmountType, PriceSizeType, StatusSizeType, _caster
+from app.models.types import PriceAmount, PriceSize, StatusSize
+
+
+@pytest.mark.parametrize("tipo, texto, esperado", [
+    (PriceSizeType, "(250.00,380.00,500.00)", PriceSize(Decimal("250.00"), Decimal("380.00"), Decimal("500.00"))),
+    (PriceSizeType, "(,38.5,)", PriceSize(None, Decimal("38.5"), None)),
+    (PriceAmountType, "(12.00,10.50)", PriceAmount(Decimal("12.00"), Decimal("10.50"))),
+    (StatusSizeType, "(t,f,t)", StatusSize(True, False, True)),
+    (StatusSizeType, "(t,,f)", StatusSize(True, None, False)),
+    # Con comillas se usa el tokenizador de psycopg2
+    (PriceSizeType, '("1.00","2.00",)', PriceSize(Decimal("1.00"), Decimal("2.00"), None)),
+])
+def test_decodificar(tipo, texto, esperado):
+    assert tipo.decodificar(texto) == esperado
+    assert tipo().result_processor(None, None)(texto) == esperado
+
+
+@pytest.mark.parametrize("tipo, texto", [
+    (PriceSizeType, "(250.00,380.00,500.00)"),
+    (StatusSizeType, "(t,,f)"),
+    (PriceAmountType, "(12.00,)"),
+])
+def test_igual_que_el_caster_de_psycopg2(tipo, texto):
+    """Mismo resultado que tokenize de psycopg2 con Decimal/bool por campo"""
+    convertir = tipo.convertir
+    esperado = tipo.clase._make(
+        convertir(v) if v is not None else None
+        for v in psycopg2.extras.CompositeCaster.tokenize(texto)
+    )
+    caster = _caster(tipo)(tipo.nombre, 0, [(campo, 0) for campo in tipo.clase._fields])
+    assert caster.parse(texto, None) == esperado
+    assert caster.parse(None, None) is None
+
+
+def test_campos_de_mas():
+    with pytest.raises(psycopg2.DataError):
+        PriceAmountType.decodificar("(1.00,2.00,3.00)")
@@ -0,0 +1,118 @@
+"""
+Group commit de POST /ventas/crear: un ticket inválido falla solo él y
+con el mismo error que sin agrupar.
+
+insertar_venta() es una función plpgsql, así que aquí se sustituye por
+una que inserta la cabecera en SQLite y falla (como el trigger) si algún
+producto no existe; los SAVEPOINT y el COMMIT del grupo son reales.
+"""
+import asyncio
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import confirmar
+from app.models import Venta, VentaDetalle
+from app.models.base import Base
+from app.repositories.venta import VentaRepository
+from app.schemas.venta import InsertarVentaRequest
+from app.services import escritor_ventas
+from app.services.escritor_ventas import EscritorVentas
+from app.services.venta_service import VentaService
+
+PRODUCTO_INEXISTENTE = 999
+
+
+@pytest.fixture
+def sesiones():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite no maneja bien SAVEPOINT por sí solo: BEGIN explícito
+    @event.listens_for(engine, "connect")
+    def sin_transaccion_implicita(conexion, _):
+        conexion.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def iniciar(conexion):
+        conexion.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine, tables=[Venta.__table__, VentaDetalle.__table__])
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def insertar_venta_falsa(db, detalles, venta_detalle, fecha=None):
+    """Como insertar_venta(): la cabecera se escribe antes de que falle el trigger"""
+    venta = Venta(detalles=detalles, fecha=fecha, precio_total=Decimal("0"))
+    db.add(venta)
+    db.flush()
+    for detalle in venta_detalle:
+        if detalle["id_producto"] == PRODUCTO_INEXISTENTE:
+            raise DBAPIError(
+                "SELECT insertar_venta(...)", {},
+                Exception(f"Error al insertar venta: El producto ID {PRODUCTO_INEXISTENTE} no existe."),
+            )
+    confirmar(db)
+    return venta.id
+
+
+def ticket(id_producto: int) -> InsertarVentaRequest:
+    return InsertarVentaRequest(
+        detalles=f"Ticket {id_producto}",
+        venta_detalle=[{"id_producto": id_producto, "cantidad": 1, "precio": "10.00", "variante": "retail"}],
+    )
+
+
+class RunnerSQLite:
+    def __init__(self, sesiones):
+        self.sesiones = sesiones
+
+    async def run(self, fn, *args):
+        with self.sesiones() as db:
+            return fn(db, *args)
+
+
+def test_ticket_invalido_solo_falla_el_suyo(sesiones):
+    async def get_runner():
+        yield RunnerSQLite(sesiones)
+
+    async def enviar():
+        escritor = EscritorVentas(espera_ms=50)
+        escritor.iniciar()
+        try:
+            return await asyncio.gather(
+                escritor.encolar(ticket(1)),
+                escritor.encolar(ticket(PRODUCTO_INEXISTENTE)),
+                escritor.encolar(ticket(2)),
+                return_exceptions=True,
+            )
+        finally:
+            await escritor.detener()
+
+    with mock.patch.object(escritor_ventas, "get_runner", get_runner), \
+            mock.patch.object(VentaRepository, "insertar_venta_sql", insertar_venta_falsa):
+        primero, fallido, tercero = asyncio.run(enviar())
+
+        # El mismo ticket sin agrupar
+        with sesiones() as db, pytest.raises(ValueError) as directo:
+            VentaService.insertar_venta_sql(db, ticket(PRODUCTO_INEXISTENTE))
+
+    assert isinstance(primero, int) and isinstance(tercero, int)
+    assert isinstance(fallido, ValueError)
+    assert str(fallido) == str(directo.value)
+    assert str(fallido).startswith("Error al crear venta: ")
+
+    with sesiones() as db:
+        # La cabecera del ticket fallido se descartó con su SAVEPOINT
+        detalles = db.execute(select(Venta.detalles).order_by(Venta.id)).scalars().all()
+        assert detalles == ["Ticket 1", "Ticket 2"]
+        assert db.execute(select(func.count()).select_from(Venta)).scalar() == 2
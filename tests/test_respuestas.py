@@ -0,0 +1,21 @@
+"""
+respuesta_lista (TypeAdapter.dump_json) debe producir el mismo JSON que
+FastAPI con response_model; ver scripts/benchmark_serializacion.py para
+la comparación de tiempos.
+"""
+import json
+
+import pytest
+
+from scripts.benchmark_serializacion import (
+    MODELOS,
+    con_dump_json,
+    con_response_model,
+    generar_items,
+)
+
+
+@pytest.mark.parametrize("modelo", MODELOS, ids=lambda m: m.__name__)
+def test_dump_json_igual_a_response_model(modelo):
+    items = generar_items(modelo, 5)
+    assert json.loads(con_dump_json(modelo, items)) == json.loads(con_response_model(modelo)(items))
@@ -0,0 +1,87 @@
+"""
+Número de consultas al listar ventas: con selectinload los detalles de
+toda la página llegan en una consulta adicional, así que el total no
+depende del tamaño de la página (sin N+1).
+
+Venta y VentaDetalle no usan tipos propios de Postgres, por lo que la
+prueba corre sobre SQLite en memoria.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Venta, VentaDetalle
+from app.models.base import Base
+from app.models.types import TypeVariant
+from app.repositories.venta import VentaRepository
+from app.services.venta_service import VentaService
+
+TOTAL_VENTAS = 60
+DETALLES_POR_VENTA = 3
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine, tables=[Venta.__table__, VentaDetalle.__table__])
+    with sessionmaker(bind=engine)() as db:
+        for n in range(TOTAL_VENTAS):
+            db.add(Venta(
+                fecha=date(2025, 1, 1) + timedelta(days=n),
+                precio_total=Decimal("30.00"),
+                detalles_venta=[
+                    VentaDetalle(
+                        id_producto=d + 1,
+                        cantidad=1,
+                        precio=Decimal("10.00"),
+                        variante=TypeVariant.RETAIL,
+                    )
+                    for d in range(DETALLES_POR_VENTA)
+                ],
+            ))
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+def _contar_consultas(engine, consulta) -> int:
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        with sessionmaker(bind=engine)() as db:
+            consulta(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+    return len(sentencias)
+
+
+@pytest.mark.parametrize("limit", [1, 10, TOTAL_VENTAS])
+def test_get_all_una_consulta_para_detalles(engine, limit):
+    def consulta(db):
+        ventas = VentaRepository.get_all(db, limit=limit)
+        assert len(ventas) == limit
+        assert all(len(v.detalles_venta) == DETALLES_POR_VENTA for v in ventas)
+
+    # Encabezados + detalles de la página (SELECT ... WHERE id_venta IN ...)
+    assert _contar_consultas(engine, consulta) == 2
+
+
+def test_get_all_ventas_no_depende_del_tamano_de_pagina(engine):
+    """Construir VentaOut tampoco dispara cargas perezosas por venta"""
+    conteos = {
+        limit: _contar_consultas(engine, lambda db: VentaService.get_all_ventas(db, limit=limit))
+        for limit in (1, 10, TOTAL_VENTAS)
+    }
+    assert len(set(conteos.values())) == 1, conteos
@@ -0,0 +1,213 @@
+"""
+Número de sentencias de las escrituras de ventas: con INSERT/UPDATE/
+DELETE ... RETURNING no hay SELECT previo ni refresh() después del
+commit, y las líneas de una venta nueva van en un solo INSERT.
+
+Se compara con el patrón anterior (get_by_id → setattr → commit →
+refresh), reproducido aquí tal como estaba en los repositorios.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
+
+from app.models import Venta, VentaDetalle
+from app.models.base import Base
+from app.models.types import TypeVariant
+from app.repositories.venta import VentaDetalleRepository, VentaRepository
+from app.schemas.venta import VentaCreate, VentaDetalleCreate, VentaDetalleUpdate, VentaUpdate
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine, tables=[Venta.__table__, VentaDetalle.__table__])
+    with sessionmaker(bind=engine)() as db:
+        for n in (1, 2):
+            db.add(Venta(
+                id=n,
+                detalles=f"Ticket {n}",
+                fecha=date(2025, 1, n),
+                precio_total=Decimal("10.00"),
+                detalles_venta=[
+                    VentaDetalle(id=n, id_producto=1, cantidad=1, precio=Decimal("10.00"), variante=TypeVariant.RETAIL)
+                ],
+            ))
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+def _contar_sentencias(engine, escritura, expire_on_commit=False) -> int:
+    """
+    Sentencias que emite SQLAlchemy (BEGIN/COMMIT no pasan por el cursor).
+    Un INSERT de varias filas con RETURNING cuenta una vez: en Postgres va
+    en un solo viaje, pero SQLite no garantiza el orden de RETURNING y el
+    mismo contexto de ejecución lo divide en una llamada por fila.
+    """
+    contextos = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if not any(c is context for c in contextos):
+            contextos.append(context)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        # Las sesiones de la API usan expire_on_commit=False
+        with sessionmaker(bind=engine, expire_on_commit=expire_on_commit)() as db:
+            escritura(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+    return len(contextos)
+
+
+def _venta(lineas: int) -> VentaCreate:
+    return VentaCreate(
+        detalles="Ticket de prueba",
+        fecha=date(2025, 2, 1),
+        detalles_venta=[
+            VentaDetalleCreate(id_producto=n + 1, cantidad=1, precio=Decimal("5.00"))
+            for n in range(lineas)
+        ],
+    )
+
+
+# Patrón anterior de los repositorios (sesiones con expire_on_commit=True)
+
+def _crear_antes(db, venta: VentaCreate) -> Venta:
+    db_venta = Venta(detalles=venta.detalles, fecha=venta.fecha, precio_total=0)
+    db.add(db_venta)
+    db.flush()
+    for detalle in venta.detalles_venta:
+        db.add(VentaDetalle(
+            id_venta=db_venta.id,
+            id_producto=detalle.id_producto,
+            cantidad=detalle.cantidad,
+            precio=detalle.precio,
+            variante=TypeVariant.RETAIL,
+        ))
+    db.commit()
+    db.refresh(db_venta)
+    return db_venta
+
+
+def _actualizar_antes(db, modelo, entidad_id: int, cambios: dict):
+    entidad = db.execute(select(modelo).where(modelo.id == entidad_id)).scalar_one_or_none()
+    for campo, valor in cambios.items():
+        setattr(entidad, campo, valor)
+    db.commit()
+    db.refresh(entidad)
+    return entidad
+
+
+def _eliminar_antes(db, modelo, entidad_id: int) -> None:
+    entidad = db.execute(select(modelo).where(modelo.id == entidad_id)).scalar_one_or_none()
+    db.delete(entidad)
+    db.commit()
+
+
+def test_postgres_inserta_lineas_en_una_sentencia():
+    """Con psycopg2 y asyncpg el INSERT ... RETURNING de varias filas no se divide"""
+    for dialecto in (PGDialect_psycopg2, PGDialect_asyncpg):
+        assert dialecto.use_insertmanyvalues
+        # El id autoincremental sirve para devolver las filas en el orden enviado
+        assert dialecto.insertmanyvalues_implicit_sentinel & InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT
+
+
+@pytest.mark.parametrize("lineas", [1, 5, 30])
+def test_create_dos_sentencias(engine, lineas):
+    def escritura(db):
+        venta = VentaRepository.create(db, _venta(lineas))
+        assert len(venta.detalles_venta) == lineas
+        assert [d.id_producto for d in venta.detalles_venta] == list(range(1, lineas + 1))
+
+    # Cabecera INSERT ... RETURNING + un INSERT de varias filas para las líneas
+    assert _contar_sentencias(engine, escritura) == 2
+
+
+@pytest.mark.parametrize("lineas", [1, 5, 30])
+def test_create_menos_sentencias_que_antes(engine, lineas):
+    def antes(db):
+        assert len(_crear_antes(db, _venta(lineas)).detalles_venta) == lineas
+
+    def ahora(db):
+        assert len(VentaRepository.create(db, _venta(lineas)).detalles_venta) == lineas
+
+    assert _contar_sentencias(engine, ahora) < _contar_sentencias(engine, antes, expire_on_commit=True)
+
+
+def test_update_venta_una_sentencia(engine):
+    cambios = VentaUpdate(detalles="Ticket corregido")
+
+    def ahora(db):
+        assert VentaRepository.update(db, 1, cambios).detalles == "Ticket corregido"
+
+    def antes(db):
+        assert _actualizar_antes(db, Venta, 2, cambios.model_dump(exclude_unset=True)).detalles == "Ticket corregido"
+
+    # Cada patrón modifica una fila distinta: SELECT + UPDATE + refresh antes
+    assert _contar_sentencias(engine, ahora) == 1
+    assert _contar_sentencias(engine, antes, expire_on_commit=True) == 3
+
+
+def test_update_detalle_una_sentencia(engine):
+    cambios = VentaDetalleUpdate(cantidad=4)
+
+    def ahora(db):
+        assert VentaDetalleRepository.update(db, 1, cambios).cantidad == 4
+
+    def antes(db):
+        assert _actualizar_antes(db, VentaDetalle, 2, cambios.model_dump(exclude_unset=True)).cantidad == 4
+
+    # Cada patrón modifica una fila distinta: SELECT + UPDATE + refresh antes
+    assert _contar_sentencias(engine, ahora) == 1
+    assert _contar_sentencias(engine, antes, expire_on_commit=True) == 3
+
+
+def test_update_inexistente_una_sentencia(engine):
+    def escritura(db):
+        assert VentaRepository.update(db, 999, VentaUpdate(detalles="x")) is None
+
+    assert _contar_sentencias(engine, escritura) == 1
+
+
+def test_delete_detalle_una_sentencia(engine):
+    def ahora(db):
+        assert VentaDetalleRepository.delete(db, 1)
+
+    assert _contar_sentencias(engine, ahora) == 1
+
+
+def test_delete_menos_sentencias_que_antes(engine):
+    # Cada patrón borra una venta distinta
+    antes = _contar_sentencias(engine, lambda db: _eliminar_antes(db, Venta, 2), expire_on_commit=True)
+    ahora = _contar_sentencias(engine, lambda db: VentaRepository.delete(db, 1))
+    assert ahora == 1
+    assert ahora < antes
+
+
+def test_create_guarda_variante(engine):
+    venta = VentaCreate(
+        detalles="Ticket con variantes",
+        detalles_venta=[
+            VentaDetalleCreate(id_producto=1, cantidad=1, precio=Decimal("45.00"), variante=TypeVariant.SMALL),
+            VentaDetalleCreate(id_producto=2, cantidad=1, precio=Decimal("8.00")),
+        ],
+    )
+    with sessionmaker(bind=engine, expire_on_commit=False)() as db:
+        venta_id = VentaRepository.create(db, venta).id
+    with sessionmaker(bind=engine)() as db:
+        variantes = db.scalars(
+            select(VentaDetalle.variante).where(VentaDetalle.id_venta == venta_id).order_by(VentaDetalle.id)
+        ).all()
+    assert variantes == [TypeVariant.SMALL, None]